@@ -0,0 +1,126 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+"""
+Load workbooks and stream rows from read-only worksheets without blocking
+an asyncio event loop::
+
+    wb = await aload_workbook("big.xlsx", read_only=True)
+    async for row in wb.active.aiter_rows(values_only=True):
+        ...
+
+Parsing runs in an executor, the loop's default one unless another is
+given. Rows are read in batches and only one batch is read ahead of the
+consumer, so a slow consumer holds up the parser rather than letting rows
+pile up in memory. Worksheets can only be parsed in threads, which share
+the GIL with the loop: the loop stays responsive but parsing is no faster.
+
+Requires Python 3.5 or later.
+"""
+
+from functools import partial
+from itertools import islice
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+from openpyxl.reader.excel import load_workbook
+
+
+BATCH_SIZE = 1000
+
+
+def _get_loop(loop=None):
+    if asyncio is None:
+        raise ImportError("asyncio is required")
+    if loop is None:
+        loop = asyncio.get_event_loop()
+    return loop
+
+
+def aload_workbook(filename, loop=None, executor=None, **kw):
+    """
+    Open the given filename in an executor. Accepts the same arguments as
+    :func:`openpyxl.load_workbook`.
+
+    :rtype: awaitable returning a :class:`openpyxl.workbook.Workbook`
+    """
+    loop = _get_loop(loop)
+    return loop.run_in_executor(executor, partial(load_workbook, filename, **kw))
+
+
+class AsyncRowIterator(object):
+    """
+    Asynchronous iterator over the rows returned by `rows`, a callable
+    that is called in the executor and returns an iterable.
+    """
+
+    def __init__(self, rows, batch_size=BATCH_SIZE, loop=None, executor=None):
+        self._factory = rows
+        self._rows = None
+        self.batch_size = batch_size
+        self._loop = loop
+        self._executor = executor
+        self._batch = []
+        self._idx = 0
+        self._pending = None
+        self._started = False
+
+
+    def __aiter__(self):
+        return self
+
+
+    def _read_batch(self):
+        if self._rows is None:
+            self._rows = iter(self._factory())
+        return list(islice(self._rows, self.batch_size))
+
+
+    def _read_ahead(self):
+        self._pending = self._loop.run_in_executor(self._executor,
+                                                   self._read_batch)
+
+
+    def __anext__(self):
+        if not self._started:
+            self._loop = _get_loop(self._loop)
+            self._started = True
+            self._read_ahead()
+
+        result = self._loop.create_future()
+        if self._idx < len(self._batch):
+            result.set_result(self._next_row())
+        elif self._pending is None:
+            result.set_exception(StopAsyncIteration())
+        else:
+            self._pending.add_done_callback(partial(self._batch_read, result))
+        return result
+
+
+    def _next_row(self):
+        row = self._batch[self._idx]
+        self._idx += 1
+        return row
+
+
+    def _batch_read(self, result, pending):
+        # keep the batch even if the caller has given up waiting for it
+        self._pending = None
+        error = pending.exception()
+        if error is None:
+            self._batch = pending.result()
+            self._idx = 0
+            if self._batch:
+                self._read_ahead()
+
+        if result.cancelled():
+            return
+        if error is not None:
+            result.set_exception(error)
+        elif self._batch:
+            result.set_result(self._next_row())
+        else:
+            result.set_exception(StopAsyncIteration())
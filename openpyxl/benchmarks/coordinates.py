@@ -0,0 +1,39 @@
+"Benchmark converting cell references as the readers do"
+
+import timeit
+
+from openpyxl.compat import range
+from openpyxl.utils import (
+    coordinate_from_string,
+    column_index_from_string,
+    coordinate_to_tuple,
+    get_column_letter,
+)
+
+
+# a wide sheet: 200 columns x 500 rows
+COORDINATES = ["{0}{1}".format(get_column_letter(col), row)
+               for row in range(1, 501) for col in range(1, 201)]
+
+
+def regex():
+    """Previous implementation: regex and upper()"""
+    for coord in COORDINATES:
+        column, row = coordinate_from_string(coord)
+        column_index_from_string(column)
+
+
+def fast():
+    for coord in COORDINATES:
+        coordinate_to_tuple(coord)
+
+
+if __name__ == "__main__":
+    print("{0} references".format(len(COORDINATES)))
+    for fn in (regex, fast):
+        times = timeit.repeat("{0}()".format(fn.__name__),
+                              setup="from __main__ import {0}".format(fn.__name__),
+                              number = 5,
+                              repeat = 3
+        )
+        print("{0} {1:.3f}s".format(fn.__name__, min(times)))
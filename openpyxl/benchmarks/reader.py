@@ -5,13 +5,15 @@ import timeit
 import openpyxl
 
 
+folder = os.path.split(__file__)[0]
+SRC = os.path.join(folder, "files", "very_large.xlsx")
+
+
 def reader(optimised):
     """
     Loop through all cells of a workbook
     """
-    folder = os.path.split(__file__)[0]
-    src = os.path.join(folder, "files", "very_large.xlsx")
-    wb = openpyxl.load_workbook(src, use_iterators=optimised)
+    wb = openpyxl.load_workbook(SRC, use_iterators=optimised)
     ws = wb.get_active_sheet()
     rows = ws.iter_rows()
     for r, row in enumerate(rows):
@@ -41,5 +43,115 @@ def timer(fn):
     return std, opt
 
 
+def make_workbook(src, rows=1000000, cols=10):
+    """
+    Write a workbook with a mix of numbers, strings and dates.
+    The default size is a little over 100 MB of worksheet XML.
+    """
+    from datetime import datetime, timedelta
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    start = datetime(2015, 1, 1)
+    for idx in range(rows):
+        row = [idx, idx * 1.5, "text {0}".format(idx % 1000), start + timedelta(idx)]
+        row.extend(idx + c for c in range(cols - len(row)))
+        ws.append(row)
+    wb.save(src)
+
+
+def cell_values(src):
+    """
+    Read values through the cells of a read-only worksheet
+    """
+    wb = openpyxl.load_workbook(src, read_only=True)
+    ws = wb.active
+    for row in ws.rows:
+        for cell in row:
+            cell.value
+
+
+def values_only(src):
+    """
+    Read values straight from the XML of a read-only worksheet
+    """
+    wb = openpyxl.load_workbook(src, read_only=True)
+    ws = wb.active
+    for row in ws.values:
+        for value in row:
+            pass
+
+
+def values_timer(src):
+    """
+    Compare reading values with and without cell objects.
+    Time from the best of three is taken.
+    """
+    if not os.path.exists(src):
+        print("Creating {0}".format(src))
+        make_workbook(src)
+    print("lxml", openpyxl.LXML)
+    result = []
+    for fn in (cell_values, values_only):
+        times = timeit.repeat("{0}({1!r})".format(fn.__name__, src),
+                              setup="from __main__ import {0}".format(fn.__name__),
+                              number = 1,
+                              repeat = 3
+        )
+        print("{0} {1:.2f}s".format(fn.__name__, min(times)))
+        result.append(min(times))
+    cells, values = result
+    print("values_only takes {0:.2%} time\n".format(values/cells))
+    return cells, values
+
+
+def one_column(src):
+    """
+    Read the values of a single column of a read-only worksheet
+    """
+    wb = openpyxl.load_workbook(src, read_only=True)
+    ws = wb.active
+    for row in ws.iter_rows(columns=['B'], values_only=True):
+        pass
+
+
+def parsed(fn, src, backend):
+    """
+    Call a reader function with a particular XML backend
+    """
+    from openpyxl.xml import backends
+    backends.BACKEND = backend
+    fn(src)
+
+
+def parsers_timer(src):
+    """
+    Compare the XML backends available for reading worksheets, both for
+    whole rows and for a single column.
+    Time from the best of three is taken.
+    """
+    from openpyxl.xml.backends import BACKENDS, BACKEND
+    if not os.path.exists(src):
+        print("Creating {0}".format(src))
+        make_workbook(src)
+    print("default backend", BACKEND)
+    for fn in (values_only, one_column):
+        result = {}
+        for name in sorted(BACKENDS):
+            times = timeit.repeat("parsed({0}, {1!r}, {2!r})".format(fn.__name__, src, name),
+                                  setup="from __main__ import parsed, {0}".format(fn.__name__),
+                                  number = 1,
+                                  repeat = 3
+            )
+            print("{0} {1} {2:.2f}s".format(fn.__name__, name, min(times)))
+            result[name] = min(times)
+        print("fastest is {0}\n".format(min(result, key=result.get)))
+
+
 if __name__ == "__main__":
-    timer(reader)
+    args = sys.argv[1:]
+    if args[:1] == ["--parsers"]:
+        parsers_timer(len(args) > 1 and args[1] or SRC)
+    elif args:
+        values_timer(args[0])
+    else:
+        timer(reader)
@@ -54,7 +54,56 @@ def timer(fn, **kw):
     return std, opt
 
 
+def make_worksheet(cols, rows):
+    """
+    Create a worksheet with a mix of integers, floats, strings and dates
+    """
+    from datetime import datetime, timedelta
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    start = datetime(2015, 1, 1)
+    for idx in range(rows):
+        row = [idx, idx * 1.5, "text {0}".format(idx % 1000), start + timedelta(idx)]
+        row.extend(idx + c for c in range(cols - len(row)))
+        ws.append(row)
+    return ws
+
+
+def written(ws, row_writer):
+    """
+    Serialise a worksheet with a particular writer for its data
+    """
+    from openpyxl.writer import worksheet
+    worksheet.ROW_WRITER = row_writer
+    worksheet.write_worksheet(ws, ws.parent.shared_strings)
+
+
+def rows_timer(cols, rows):
+    """
+    Compare the writers available for worksheet data.
+    Time from the best of three is taken.
+    """
+    from openpyxl.writer.worksheet import ROW_WRITERS, ROW_WRITER
+    global ws
+    ws = make_worksheet(cols, rows)
+    print("{0} cols {1} rows, default writer {2}".format(cols, rows, ROW_WRITER))
+    result = {}
+    for name in sorted(ROW_WRITERS):
+        times = timeit.repeat("written(ws, {0!r})".format(name),
+                              setup="from __main__ import written, ws",
+                              number = 1,
+                              repeat = 3
+        )
+        print("{0} {1:.2f}s".format(name, min(times)))
+        result[name] = min(times)
+    print("fastest is {0}\n".format(min(result, key=result.get)))
+
+
 if __name__ == "__main__":
+    if sys.argv[1:] == ["--rows"]:
+        rows_timer(cols=10, rows=100000)
+        rows_timer(cols=1000, rows=100)
+        sys.exit()
     timer(writer, cols=100, rows=100)
     timer(writer, cols=1000, rows=100)
     timer(writer, cols=4000, rows=100)
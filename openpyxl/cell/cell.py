@@ -41,8 +41,10 @@ from openpyxl.utils import (
     get_column_letter,
     column_index_from_string,
 )
-from openpyxl.styles import numbers, is_date_format
+from openpyxl.styles import numbers
+from openpyxl.styles.numbers import format_table
 from openpyxl.styles.styleable import StyleableObject
+from openpyxl.formula.translate import Translator
 from openpyxl.worksheet.hyperlink import Hyperlink
 
 # constants
@@ -105,16 +107,16 @@ class Cell(StyleableObject):
 
     def __init__(self, worksheet, column=None, row=None, value=None, col_idx=None, fontId=0,
                  fillId=0, borderId=0, alignmentId=0, protectionId=0, numFmtId=0,
-                 pivotButton=None, quotePrefix=None, xfId=None):
-        self._font_id = fontId
-        self._fill_id = fillId
-        self._border_id = borderId
-        self._alignment_id = alignmentId
-        self._protection_id = protectionId
-        self._number_format_id = numFmtId
-        self.quotePrefix = quotePrefix
-        self.pivotButton = pivotButton
+                 pivotButton=None, quotePrefix=None, xfId=None, style_id=None):
         self.parent = worksheet
+        self._style_id = style_id
+        self._pending_style = None
+        if (fontId or fillId or borderId or alignmentId or protectionId
+            or numFmtId or pivotButton is not None or quotePrefix is not None):
+            self._update_style(fontId=fontId, fillId=fillId, borderId=borderId,
+                               alignmentId=alignmentId, protectionId=protectionId,
+                               numFmtId=numFmtId, pivotButton=pivotButton,
+                               quotePrefix=quotePrefix)
         self.row = row
         # _value is the stored value, while value is the displayed value
         self._value = None
@@ -307,7 +309,13 @@ class Cell(StyleableObject):
             ':rtype: depends on the value (string, float, int or '
             ':class:`datetime.datetime`)'"""
         value = self._value
-        if value is not None and self.is_date:
+        if value is None:
+            return value
+        if self.data_type == 'f':
+            if value.__class__ is Translator:
+                # shared formula which has not been expanded yet
+                value = self._value = value.translate_formula(self.coordinate)
+        elif self.is_date:
             value = from_excel(value, self.base_date)
         return value
 
@@ -319,6 +327,8 @@ class Cell(StyleableObject):
     @property
     def internal_value(self):
         """Always returns the value for excel."""
+        if self.data_type == 'f':
+            return self.value
         return self._value
 
     @property
@@ -343,8 +353,9 @@ class Cell(StyleableObject):
 
         :rtype: bool
         """
-        if self.data_type == "n" and self.number_format != "General":
-            return is_date_format(self.number_format)
+        if self.data_type == "n":
+            table = format_table(self.parent.parent)
+            return table.for_format(self._number_format_id).is_date
         return False
 
     def offset(self, row=0, column=0):
@@ -7,8 +7,8 @@ from openpyxl.compat import unicode
 from openpyxl.cell import Cell
 from openpyxl.utils import get_column_letter
 from openpyxl.utils.datetime import from_excel
-from openpyxl.styles import is_date_format, Style
-from openpyxl.styles.numbers import BUILTIN_FORMATS
+from openpyxl.styles import Style
+from openpyxl.styles.numbers import BUILTIN_FORMATS, format_table, NO_FLAGS
 
 
 class ReadOnlyCell(object):
@@ -89,9 +89,15 @@ class ReadOnlyCell(object):
         _id = self.style_id.protection
         return self.parent.parent._protections[_id]
 
+    @property
+    def _format_flags(self):
+        if not self._style_id:
+            return NO_FLAGS
+        return format_table(self.parent.parent).for_style(self._style_id)
+
     @property
     def is_date(self):
-        return self.data_type == 'n' and is_date_format(self.number_format)
+        return self.data_type == 'n' and self._format_flags.is_date
 
     @property
     def internal_value(self):
@@ -102,7 +108,7 @@ class ReadOnlyCell(object):
         if self._value is None:
             return
         if self.data_type == 'n':
-            if is_date_format(self.number_format):
+            if self._format_flags.is_date:
                 return from_excel(self._value, self.base_date)
             return self._value
         if self.data_type == 'b':
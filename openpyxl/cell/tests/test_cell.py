@@ -21,6 +21,7 @@ def DummyWorksheet():
     from openpyxl.utils.indexed_list import IndexedList
     from openpyxl.utils.datetime  import CALENDAR_WINDOWS_1900
     from openpyxl.cell import Cell
+    from openpyxl.styles.style import StyleId
 
     class Wb(object):
         excel_base_date = CALENDAR_WINDOWS_1900
@@ -31,6 +32,7 @@ def DummyWorksheet():
         _protections = IndexedList()
         _alignments = IndexedList()
         _number_formats = IndexedList()
+        _cell_styles = IndexedList([StyleId()])
 
 
     class Ws(object):
@@ -12,7 +12,7 @@ from .strings import (
     tempfile,
     safe_string
     )
-from .numbers import long, NUMERIC_TYPES
+from .numbers import long, NUMERIC_TYPES, INT64_TYPECODE
 from .itertools import (
     range,
     iteritems,
@@ -8,7 +8,15 @@ except NameError:
     # Python 3
     long = int
 
+from array import array
 from decimal import Decimal
 
 NUMERIC_TYPES = (int, float, long, Decimal)
 
+try:
+    array('q')
+    INT64_TYPECODE = 'q'
+except ValueError:
+    # Python 2
+    INT64_TYPECODE = 'l'
+
@@ -47,4 +47,9 @@ def pytest_runtest_setup(item):
             from lxml.etree import LIBXML_VERSION
             if LIBXML_VERSION < (3, 4, 0, 0):
                 pytest.skip("LXML >= 3.4 is required")
+        elif item.get_marker("numpy_required"):
+            try:
+                import numpy
+            except ImportError:
+                pytest.skip("numpy must be installed")
 
@@ -0,0 +1,39 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+import pytest
+
+from ..translate import Translator, TranslatorError
+
+
+@pytest.mark.parametrize("formula, dest, expected",
+                         [
+                             ("=A1+B2", "C3", "=C3+D4"),
+                             ("=SUM($A1:B$2)*Sheet2!C3", "B2", "=SUM($A2:C$2)*Sheet2!D4"),
+                             ("='My Sheet'!A1:A10", "A2", "='My Sheet'!A2:A11"),
+                             ("=SUM(3:4)+SUM(A:$C)", "B3", "=SUM(5:6)+SUM(B:$C)"),
+                             ("=name1:C2", "A2", "=name1:C3"),
+                             ('=IF(A1>0,"A1",B1)', "A2", '=IF(A2>0,"A1",B2)'),
+                             ("literal", "B2", "literal"),
+                             ("", "B2", ""),
+                         ])
+def test_translate_formula(formula, dest, expected):
+    translator = Translator(formula, "A1")
+    assert translator.translate_formula(dest) == expected
+    # the template is compiled once
+    template = translator.get_template()
+    assert translator.translate_formula(dest) == expected
+    assert translator.get_template() is template
+
+
+def test_template():
+    translator = Translator("=SUM($A1:B$2)", "A1")
+    assert translator.get_template() == [
+        "=SUM($A", (Translator.ROW, 1), ":", (Translator.COL, 2), "$2)"]
+
+
+@pytest.mark.parametrize("dest", ["A1", "B1"])
+def test_out_of_range(dest):
+    translator = Translator("=A1+B1", "B2")
+    with pytest.raises(TranslatorError):
+        translator.translate_formula(dest)
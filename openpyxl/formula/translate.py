@@ -12,7 +12,7 @@ to identify the parts of the formula that need to change.
 import re
 from .tokenizer import Tokenizer, Token
 from openpyxl.utils import (coordinate_from_string, column_index_from_string,
-                            get_column_letter)
+                            get_column_letter, coordinate_to_tuple)
 
 class TranslatorError(Exception):
     """
@@ -48,12 +48,17 @@ class Translator(object):
         col, self.row = coordinate_from_string(origin)
         self.col = column_index_from_string(col)
         self.tokenizer = Tokenizer(formula)
+        self._template = None
 
     def get_tokens(self):
         "Returns a list with the tokens comprising the formula."
         self.tokenizer.parse()
         return self.tokenizer.items
 
+    # the parts of a template which change with the destination
+    ROW = "ROW"
+    COL = "COL"
+
     ROW_RANGE_RE = re.compile(r"(\$?[1-9][0-9]{0,6}):(\$?[1-9][0-9]{0,6})$")
     COL_RANGE_RE = re.compile(r"(\$?[A-Za-z]{1,3}):(\$?[A-Za-z]{1,3})$")
     CELL_REF_RE = re.compile(r"(\$?[A-Za-z]{1,3})(\$?[1-9][0-9]{0,6})$")
@@ -109,30 +114,108 @@ class Translator(object):
         `range_str`: an A1-style reference to a range. Potentially includes
                      the worksheet reference. Could also be a named range.
 
+        """
+        return cls.render(cls.range_parts(range_str), rdelta, cdelta)
+
+    @classmethod
+    def _row_part(cls, row_str):
+        if row_str.startswith('$'):
+            return row_str
+        return (cls.ROW, int(row_str))
+
+    @classmethod
+    def _col_part(cls, col_str):
+        if col_str.startswith('$'):
+            return col_str
+        return (cls.COL, column_index_from_string(col_str))
+
+    @classmethod
+    def range_parts(cls, range_str):
+        """
+        Split an A1-style range reference into literal text and (ROW, row)
+        or (COL, column index) slots for the relative rows and columns.
         """
         ws_part, range_str = cls.strip_ws_name(range_str)
+        parts = [ws_part]
         match = cls.ROW_RANGE_RE.match(range_str)  # e.g. `3:4`
         if match is not None:
-            return (ws_part + cls.translate_row(match.group(1), rdelta) + ":"
-                    + cls.translate_row(match.group(2), rdelta))
+            parts.extend([cls._row_part(match.group(1)), ":",
+                          cls._row_part(match.group(2))])
+            return parts
         match = cls.COL_RANGE_RE.match(range_str)  # e.g. `A:BC`
         if match is not None:
-            return (ws_part + cls.translate_col(match.group(1), cdelta) + ':'
-                    + cls.translate_col(match.group(2), cdelta))
+            parts.extend([cls._col_part(match.group(1)), ":",
+                          cls._col_part(match.group(2))])
+            return parts
         if ':' in range_str: # e.g. `A1:B5`
             # The check is necessarily general because range references can
             # have one or both endpoints specified by named ranges. I.e.,
             # `named_range:C2`, `C2:named_range`, and `name1:name2` are all
             # valid references. Further, Excel allows chaining multiple
             # colons together (with unclear meaning)
-            return ws_part + ":".join(
-                cls.translate_range(piece, rdelta, cdelta)
-                for piece in range_str.split(':'))
+            for idx, piece in enumerate(range_str.split(':')):
+                if idx:
+                    parts.append(":")
+                parts.extend(cls.range_parts(piece))
+            return parts
         match = cls.CELL_REF_RE.match(range_str)
         if match is None:  # Must be a named range
-            return range_str
-        return (ws_part + cls.translate_col(match.group(1), cdelta)
-                + cls.translate_row(match.group(2), rdelta))
+            parts.append(range_str)
+        else:
+            parts.extend([cls._col_part(match.group(1)),
+                          cls._row_part(match.group(2))])
+        return parts
+
+    @classmethod
+    def render(cls, parts, rdelta, cdelta):
+        """
+        Join the parts of a template, moving the slots by the given number
+        of rows and columns.
+        """
+        out = []
+        for part in parts:
+            if part.__class__ is not tuple:
+                out.append(part)
+            elif part[0] is cls.ROW:
+                row = part[1] + rdelta
+                if row <= 0:
+                    raise TranslatorError("Formula out of range")
+                out.append(str(row))
+            else:
+                try:
+                    out.append(get_column_letter(part[1] + cdelta))
+                except ValueError:
+                    raise TranslatorError("Formula out of range")
+        return "".join(out)
+
+    def get_template(self):
+        """
+        The formula compiled into literal text and slots for the relative
+        references, which is done only once however often it is translated.
+        """
+        if self._template is None:
+            tokens = self.get_tokens()
+            if not tokens:
+                parts = [""]
+            elif tokens[0].type == Token.LITERAL:
+                parts = [tokens[0].value]
+            else:
+                parts = ['=']
+                for token in tokens:
+                    if token.type == Token.OPERAND and token.subtype == Token.RANGE:
+                        parts.extend(self.range_parts(token.value))
+                    else:
+                        parts.append(token.value)
+            # join neighbouring text
+            template = []
+            for part in parts:
+                if (template and part.__class__ is not tuple
+                    and template[-1].__class__ is not tuple):
+                    template[-1] += part
+                elif part != "":
+                    template.append(part)
+            self._template = template or [""]
+        return self._template
 
     def translate_formula(self, dest):
         """
@@ -142,25 +225,11 @@ class Translator(object):
         whose address is `dest` (no worksheet name).
 
         """
-        tokens = self.get_tokens()
-        if not tokens:
-            return ""
-        elif tokens[0].type == Token.LITERAL:
-            return tokens[0].value
-        out = ['=']
         # per the spec:
         # A compliant producer or consumer considers a defined name in the
         # range A1-XFD1048576 to be an error. All other names outside this
         # range can be defined as names and overrides a cell reference if an
         # ambiguity exists. (I.18.2.5)
-        dcol, drow = coordinate_from_string(dest)
-        dcol = column_index_from_string(dcol)
-        row_delta = drow - self.row
-        col_delta = dcol - self.col
-        for token in tokens:
-            if token.type == Token.OPERAND and token.subtype == Token.RANGE:
-                out.append(self.translate_range(token.value, row_delta,
-                                                col_delta))
-            else:
-                out.append(token.value)
-        return "".join(out)
+        drow, dcol = coordinate_to_tuple(dest)
+        return self.render(self.get_template(), drow - self.row,
+                           dcol - self.col)
@@ -0,0 +1,148 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+"""
+On-disk cache of parsed workbook parts
+
+Parts are stored under a key made from the CRC32 and size that the archive
+records for the member they were parsed from, so they can be looked up
+without reading the member, and a changed member gets a new key. Parsed
+worksheets keep shared strings and styles as indices, so they do not
+depend on any other part. Entries are evicted, least recently used first,
+once the cache is larger than `max_size` bytes.
+
+Entries are pickles: only use a directory which nobody else can write to.
+"""
+
+import os
+import sys
+import pickle
+from hashlib import sha1
+from tempfile import mkstemp
+
+# bump whenever the format of anything stored changes
+CACHE_VERSION = 1
+SUFFIX = ".cache"
+MAX_SIZE = 256 * 2**20
+
+
+class ParsedCache(object):
+
+    def __init__(self, directory, max_size=MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+
+    def key(self, kind, info, *extra):
+        """
+        Key for the part of type `kind` parsed from the archive member
+        described by the ZipInfo `info`
+        """
+        key = (CACHE_VERSION, sys.version_info[:2], kind, info.CRC,
+               info.file_size) + extra
+        return sha1(repr(key).encode("ascii")).hexdigest()
+
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+
+    def get(self, key):
+        """
+        Return the value stored under `key`. Raise KeyError if there is
+        none or it cannot be read.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except EnvironmentError:
+            raise KeyError(key)
+        except Exception:
+            # damaged entry
+            self._remove(path)
+            raise KeyError(key)
+        try:
+            os.utime(path, None) # most recently used
+        except EnvironmentError:
+            pass
+        return value
+
+
+    def put(self, key, value):
+        """
+        Store `value` under `key`. The cache is left as it was if it
+        cannot be written to.
+        """
+        try:
+            fd, tmp = mkstemp(suffix=".tmp", dir=self.directory)
+        except EnvironmentError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+            path = self._path(key)
+            self._remove(path) # rename does not replace files on Windows
+            os.rename(tmp, path)
+        except EnvironmentError:
+            self._remove(tmp)
+            return
+        self.evict()
+
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except EnvironmentError:
+            pass
+
+
+    def entries(self):
+        """Return (mtime, size, path) of every entry, oldest first"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except EnvironmentError:
+                continue # evicted by someone else
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+
+    def evict(self):
+        """Remove the least recently used entries until under the size limit"""
+        entries = self.entries()
+        size = sum(entry[1] for entry in entries)
+        for mtime, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            self._remove(path)
+            size -= entry_size
+
+
+    def clear(self):
+        for mtime, size, path in self.entries():
+            self._remove(path)
+
+
+def cached(cache, archive, path, kind, read, *extra):
+    """
+    Return the part of type `kind` parsed from the member at `path` by
+    calling `read`, unless it is in the cache.
+    """
+    if cache is None or path not in archive.NameToInfo:
+        return read()
+    key = cache.key(kind, archive.getinfo(path), *extra)
+    try:
+        return cache.get(key)
+    except KeyError:
+        pass
+    value = read()
+    cache.put(key, value)
+    return value
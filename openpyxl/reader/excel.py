@@ -7,6 +7,7 @@ from __future__ import absolute_import
 from zipfile import ZipFile, ZIP_DEFLATED, BadZipfile
 from sys import exc_info
 from io import BytesIO
+import multiprocessing
 import os.path
 import warnings
 
@@ -32,13 +33,15 @@ from openpyxl.xml.constants import (
     EXTERNAL_LINK,
     XLTM,
     XLTX,
+    PACKAGE_WORKSHEET_RELS,
 )
 
+from openpyxl.utils.indexed_list import IndexedList
 from openpyxl.workbook import Workbook
 from openpyxl.workbook.names.external import detect_external_links
 from openpyxl.workbook.names.named_range import read_named_ranges
 from .strings import read_string_table
-from .style import read_style_table
+from .style import read_style_table, read_number_formats
 from .workbook import (
     read_content_types,
     read_excel_base_date,
@@ -49,20 +52,48 @@ from .workbook import (
 )
 from openpyxl.workbook.properties import read_properties, DocumentProperties
 from openpyxl.worksheet.read_only import ReadOnlyWorksheet
-from .worksheet import WorkSheetParser
+from .worksheet import WorkSheetParser, WorksheetLoader, parse_payload
 from .comments import read_comments, get_comments_file
+from openpyxl.utils.archive import (
+    MappedFile,
+    map_file,
+    close_archive,
+    close_with_archive,
+)
+from .cache import ParsedCache, cached
 # Use exc_info for Python 2 compatibility with "except Exception[,/ as] e"
 
 
 CENTRAL_DIRECTORY_SIGNATURE = b'\x50\x4b\x05\x06'
 SUPPORTED_FORMATS = ('.xlsx', '.xlsm', '.xltx', '.xltm')
 
+# workbook attributes set from the stylesheet
+STYLE_ATTRIBUTES = (
+    ('_differential_styles', 'differential_styles'),
+    ('_cell_styles', 'cell_styles'),
+    ('_named_styles', 'named_styles'),
+    ('_colors', 'color_index'),
+    ('_borders', 'border_list'),
+    ('_fonts', 'font_list'),
+    ('_fills', 'fill_list'),
+    ('_number_formats', 'number_formats'),
+    ('_protections', 'protections'),
+    ('_alignments', 'alignments'),
+)
+
 
 def repair_central_directory(zipFile, is_file_instance):
     ''' trims trailing data from the central directory
     code taken from http://stackoverflow.com/a/7457686/570216, courtesy of Uri Cohen
     '''
 
+    if isinstance(zipFile, MappedFile):
+        pos = zipFile.find(CENTRAL_DIRECTORY_SIGNATURE)
+        if pos > 0:
+            return zipFile.truncated(pos + 22)
+        zipFile.seek(0)
+        return zipFile
+
     f = zipFile if is_file_instance else open(zipFile, 'rb+')
     data = f.read()
     pos = data.find(CENTRAL_DIRECTORY_SIGNATURE)  # End of central directory signature
@@ -78,9 +109,11 @@ def repair_central_directory(zipFile, is_file_instance):
 
 
 
-def _validate_archive(filename):
+def _validate_archive(filename, keep=False):
     """
-    Check the file is a valid zipfile
+    Check the file is a valid zipfile. With `keep` the archive outlives the
+    call, so file objects which cannot be mapped are copied from their
+    current position rather than read in place.
     """
     is_file_like = hasattr(filename, 'read')
 
@@ -110,15 +143,89 @@ def _validate_archive(filename):
         if getattr(filename, 'encoding', None) is not None:
             raise IOError("File-object must be opened in binary mode")
 
+    source = map_file(filename)
+    if source is None:
+        source = filename
+        if is_file_like and keep:
+            source = BytesIO(filename.read())
     try:
-        archive = ZipFile(filename, 'r', ZIP_DEFLATED)
+        archive = ZipFile(source, 'r', ZIP_DEFLATED)
     except BadZipfile:
-        f = repair_central_directory(filename, is_file_like)
+        f = repair_central_directory(source, is_file_like)
         archive = ZipFile(f, 'r', ZIP_DEFLATED)
     return archive
 
 
-def load_workbook(filename, read_only=False, use_iterators=False, keep_vba=KEEP_VBA, guess_types=False, data_only=False):
+def _select_worksheets(worksheets, titles):
+    """
+    Keep the worksheets with the given titles, in workbook order. Also
+    return the new position of each one by its original position.
+    """
+    found = set(sheet['title'] for sheet in worksheets)
+    for title in titles:
+        if title not in found:
+            raise KeyError("Worksheet {0} does not exist.".format(title))
+
+    titles = set(titles)
+    selected = []
+    positions = {}
+    for idx, sheet in enumerate(worksheets):
+        if sheet['title'] in titles:
+            positions[idx] = len(selected)
+            selected.append(sheet)
+    return selected, positions
+
+
+def _read_styles(archive):
+    parsed = read_style_table(archive)
+    if parsed is not None:
+        return dict((name, getattr(parsed, attr))
+                    for name, attr in STYLE_ATTRIBUTES)
+
+
+def _read_strings(archive, path, spill=False):
+    src = archive.open(path)
+    try:
+        return read_string_table(src, spill=spill)
+    finally:
+        src.close()
+
+
+def _parse_task(args):
+    return parse_payload(*args)
+
+
+def _fork_pool(processes):
+    try:
+        context = multiprocessing.get_context('fork')
+    except AttributeError:
+        # Python 2 always forks
+        return multiprocessing.Pool(processes)
+    return context.Pool(processes)
+
+
+def _parse_worksheets(archive, paths, data_only, workers):
+    """
+    Parse worksheets in a pool of forked processes. Workers open the file
+    themselves when possible, otherwise they are sent the XML.
+    """
+    filename = archive.filename
+    if filename and os.path.isfile(filename):
+        tasks = [(filename, path, data_only) for path in paths]
+    else:
+        tasks = [(archive.read(path), None, data_only) for path in paths]
+
+    pool = _fork_pool(min(workers, len(tasks) or 1))
+    try:
+        return pool.map(_parse_task, tasks, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def load_workbook(filename, read_only=False, use_iterators=False, keep_vba=KEEP_VBA, guess_types=False, data_only=False,
+                  spill_strings=False, workers=None, lazy=False, sheets=None,
+                  styles=True, lazy_formulae=False, cache=None):
     """Open the given filename and return the workbook
 
     :param filename: the path to open or a file-like object
@@ -139,6 +246,27 @@ def load_workbook(filename, read_only=False, use_iterators=False, keep_vba=KEEP_
     :param data_only: controls whether cells with formulae have either the formula (default) or the value stored the last time Excel read the sheet
     :type data_only: bool
 
+    :param spill_strings: keep shared strings in a memory-mapped temporary file rather than in memory
+    :type spill_strings: bool
+
+    :param workers: number of processes used to parse worksheets. Processes are forked so worksheets are parsed serially where fork is not available. Ignored in read-only mode
+    :type workers: int
+
+    :param lazy: parse each worksheet when it is first used. Worksheets that are never used are copied unchanged when the workbook is saved. Ignored in read-only mode
+    :type lazy: bool
+
+    :param sheets: titles of the worksheets to load, the others are skipped without being read
+    :type sheets: list of strings
+
+    :param styles: read the styles of cells. If False, only the number formats needed to recognise dates are read and cells keep the index of their style. Such workbooks cannot be saved
+    :type styles: bool
+
+    :param lazy_formulae: keep cells that share a formula unexpanded until their value is used. Ignored when worksheets are parsed by workers or cached
+    :type lazy_formulae: bool
+
+    :param cache: directory in which to keep parsed worksheets, shared strings and styles for the next time an unchanged workbook is loaded. Worksheets are only cached when they are all read when the workbook is opened
+    :type cache: string or :class:`openpyxl.reader.cache.ParsedCache`
+
     :rtype: :class:`openpyxl.workbook.Workbook`
 
     .. note::
@@ -147,8 +275,11 @@ def load_workbook(filename, read_only=False, use_iterators=False, keep_vba=KEEP_
         and the returned workbook will be read-only.
 
     """
-    archive = _validate_archive(filename)
     read_only = read_only or use_iterators
+    lazy = lazy and not read_only
+    archive = _validate_archive(filename, keep_vba or read_only or lazy)
+    if cache is not None and not isinstance(cache, ParsedCache):
+        cache = ParsedCache(cache)
 
     wb = Workbook(guess_types=guess_types, data_only=data_only, read_only=read_only)
 
@@ -157,22 +288,13 @@ def load_workbook(filename, read_only=False, use_iterators=False, keep_vba=KEEP_
 
     valid_files = archive.namelist()
 
-    # If are going to preserve the vba then attach a copy of the archive to the
+    # If are going to preserve the vba then attach the archive to the
     # workbook so that is available for the save.
     if keep_vba:
-        try:
-            f = open(filename, 'rb')
-            s = f.read()
-            f.close()
-        except:
-            pos = filename.tell()
-            filename.seek(0)
-            s = filename.read()
-            filename.seek(pos)
-        wb.vba_archive = ZipFile(BytesIO(s), 'r')
+        wb.vba_archive = archive
 
     if read_only:
-        wb._archive = ZipFile(filename)
+        wb._archive = archive
 
     # get workbook-level information
     try:
@@ -188,10 +310,22 @@ def load_workbook(filename, read_only=False, use_iterators=False, keep_vba=KEEP_
     if strings_path is not None:
         if strings_path.startswith("/"):
             strings_path = strings_path[1:]
-        shared_strings = read_string_table(archive.read(strings_path))
+        if spill_strings:
+            shared_strings = _read_strings(archive, strings_path,
+                                           spill=spill_strings)
+            if read_only or lazy:
+                # worksheets read from the archive later need the strings
+                close_with_archive(archive, shared_strings)
+        else:
+            shared_strings = cached(cache, archive, strings_path, 'strings',
+                lambda: _read_strings(archive, strings_path))
     else:
         shared_strings = []
 
+    if lazy:
+        # copied worksheets refer to the original strings
+        wb.shared_strings = IndexedList(shared_strings)
+
     wb.is_template = XLTX in cts or XLTM in cts
 
     try:
@@ -199,42 +333,91 @@ def load_workbook(filename, read_only=False, use_iterators=False, keep_vba=KEEP_
     except KeyError:
         assert wb.loaded_theme == None, "even though the theme information is missing there is a theme object ?"
 
-    parsed_styles = read_style_table(archive)
+    if styles:
+        parsed_styles = cached(cache, archive, ARC_STYLE, 'styles',
+                               lambda: _read_styles(archive))
+    else:
+        parsed_styles = None
+        formats = read_number_formats(archive)
+        if formats is not None:
+            wb._number_formats, wb._cell_styles = formats
+        # conditional formats are read without their differential styles
+        wb._differential_styles = None
+        # saving would drop every style
+        wb._without_styles = True
+
     if parsed_styles is not None:
-        wb._differential_styles = parsed_styles.differential_styles
-        wb._cell_styles = parsed_styles.cell_styles
-        wb._named_styles = parsed_styles.named_styles
-        wb._colors = parsed_styles.color_index
-        wb._borders = parsed_styles.border_list
-        wb._fonts = parsed_styles.font_list
-        wb._fills = parsed_styles.fill_list
-        wb._number_formats = parsed_styles.number_formats
-        wb._protections = parsed_styles.protections
-        wb._alignments = parsed_styles.alignments
-        wb._colors = parsed_styles.color_index
+        for name, value in parsed_styles.items():
+            setattr(wb, name, value)
 
     wb.excel_base_date = read_excel_base_date(archive)
 
     # get worksheets
     wb.worksheets = []  # remove preset worksheet
-    for sheet in detect_worksheets(archive):
+    worksheets = [sheet for sheet in detect_worksheets(archive)
+                  if sheet['path'] in valid_files]
+    positions = None
+    if sheets is not None:
+        worksheets, positions = _select_worksheets(worksheets, sheets)
+
+    payloads = {}
+    keys = {}
+    paths = []
+    if not (read_only or lazy):
+        paths = [sheet['path'] for sheet in worksheets]
+    if cache is not None:
+        for path in paths:
+            keys[path] = key = cache.key('sheet', archive.getinfo(path), data_only)
+            try:
+                payloads[path] = cache.get(key)
+            except KeyError:
+                pass
+        paths = [path for path in paths if path not in payloads]
+
+    if workers and workers > 1 and paths and hasattr(os, 'fork'):
+        parsed = dict(zip(paths,
+                          _parse_worksheets(archive, paths, data_only, workers)))
+        for path, payload in parsed.items():
+            if path in keys:
+                cache.put(keys[path], payload)
+        payloads.update(parsed)
+
+    for sheet in worksheets:
         sheet_name = sheet['title']
         worksheet_path = sheet['path']
-        if not worksheet_path in valid_files:
-            continue
 
         if read_only:
             new_ws = ReadOnlyWorksheet(wb, sheet_name, worksheet_path, None,
                                        shared_strings)
             wb._add_sheet(new_ws)
+        elif worksheet_path in payloads:
+            parser = WorkSheetParser(wb, sheet_name, None, shared_strings)
+            parser.parse_payload(payloads.pop(worksheet_path))
+            new_ws = wb[sheet_name]
+        elif lazy:
+            parser = WorkSheetParser(wb, sheet_name, None, shared_strings,
+                                     lazy_formulae)
+            rels = "%s/%s.rels" % (PACKAGE_WORKSHEET_RELS,
+                                   os.path.split(worksheet_path)[-1])
+            comments_file = get_comments_file(worksheet_path, archive, valid_files)
+            WorksheetLoader(parser, archive, worksheet_path,
+                            rels=rels in valid_files, comments=comments_file)
+            new_ws = parser.ws
+        elif worksheet_path in keys:
+            payload = parse_payload(archive.read(worksheet_path),
+                                    data_only=data_only)
+            cache.put(keys[worksheet_path], payload)
+            parser = WorkSheetParser(wb, sheet_name, None, shared_strings)
+            parser.parse_payload(payload)
+            new_ws = wb[sheet_name]
         else:
             parser = WorkSheetParser(wb, sheet_name, archive.read(worksheet_path),
-                            shared_strings)
+                            shared_strings, lazy_formulae)
             parser.parse()
             new_ws = wb[sheet_name]
         new_ws.sheet_state = sheet['state']
 
-        if not read_only:
+        if not (read_only or lazy):
         # load comments into the worksheet cells
             comments_file = get_comments_file(worksheet_path, archive, valid_files)
             if comments_file is not None:
@@ -243,6 +426,19 @@ def load_workbook(filename, read_only=False, use_iterators=False, keep_vba=KEEP_
     wb._differential_styles = [] # reset
     wb._named_ranges = list(read_named_ranges(archive.read(ARC_WORKBOOK), wb))
 
+    if positions is not None:
+        # sheets are numbered differently once some are left out
+        wb.active = positions.get(wb._active_sheet_index, 0)
+        named_ranges = []
+        for named_range in wb._named_ranges:
+            if named_range.scope is not None:
+                scope = positions.get(int(named_range.scope))
+                if scope is None:
+                    continue
+                named_range.scope = str(scope)
+            named_ranges.append(named_range)
+        wb._named_ranges = named_ranges
+
     wb.code_name = read_workbook_code_name(archive.read(ARC_WORKBOOK))
 
     if EXTERNAL_LINK in cts:
@@ -250,5 +446,11 @@ def load_workbook(filename, read_only=False, use_iterators=False, keep_vba=KEEP_
         wb._external_links = list(detect_external_links(rels, archive))
 
 
-    archive.close()
+    if lazy:
+        wb._archive = archive
+    else:
+        if spill_strings and not read_only and hasattr(shared_strings, 'close'):
+            shared_strings.close()
+        if not (read_only or keep_vba):
+            close_archive(archive)
     return wb
@@ -3,20 +3,50 @@ from __future__ import absolute_import
 
 """Read the shared strings table."""
 
-from openpyxl.compat import unicode
+from array import array
+import mmap
+from struct import calcsize, unpack_from
+from tempfile import TemporaryFile
+
+from openpyxl.compat import unicode, range, INT64_TYPECODE
 
 # package imports
-from openpyxl.utils.indexed_list import IndexedList
-from openpyxl.xml.functions import fromstring, safe_iterator
+from openpyxl.xml.functions import iterparse
 from openpyxl.xml.constants import SHEET_MAIN_NS, XML_NS
 
 
-def read_string_table(xml_source):
-    """Read in all shared strings in the table"""
-    root = fromstring(text=xml_source)
-    nodes = safe_iterator(root, '{%s}si' % SHEET_MAIN_NS)
-    strings = (get_string(node) for node in nodes)
-    return IndexedList(strings)
+SI_TAG = '{%s}si' % SHEET_MAIN_NS
+
+
+def read_string_table(xml_source, spill=False):
+    """Read in all shared strings in the table
+
+    The table is parsed incrementally and strings are returned in a plain
+    list. If `spill` is True, or a filename, they are kept in a
+    memory-mapped file instead.
+    """
+    from .worksheet import _get_xml_iter
+    strings = iter_strings(_get_xml_iter(xml_source))
+    if spill:
+        filename = None
+        if spill is not True:
+            filename = spill
+        return SharedStringFile(strings, filename)
+    return list(strings)
+
+
+def iter_strings(source):
+    """
+    Yield strings from a shared string table, discarding each <si> element
+    once it has been read.
+    """
+    root = None
+    for event, node in iterparse(source, events=('start', 'end')):
+        if root is None:
+            root = node
+        if event == 'end' and node.tag == SI_TAG:
+            yield get_string(node)
+            root.clear()
 
 
 def get_string(string_index_node):
@@ -42,3 +72,60 @@ def get_text(rich_node):
     # fix XML escaping sequence for '_x'
     text = text.replace('x005F_', '')
     return unicode(text)
+
+
+class SharedStringFile(object):
+    """
+    Read-only sequence of strings stored in a memory-mapped file.
+
+    The file contains the UTF-8 encoded strings back to back followed by
+    an array of their offsets, so only the strings being looked up are
+    ever decoded.
+    """
+
+    def __init__(self, strings, filename=None):
+        if filename is None:
+            self._file = TemporaryFile()
+        else:
+            self._file = open(filename, "w+b")
+
+        offsets = array(INT64_TYPECODE)
+        pos = 0
+        for value in strings:
+            data = value.encode("utf-8")
+            self._file.write(data)
+            offsets.append(pos)
+            pos += len(data)
+        offsets.append(pos)
+        offsets.tofile(self._file)
+        self._file.flush()
+
+        self._count = len(offsets) - 1
+        self._base = pos
+        self._fmt = "@2" + INT64_TYPECODE
+        self._size = calcsize("@" + INT64_TYPECODE)
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+    def __len__(self):
+        return self._count
+
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self._count
+        if not 0 <= idx < self._count:
+            raise IndexError("string index out of range")
+        start, end = unpack_from(self._fmt, self._map,
+                                 self._base + idx * self._size)
+        return self._map[start:end].decode("utf-8")
+
+
+    def __iter__(self):
+        for idx in range(self._count):
+            yield self[idx]
+
+
+    def close(self):
+        self._map.close()
+        self._file.close()
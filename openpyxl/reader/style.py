@@ -23,6 +23,7 @@ from openpyxl.styles.colors import COLOR_INDEX, Color
 from openpyxl.styles.style import StyleId
 from openpyxl.styles.named_styles import NamedStyle
 from openpyxl.xml.functions import fromstring, safe_iterator, localname
+from openpyxl.xml.backends import iterparse, BACKENDS
 from openpyxl.xml.constants import SHEET_MAIN_NS, ARC_STYLE
 from copy import deepcopy
 
@@ -182,6 +183,58 @@ def read_style_table(archive):
         return p
 
 
+def read_number_formats(archive):
+    """
+    Read only what is needed to tell dates from numbers: the number format
+    of each cell style and the custom formats. Fonts, fills and everything
+    else in the stylesheet are skipped.
+
+    Returns (number_formats, cell_styles) or None if there is no stylesheet.
+    Cell styles only have a number format and are shared between cell
+    styles with the same one.
+    """
+    if ARC_STYLE not in archive.namelist():
+        return
+
+    NUMFMT_TAG = '{%s}numFmt' % SHEET_MAIN_NS
+    XFS_TAG = '{%s}cellXfs' % SHEET_MAIN_NS
+    STYLE_XFS_TAG = '{%s}cellStyleXfs' % SHEET_MAIN_NS
+    XF_TAG = '{%s}xf' % SHEET_MAIN_NS
+
+    custom_formats = {}
+    number_formats = IndexedList()
+    cell_styles = []
+    styles = {}
+    in_xfs = False
+
+    # most of the stylesheet is skipped, which lxml does without
+    # creating any elements
+    backend = 'lxml' if 'lxml' in BACKENDS else None
+    # xf elements are only found in cellStyleXfs and cellXfs and their
+    # attributes are known when they start
+    tags = [NUMFMT_TAG, XFS_TAG, STYLE_XFS_TAG, XF_TAG]
+    for _, element in iterparse(archive.open(ARC_STYLE), tag=tags,
+                                events=('start',), backend=backend):
+        tag = element.tag
+        if tag == XF_TAG:
+            if not in_xfs:
+                continue
+            numFmtId = int(element.get('numFmtId', 0))
+            if numFmtId in custom_formats:
+                numFmtId = number_formats.add(custom_formats[numFmtId]) + 164
+            if numFmtId not in styles:
+                styles[numFmtId] = StyleId(numFmtId=numFmtId)
+            cell_styles.append(styles[numFmtId])
+        elif tag == NUMFMT_TAG:
+            custom_formats[int(element.get('numFmtId'))] = element.get('formatCode')
+        elif tag == XFS_TAG:
+            in_xfs = True
+        elif tag == STYLE_XFS_TAG:
+            in_xfs = False
+
+    return number_formats, IndexedList(cell_styles)
+
+
 def bool_attrib(element, attr):
     """
     Cast an XML attribute that should be a boolean to a Python equivalent
@@ -0,0 +1,106 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+import os
+from zipfile import ZipInfo
+
+import pytest
+
+from ..cache import ParsedCache, cached
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return ParsedCache(str(tmpdir.join("cache")), max_size=10000)
+
+
+def make_info(crc, size):
+    info = ZipInfo("xl/worksheets/sheet1.xml")
+    info.CRC = crc
+    info.file_size = size
+    return info
+
+
+def test_key(cache):
+    key = cache.key("sheet", make_info(1234, 100), False)
+    assert key == cache.key("sheet", make_info(1234, 100), False)
+    assert key != cache.key("sheet", make_info(1235, 100), False)
+    assert key != cache.key("sheet", make_info(1234, 101), False)
+    assert key != cache.key("sheet", make_info(1234, 100), True)
+    assert key != cache.key("strings", make_info(1234, 100), False)
+
+
+def test_get_put(cache):
+    with pytest.raises(KeyError):
+        cache.get("abc")
+    cache.put("abc", {'cells':[(1, 1, u"a", 's', None)]})
+    assert cache.get("abc") == {'cells':[(1, 1, u"a", 's', None)]}
+
+
+def test_damaged_entry(cache):
+    cache.put("abc", [1, 2, 3])
+    path = cache.entries()[0][2]
+    with open(path, "wb") as f:
+        f.write(b"garbage")
+    with pytest.raises(KeyError):
+        cache.get("abc")
+    assert cache.entries() == []
+
+
+def test_evict(cache):
+    value = b"x" * 4000
+    for idx, key in enumerate(["a", "b"]):
+        cache.put(key, value)
+        os.utime(cache._path(key), (idx, idx))
+    cache.get("a") # now more recent than b
+    cache.put("c", value)
+    assert len(cache.entries()) == 2
+    with pytest.raises(KeyError):
+        cache.get("b")
+    assert cache.get("a") == value
+
+
+def test_clear(cache):
+    cache.put("a", 1)
+    cache.clear()
+    assert cache.entries() == []
+
+
+class DummyArchive:
+
+    NameToInfo = {'xl/styles.xml':make_info(1, 2)}
+
+    def getinfo(self, path):
+        return self.NameToInfo[path]
+
+
+def test_cached(cache):
+    archive = DummyArchive()
+    reads = []
+
+    def read():
+        reads.append(1)
+        return u"parsed"
+
+    for i in range(2):
+        assert cached(cache, archive, 'xl/styles.xml', 'styles', read) == u"parsed"
+    assert len(reads) == 1
+    assert cached(cache, archive, 'missing.xml', 'styles', read) == u"parsed"
+    assert len(reads) == 2
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_load_cached(datadir, tmpdir, workers):
+    from ..excel import load_workbook
+    datadir.chdir()
+    directory = str(tmpdir.join("cache"))
+    expected = load_workbook("complex-styles.xlsx")
+    for i in range(2):
+        wb = load_workbook("complex-styles.xlsx", cache=directory, workers=workers)
+        assert wb._fonts == expected._fonts
+        assert wb._cell_styles == expected._cell_styles
+        for ws, other in zip(wb, expected):
+            assert [(c.value, c.style_id) for c in ws.get_cell_collection()] == \
+                [(c.value, c.style_id) for c in other.get_cell_collection()]
+    # styles, strings and one worksheet
+    assert len(os.listdir(directory)) == 3
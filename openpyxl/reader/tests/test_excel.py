@@ -67,3 +67,192 @@ def test_read_stringio():
     # Test invalid file-like objects are detected and not handled as regular files
     with pytest.raises(BadZipfile):
         load_workbook(filelike)
+
+
+def _sheet_contents(wb):
+    contents = []
+    for ws in wb:
+        cells = sorted((c.coordinate, c.value, c.data_type, c.style_id)
+                       for c in ws.get_cell_collection())
+        contents.append((ws.title, cells, ws.merged_cell_ranges,
+                         ws.formula_attributes, sorted(ws.row_dimensions)))
+    return contents
+
+
+@pytest.mark.parametrize("filename", ["complex-styles.xlsx", "bug304.xlsx"])
+def test_parallel_workers(datadir, filename):
+    datadir.chdir()
+    wb = load_workbook(filename)
+    with open(filename, "rb") as src:
+        for source in (filename, src):
+            parallel = load_workbook(source, workers=2)
+            assert _sheet_contents(parallel) == _sheet_contents(wb)
+
+
+
+def test_workers_without_fork(datadir, monkeypatch):
+    from .. import excel
+
+    def _parse_worksheets(*args):
+        raise AssertionError("worksheets should be parsed serially")
+
+    monkeypatch.delattr(excel.os, "fork", raising=False)
+    monkeypatch.setattr(excel, "_parse_worksheets", _parse_worksheets)
+    datadir.chdir()
+    wb = load_workbook("complex-styles.xlsx", workers=2)
+    assert _sheet_contents(wb) == _sheet_contents(
+        load_workbook("complex-styles.xlsx"))
+
+@pytest.mark.parametrize("filename", ["complex-styles.xlsx", "bug304.xlsx"])
+def test_lazy_load(datadir, filename):
+    datadir.chdir()
+    wb = load_workbook(filename)
+    lazy = load_workbook(filename, lazy=True)
+    assert [ws._loader is not None for ws in lazy] == [True] * len(wb.worksheets)
+    assert _sheet_contents(lazy) == _sheet_contents(wb)
+    assert [ws._loader for ws in lazy] == [None] * len(wb.worksheets)
+
+
+
+def test_load_sheets(tmpdir):
+    from openpyxl import Workbook
+    wb = Workbook()
+    for title in ("Data", "Other", "Lookup"):
+        ws = wb.create_sheet(title=title)
+        ws['A1'] = title
+    wb.active = 3
+    wb.create_named_range("target", wb["Lookup"], "$A$1", scope=3)
+    wb.create_named_range("skipped", wb["Other"], "$A$1", scope=2)
+    wb.create_named_range("shared", wb["Data"], "$A$1")
+    fname = str(tmpdir.join("sheets.xlsx"))
+    wb.save(fname)
+
+    for read_only in (False, True):
+        wb = load_workbook(fname, read_only=read_only, sheets=["Lookup", "Data"])
+        assert wb.get_sheet_names() == ["Data", "Lookup"]
+        assert wb["Lookup"]['A1'].value == "Lookup"
+        assert wb.active.title == "Lookup"
+    names = dict((n.name, n.scope) for n in wb.get_named_ranges())
+    assert names == {"target": "1", "shared": None}
+
+
+def test_load_missing_sheet(datadir):
+    datadir.chdir()
+    with pytest.raises(KeyError):
+        load_workbook("bug304.xlsx", sheets=["Missing"])
+
+
+@pytest.mark.parametrize("filename", ["complex-styles.xlsx", "date_1900.xlsx"])
+@pytest.mark.parametrize("read_only", [False, True])
+def test_load_without_styles(datadir, filename, read_only):
+    datadir.chdir()
+    wb = load_workbook(filename, read_only=read_only)
+    plain = load_workbook(filename, read_only=read_only, styles=False)
+    for ws, plain_ws in zip(wb, plain):
+        cells = [[(c.value, c.is_date, c._style_id) for c in row] for row in ws.rows]
+        assert cells == [[(c.value, c.is_date, c._style_id) for c in row]
+                         for row in plain_ws.rows]
+
+
+def test_save_without_styles(datadir):
+    datadir.chdir()
+    wb = load_workbook("complex-styles.xlsx", styles=False)
+    with pytest.raises(TypeError):
+        wb.save(BytesIO())
+
+@pytest.mark.parametrize("lazy_formulae", [False, True])
+def test_shared_formulae(tmpdir, lazy_formulae):
+    from openpyxl import Workbook
+    wb = Workbook()
+    ws = wb.active
+    for row in range(1, 4):
+        ws.cell(row=row, column=1, value=row)
+        ws.cell(row=row, column=2, value="=A1*2")
+        ws.formula_attributes['B%d' % row] = {'t': 'shared', 'si': '0'}
+    ws.formula_attributes['B1']['ref'] = 'B1:B3'
+    fname = str(tmpdir.join("shared.xlsx"))
+    wb.save(fname)
+
+    wb = load_workbook(fname, lazy_formulae=lazy_formulae)
+    ws = wb.active
+    assert (ws['B3']._value != "=A3*2") is lazy_formulae
+    assert [ws.cell(row=row, column=2).value for row in range(1, 4)] == [
+        "=A1*2", "=A2*2", "=A3*2"]
+    assert ws['B3']._value == "=A3*2"
+
+def test_lazy_copy(datadir, tmpdir):
+    from zipfile import ZipFile
+    datadir.chdir()
+    wb = load_workbook("bug304.xlsx", lazy=True)
+    ws = wb.worksheets[0]
+    ws['A1'] = "changed"
+    unused = wb.worksheets[1]._loader.path
+
+    out = str(tmpdir.join("lazy.xlsx"))
+    wb.save(out)
+    src = ZipFile("bug304.xlsx")
+    dst = ZipFile(out)
+    assert dst.read("xl/worksheets/sheet2.xml") == src.read(unused)
+    src.close()
+    dst.close()
+
+    wb = load_workbook(out)
+    assert wb.worksheets[0]['A1'].value == "changed"
+
+
+def test_repair_mapped_archive(datadir, tmpdir):
+    from openpyxl.utils.archive import MappedFile
+    from ..excel import _validate_archive
+
+    datadir.chdir()
+    with open("empty_with_no_properties.xlsx", "rb") as src:
+        data = src.read()
+    path = tmpdir.join("trailing.xlsx")
+    # more than zipfile will search for the end of the central directory
+    path.write_binary(data + b"trailing data" * 10000)
+
+    archive = _validate_archive(str(path))
+    assert isinstance(archive.fp, MappedFile)
+    assert archive.fp.size == len(data)
+    assert len(load_workbook(str(path)).sheetnames) == 4
+
+
+
+def test_stream_read_in_place(datadir):
+    from ..excel import _validate_archive
+
+    datadir.chdir()
+    with open("empty_with_no_properties.xlsx", "rb") as src:
+        data = src.read()
+    f = BytesIO(data)
+    assert _validate_archive(f).fp is f
+
+    f = BytesIO(b"prefix" + data)
+    f.seek(6)
+    archive = _validate_archive(f, keep=True)
+    assert archive.fp is not f
+    assert archive.fp.getvalue() == data
+
+
+@pytest.mark.parametrize("read_only", [False, True])
+def test_spilled_strings_closed(datadir, monkeypatch, read_only):
+    from .. import excel
+    opened = []
+    _read_strings = excel._read_strings
+
+    def read_strings(*args, **kw):
+        strings = _read_strings(*args, **kw)
+        opened.append(strings)
+        return strings
+
+    monkeypatch.setattr(excel, "_read_strings", read_strings)
+    datadir.chdir()
+    wb = load_workbook("complex-styles.xlsx", read_only=read_only,
+                       spill_strings=True)
+    strings = opened[0]
+    assert strings._map.closed is not read_only
+    if read_only:
+        assert [row for row in wb.active.values]
+        wb.close()
+        assert strings._map.closed
+        assert strings._file.closed
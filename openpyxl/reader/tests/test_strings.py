@@ -1,6 +1,8 @@
 # Copyright (c) 2010-2015 openpyxl
 
 
+import pytest
+
 # package imports
 from openpyxl.reader.strings import read_string_table
 
@@ -30,3 +32,32 @@ def test_formatted_string_table(datadir):
             'Welcome', 'to the best shop in town', "     let's play "]
 
 
+
+
+def test_read_string_table_stream(datadir):
+    datadir.chdir()
+    with open('sharedStrings.xml', 'rb') as content:
+        assert read_string_table(content) == [
+                'This is cell A1 in Sheet 1', 'This is cell G5']
+
+
+def test_spill(datadir, tmpdir):
+    datadir.chdir()
+    with open('shared-strings-rich.xml', 'rb') as content:
+        strings = read_string_table(content, spill=True)
+    assert len(strings) == 3
+    assert strings[1] == 'to the best shop in town'
+    assert strings[-1] == "     let's play "
+    assert list(strings) == [
+            'Welcome', 'to the best shop in town', "     let's play "]
+    strings.close()
+
+
+def test_spill_file(tmpdir):
+    from openpyxl.reader.strings import SharedStringFile
+    tmpdir.chdir()
+    strings = SharedStringFile([u'\xe9t\xe9', u'', u'x' * 1000], "strings.bin")
+    assert list(strings) == [u'\xe9t\xe9', u'', u'x' * 1000]
+    with pytest.raises(IndexError):
+        strings[3]
+    strings.close()
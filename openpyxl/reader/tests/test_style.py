@@ -307,3 +307,15 @@ def test_assign_number_formats(StyleReader):
 
     assert reader.cell_styles == [{'fillId': 0, 'fontId': 2, 'xfId': 0,
                                    'protectionId': 0, 'borderId': 0, 'numFmtId': 164, 'alignmentId': 0}]
+
+
+@pytest.mark.parametrize("filename", ["complex-styles.xlsx", "date_1900.xlsx"])
+def test_read_number_formats(datadir, filename):
+    from ..style import read_number_formats, read_style_table
+    datadir.chdir()
+    archive = ZipFile(filename)
+    number_formats, cell_styles = read_number_formats(archive)
+    parsed = read_style_table(archive)
+    assert number_formats == parsed.number_formats
+    assert [s.numFmtId for s in cell_styles] == [s.numFmtId for s in parsed.cell_styles]
+    assert [s.fontId for s in cell_styles] == [0] * len(cell_styles)
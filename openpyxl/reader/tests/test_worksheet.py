@@ -451,7 +451,9 @@ def test_cell_exotic_style(WorkSheetParser, datadir):
     datadir.chdir()
     parser = WorkSheetParser
     ws = parser.ws
-    parser.styles = [None, None, {'pivotButton':True, 'quotePrefix':True}]
+    from openpyxl.styles.style import StyleId
+    ws.parent._cell_styles = IndexedList([StyleId(), StyleId(),
+                                          StyleId(pivotButton=True, quotePrefix=True)])
 
     src = """
     <x:c xmlns:x="http://schemas.openxmlformats.org/spreadsheetml/2006/main" r="D4" s="2">
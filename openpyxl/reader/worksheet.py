@@ -4,8 +4,12 @@ from __future__ import absolute_import
 """Reader for a single worksheet."""
 from io import BytesIO
 
+from zipfile import ZipFile
+
 # compatibility imports
 from openpyxl.xml.functions import iterparse
+# iterparse always comes from the standard library
+from xml.etree.ElementTree import fromstring, tostring
 
 # package imports
 from openpyxl.cell import Cell
@@ -66,19 +70,25 @@ class WorkSheetParser(object):
     INLINE_STRING = "{%s}is/{%s}t" % (SHEET_MAIN_NS, SHEET_MAIN_NS)
     INLINE_RICHTEXT = "{%s}is/{%s}r/{%s}t" % (SHEET_MAIN_NS, SHEET_MAIN_NS, SHEET_MAIN_NS)
 
-    def __init__(self, wb, title, xml_source, shared_strings):
+    lazy_formulae = False
+
+    def __init__(self, wb, title, xml_source, shared_strings, lazy_formulae=False):
         self.ws = wb.create_sheet(title=title)
         self.source = xml_source
         self.shared_strings = shared_strings
         self.guess_types = wb._guess_types
         self.data_only = wb.data_only
-        self.styles = [dict(v) for v in self.ws.parent._cell_styles]
         self.differential_styles = wb._differential_styles
         self.keep_vba = wb.vba_archive is not None
         self.shared_formula_masters = {}  # {si_str: Translator()}
-
-    def parse(self):
-        dispatcher = {
+        # guessing types needs the formula
+        self.lazy_formulae = lazy_formulae and not self.guess_types
+        self.formula_attributes = self.ws.formula_attributes
+        self.row_counter = self.col_counter = 0
+
+    @property
+    def dispatcher(self):
+        return {
             '{%s}mergeCells' % SHEET_MAIN_NS: self.parse_merge,
             '{%s}col' % SHEET_MAIN_NS: self.parse_column_dimensions,
             '{%s}row' % SHEET_MAIN_NS: self.parse_row_dimensions,
@@ -94,6 +104,9 @@ class WorkSheetParser(object):
             '{%s}legacyDrawing' % SHEET_MAIN_NS: self.parse_legacy_drawing,
             '{%s}sheetViews' % SHEET_MAIN_NS: self.parse_sheet_views,
                       }
+
+    def parse(self):
+        dispatcher = self.dispatcher
         tags = dispatcher.keys()
         stream = _get_xml_iter(self.source)
         it = iterparse(stream, tag=tags)
@@ -106,7 +119,36 @@ class WorkSheetParser(object):
 
         self.ws._current_row = self.ws.max_row
 
+    def parse_payload(self, payload):
+        """
+        Add the contents of a worksheet parsed by a
+        :class:`CellPayloadParser` to the worksheet
+        """
+        dispatcher = self.dispatcher
+        elements = [fromstring(xml) for xml in payload['before']]
+        for element in elements:
+            dispatcher[element.tag](element)
+
+        for attrs in payload['rows']:
+            self.add_row_dimension(attrs)
+        for cell in payload['cells']:
+            self.bind_cell(*cell)
+        self.formula_attributes.update(payload['formula_attributes'])
+
+        elements = [fromstring(xml) for xml in payload['after']]
+        for element in elements:
+            dispatcher[element.tag](element)
+
+        self.ws._current_row = self.ws.max_row
+
     def parse_cell(self, element):
+        self.bind_cell(*self.decode_cell(element))
+
+    def decode_cell(self, element):
+        """
+        Convert a cell element into a (row, column, value, data_type,
+        style_id) tuple. Shared strings are left as indices.
+        """
         value = element.find(self.VALUE_TAG)
         if value is not None:
             value = value.text
@@ -115,6 +157,14 @@ class WorkSheetParser(object):
         coordinate = element.get('r')
         style_id = element.get('s')
 
+        if coordinate is None:
+            # cells without a reference follow on from the previous one
+            row, column = self.row_counter, self.col_counter + 1
+            coordinate = "%s%d" % (get_column_letter(column), row)
+        else:
+            row, column = coordinate_to_tuple(coordinate)
+        self.col_counter = column
+
         # assign formula to cell value unless only the data is desired
         if formula is not None and not self.data_only:
             data_type = 'f'
@@ -124,10 +174,10 @@ class WorkSheetParser(object):
                 value = "="
             formula_type = formula.get('t')
             if formula_type:
-                self.ws.formula_attributes[coordinate] = {'t': formula_type}
+                self.formula_attributes[coordinate] = {'t': formula_type}
                 si = formula.get('si')  # Shared group index for shared formulas
                 if si:
-                    self.ws.formula_attributes[coordinate]['si'] = si
+                    self.formula_attributes[coordinate]['si'] = si
                     if formula_type == "shared":
                         # The spec (18.3.1.40) defines shared formulae in
                         # terms of the following:
@@ -171,20 +221,18 @@ class WorkSheetParser(object):
                             self.shared_formula_masters[si] = Translator(
                                 value, coordinate)
                         else:
-                            value = trans.translate_formula(coordinate)
+                            if self.lazy_formulae:
+                                # translated when the cell value is used
+                                value = trans
+                            else:
+                                value = trans.translate_formula(coordinate)
                 ref = formula.get('ref')  # Range for shared formulas
                 if ref:
-                    self.ws.formula_attributes[coordinate]['ref'] = ref
+                    self.formula_attributes[coordinate]['ref'] = ref
 
 
-        style = {}
         if style_id is not None:
             style_id = int(style_id)
-            style = self.styles[style_id]
-
-        row, column = coordinate_to_tuple(coordinate)
-        cell = Cell(self.ws, row=row, col_idx=column, **style)
-        self.ws._cells[(row, column)] = cell
 
         if value is not None:
             if data_type == 'n':
@@ -192,18 +240,27 @@ class WorkSheetParser(object):
             elif data_type == 'b':
                 value = bool(int(value))
             elif data_type == 's':
-                value = self.shared_strings[int(value)]
-            elif data_type == 'str':
-                data_type = 's'
+                value = int(value)
 
-        else:
-            if data_type == 'inlineStr':
-                data_type = 's'
-                child = element.find(self.INLINE_STRING)
-                if child is None:
-                    child = element.find(self.INLINE_RICHTEXT)
-                if child is not None:
-                    value = child.text
+        elif data_type == 'inlineStr':
+            child = element.find(self.INLINE_STRING)
+            if child is None:
+                child = element.find(self.INLINE_RICHTEXT)
+            if child is not None:
+                value = child.text
+
+        return row, column, value, data_type, style_id
+
+    def bind_cell(self, row, column, value, data_type, style_id):
+        """Create a cell in the worksheet from a decoded cell"""
+        cell = Cell(self.ws, row=row, col_idx=column, style_id=style_id)
+        self.ws._cells[(row, column)] = cell
+
+        if data_type == 's':
+            if value is not None:
+                value = self.shared_strings[value]
+        elif data_type in ('str', 'inlineStr'):
+            data_type = 's'
 
         if self.guess_types or value is None:
             cell.value = value
@@ -226,14 +283,23 @@ class WorkSheetParser(object):
 
     def parse_row_dimensions(self, row):
         attrs = dict(row.attrib)
+        if 'r' in attrs:
+            self.row_counter = int(attrs['r'])
+        else:
+            self.row_counter += 1
+            attrs['r'] = self.row_counter
+        self.col_counter = 0
         if set(attrs) - set(['r', 'span']):
-            attrs['worksheet'] = self.ws
-            dim = RowDimension(**attrs)
-            self.ws.row_dimensions[dim.index] = dim
+            self.add_row_dimension(attrs)
 
         for cell in safe_iterator(row, self.CELL_TAG):
             self.parse_cell(cell)
 
+    def add_row_dimension(self, attrs):
+        attrs['worksheet'] = self.ws
+        dim = RowDimension(**attrs)
+        self.ws.row_dimensions[dim.index] = dim
+
 
     def parse_print_options(self, element):
         self.ws.print_options = PrintOptions.from_tree(element)
@@ -260,7 +326,10 @@ class WorkSheetParser(object):
         for node in cfRules:
             rule = Rule.from_tree(node)
             if rule.dxfId is not None:
-                rule.dxf = self.differential_styles[rule.dxfId]
+                if self.differential_styles is None:
+                    rule.dxfId = None # styles were not read
+                else:
+                    rule.dxf = self.differential_styles[rule.dxfId]
             self.ws.conditional_formatting.cf_rules[range_string].append(rule)
 
 
@@ -306,6 +375,134 @@ class WorkSheetParser(object):
         self.ws.sheet_view = SheetView.from_tree(el)
 
 
+class CellPayloadParser(WorkSheetParser):
+    """
+    Parse a worksheet without a workbook, for instance in another process.
+
+    Cells are collected as compact (row, column, value, data_type,
+    style_id) tuples with shared strings left as indices. All other
+    elements are kept as XML to be dispatched by the
+    :class:`WorkSheetParser` that receives the payload.
+    """
+
+    def __init__(self, xml_source, data_only=False):
+        self.source = xml_source
+        self.data_only = data_only
+        self.shared_formula_masters = {}
+        self.formula_attributes = {}
+        self.row_counter = self.col_counter = 0
+        self.cells = []
+        self.rows = []
+        self.before = []
+        self.after = []
+        self.sheet_data = False
+
+    def parse(self):
+        tags = set(self.dispatcher)
+        row_tag = self.ROW_TAG
+        stream = _get_xml_iter(self.source)
+
+        for _, element in iterparse(stream, tag=tags):
+            tag_name = element.tag
+            if tag_name == row_tag:
+                self.parse_row_dimensions(element)
+                self.sheet_data = True
+                element.clear()
+            elif tag_name in tags:
+                elements = self.after if self.sheet_data else self.before
+                elements.append(tostring(element))
+                element.clear()
+
+        return {
+            'cells':self.cells,
+            'rows':self.rows,
+            'formula_attributes':self.formula_attributes,
+            'before':self.before,
+            'after':self.after,
+        }
+
+    def parse_cell(self, element):
+        self.cells.append(self.decode_cell(element))
+
+    def add_row_dimension(self, attrs):
+        self.rows.append(attrs)
+
+
+class WorksheetLoader(object):
+    """
+    Parse a worksheet from the source archive the first time it is used.
+
+    Until then, the attributes that parsing fills in are set aside, so
+    looking any of them up on the worksheet parses it. Worksheets that are
+    never used can be copied unchanged when the workbook is saved.
+    """
+
+    # attributes which parsing and comments leave alone
+    KEEP = ('_parent', '_title', 'sheet_state', '_charts', '_images',
+            '_drawing', '_comment_count')
+
+    def __init__(self, parser, archive, path, rels=False, comments=None):
+        self.parser = parser
+        self.archive = archive
+        self.path = path
+        self.rels = rels
+        self.comments = comments
+        self._copy = None
+
+        ws = parser.ws
+        self.pending = dict((key, value) for key, value in ws.__dict__.items()
+                            if key not in self.KEEP)
+        for key in self.pending:
+            del ws.__dict__[key]
+        ws._loader = self
+
+
+    def load(self):
+        """Parse the worksheet into the attributes set aside"""
+        from .comments import read_comments
+        ws = self.parser.ws
+        del ws._loader
+        ws.__dict__.update(self.pending)
+        self.pending = {}
+        self.parser.source = self.read()
+        self.parser.parse()
+        if self.comments is not None:
+            read_comments(ws, self.archive.read(self.comments))
+
+
+    def read(self):
+        return self.archive.read(self.path)
+
+
+    def can_copy(self):
+        """
+        Worksheets that are copied must not refer to anything that is
+        numbered differently when the workbook is written: relations,
+        differential styles or filters, which have defined names.
+        """
+        if self._copy is None:
+            if self.rels:
+                self._copy = False
+            else:
+                xml = self.read()
+                self._copy = b"dxfId" not in xml and b"autoFilter" not in xml
+        return self._copy
+
+
+def parse_payload(source, path=None, data_only=False):
+    """
+    Parse a worksheet into a payload. `source` is either the XML or the
+    filename of the archive containing it at `path`.
+    """
+    if path is not None:
+        archive = ZipFile(source)
+        try:
+            source = archive.read(path)
+        finally:
+            archive.close()
+    return CellPayloadParser(source, data_only).parse()
+
+
 def fast_parse(xml_source, parent, sheet_title, shared_strings):
     parser = WorkSheetParser(parent, sheet_title, xml_source, shared_strings)
     parser.parse()
@@ -2,6 +2,7 @@ from __future__ import absolute_import
 # Copyright (c) 2010-2015 openpyxl
 
 import re
+from collections import namedtuple
 
 from openpyxl.descriptors import String
 from .hashable import HashableObject
@@ -98,6 +99,90 @@ def is_date_format(fmt):
     return False
 
 
+def is_time_format(fmt):
+    """Date formats without a day, month or year"""
+    if not is_date_format(fmt):
+        return False
+    fmt = fmt.lower()
+    return not any([x in fmt for x in 'dy']) and ('h' in fmt or 's' in fmt)
+
+
+def is_percent_format(fmt):
+    return fmt is not None and '%' in fmt
+
+
+FormatFlags = namedtuple("FormatFlags", ["is_date", "is_percent", "is_time"])
+
+
+def format_flags(fmt):
+    """Return the (is_date, is_percent, is_time) flags of a format code"""
+    return FormatFlags(is_date_format(fmt), is_percent_format(fmt),
+                       is_time_format(fmt))
+
+
+NO_FLAGS = FormatFlags(False, False, False)
+
+
+class FormatTable(object):
+    """
+    Precomputed format flags of the number formats and cell styles of a
+    workbook, so that cells can be decoded without matching the format
+    code every time.
+
+    The tables grow with the style lists of the workbook and are reset if
+    these are replaced.
+    """
+
+    def __init__(self, wb):
+        self.wb = wb
+        self.reset()
+
+
+    def reset(self):
+        self._number_formats = getattr(self.wb, '_number_formats', None)
+        self._cell_styles = getattr(self.wb, '_cell_styles', None)
+        self.custom = []
+        self.styles = []
+
+
+    def for_format(self, fmt_id):
+        """Flags for a number format id"""
+        if fmt_id < 164:
+            return BUILTIN_FLAGS.get(fmt_id, NO_FLAGS)
+        if self.wb._number_formats is not self._number_formats:
+            self.reset()
+        idx = fmt_id - 164
+        custom = self.custom
+        if idx >= len(custom):
+            custom.extend(format_flags(fmt)
+                          for fmt in self._number_formats[len(custom):])
+        return custom[idx]
+
+
+    def for_style(self, style_id):
+        """Flags for the index of a cell style"""
+        if not style_id:
+            return NO_FLAGS
+        if self.wb._cell_styles is not self._cell_styles:
+            self.reset()
+        styles = self.styles
+        if style_id >= len(styles):
+            for style in self._cell_styles[len(styles):]:
+                if style is None:
+                    styles.append(NO_FLAGS)
+                else:
+                    styles.append(self.for_format(style.numFmtId))
+        return styles[style_id]
+
+
+def format_table(wb):
+    """Return the format table of a workbook, creating it if necessary"""
+    table = getattr(wb, '_format_table', None)
+    if table is None:
+        table = wb._format_table = FormatTable(wb)
+    return table
+
+
 def is_builtin(fmt):
     return fmt in BUILTIN_FORMATS.values()
 
@@ -112,6 +197,9 @@ def builtin_format_id(fmt):
     return BUILTIN_FORMATS_REVERSE.get(fmt)
 
 
+BUILTIN_FLAGS = dict((k, format_flags(v)) for k, v in BUILTIN_FORMATS.items())
+
+
 class NumberFormatDescriptor(String):
 
     def __set__(self, instance, value):
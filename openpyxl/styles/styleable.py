@@ -49,9 +49,43 @@ class NumberFormatDescriptor(object):
         return coll[idx - 164]
 
 
+class StyleComponentDescriptor(object):
+    """
+    One component of an object's style, such as its font id, read from the
+    interned style the object refers to. Components which are set are kept
+    pending on the object until its style is needed.
+    """
+
+    def __init__(self, key, default=0):
+        self.key = key
+        self.default = default
+
+    def __set__(self, instance, value):
+        if self.__get__(instance, None) != value:
+            instance._set_style_component(self.key, value)
+
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self
+        pending = instance._pending_style
+        if pending is not None and self.key in pending:
+            return pending[self.key]
+        idx = instance._style_id
+        if idx is None:
+            return self.default
+        return getattr(instance.parent.parent._cell_styles[idx], self.key)
+
+
 class StyleableObject(object):
     """
     Base class for styleble objects implementing proxy and lookup functions
+
+    Objects refer to a single interned style in the workbook's cell styles,
+    or to none at all. The ids of the individual formatting objects are only
+    looked up when they are needed. Changes to them are collected and only
+    interned, as a single style, when the style id is needed or the
+    workbook is saved, so that intermediate combinations are never added.
     """
 
     font = StyleDescriptor('_fonts', '_font_id')
@@ -61,48 +95,85 @@ class StyleableObject(object):
     protection = StyleDescriptor('_protections', '_protection_id')
     alignment = StyleDescriptor('_alignments', '_alignment_id')
 
-    __slots__ = ('parent', '_font_id', '_border_id', '_fill_id',
-                 '_alignment_id', '_protection_id', '_number_format_id', 'pivotButton',
-                 'quotePrefix')
+    _font_id = StyleComponentDescriptor('fontId')
+    _fill_id = StyleComponentDescriptor('fillId')
+    _border_id = StyleComponentDescriptor('borderId')
+    _alignment_id = StyleComponentDescriptor('alignmentId')
+    _protection_id = StyleComponentDescriptor('protectionId')
+    _number_format_id = StyleComponentDescriptor('numFmtId')
+    pivotButton = StyleComponentDescriptor('pivotButton', None)
+    quotePrefix = StyleComponentDescriptor('quotePrefix', None)
+
+    __slots__ = ('parent', '_style_id', '_pending_style')
 
     def __init__(self, sheet, fontId=0, fillId=0, borderId=0, alignmentId=0,
-                 protectionId=0, numFmtId=0, pivotButton=None, quotePrefix=None):
-        self._font_id = fontId
-        self._fill_id = fillId
-        self._border_id = borderId
-        self._alignment_id = alignmentId
-        self._protection_id = protectionId
-        self._number_format_id = numFmtId
+                 protectionId=0, numFmtId=0, pivotButton=None, quotePrefix=None,
+                 style_id=None):
         self.parent = sheet
-        self.pivotButton = pivotButton
-        self.quotePrefix = quotePrefix
+        self._style_id = style_id
+        self._pending_style = None
+        if (fontId or fillId or borderId or alignmentId or protectionId
+            or numFmtId or pivotButton is not None or quotePrefix is not None):
+            self._update_style(fontId=fontId, fillId=fillId, borderId=borderId,
+                               alignmentId=alignmentId, protectionId=protectionId,
+                               numFmtId=numFmtId, pivotButton=pivotButton,
+                               quotePrefix=quotePrefix)
+
+
+    def _update_style(self, **components):
+        """
+        Refer to the interned style which has `components` in place of those
+        of the current one
+        """
+        styles = self.parent.parent._cell_styles
+        attrs = {}
+        if self._style_id is not None:
+            attrs = dict(styles[self._style_id])
+        attrs.update(components)
+        self._style_id = styles.add(StyleId(**attrs))
+
+
+    def _set_style_component(self, key, value):
+        pending = self._pending_style
+        if pending is None:
+            pending = self._pending_style = {}
+            queue = getattr(self.parent.parent, '_pending_styles', None)
+            if queue is not None:
+                queue.append(self)
+        pending[key] = value
+
+
+    def _resolve_style(self):
+        """Intern the style with the pending components, if there are any"""
+        pending = self._pending_style
+        if pending is not None:
+            self._pending_style = None
+            self._update_style(**pending)
 
 
     @property
     def style_id(self):
-        style = StyleId(
-            alignmentId=self._alignment_id,
-            borderId=self._border_id,
-            fillId=self._fill_id,
-            fontId=self._font_id,
-            numFmtId=self._number_format_id,
-            protectionId=self._protection_id,
-            pivotButton=self.pivotButton,
-            quotePrefix=self.quotePrefix
-        )
-
-        return self.parent.parent._cell_styles.add(style)
+        if self._pending_style is not None:
+            self._resolve_style()
+        if self._style_id is not None:
+            return self._style_id
+        return self.parent.parent._cell_styles.add(StyleId())
 
     @property
     def has_style(self):
-        return bool(self._alignment_id
-               or self._border_id
-               or self._fill_id
-               or self._font_id
-               or self._number_format_id
-               or self._protection_id
-               or self.pivotButton
-               or self.quotePrefix
+        if self._pending_style is not None:
+            self._resolve_style()
+        if self._style_id is None:
+            return False
+        style = self.parent.parent._cell_styles[self._style_id]
+        return bool(style.alignmentId
+               or style.borderId
+               or style.fillId
+               or style.fontId
+               or style.numFmtId
+               or style.protectionId
+               or style.pivotButton
+               or style.quotePrefix
                )
 
     #legacy
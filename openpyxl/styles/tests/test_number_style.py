@@ -51,3 +51,39 @@ def test_datetime_regex(fmt, result):
     from ..numbers import BAD_DATE_RE
     match = BAD_DATE_RE.search(fmt.lower()) is not None
     assert match is result
+
+
+@pytest.mark.parametrize("fmt, result",
+                         [
+                             ("General", (False, False, False)),
+                             ("0.00%", (False, True, False)),
+                             ("yyyy-mm-dd", (True, False, False)),
+                             ("h:mm:ss", (True, False, True)),
+                             ("yyyy-mm-dd h:mm:ss", (True, False, False)),
+                         ]
+                         )
+def test_format_flags(fmt, result):
+    from ..numbers import format_flags
+    assert format_flags(fmt) == result
+
+
+def test_format_table():
+    from openpyxl import Workbook
+    from ..numbers import format_table
+
+    wb = Workbook()
+    ws = wb.active
+    ws['A1'].number_format = "dd/mm/yy"
+    ws['A2'].number_format = "0%"
+    table = format_table(wb)
+    assert table.for_format(ws['A1']._number_format_id).is_date
+    assert table.for_format(ws['A2']._number_format_id).is_percent
+    assert table.for_style(0) == (False, False, False)
+
+    idx = ws['A1'].style_id
+    assert table.for_style(idx).is_date
+    ws['A3'].number_format = "hh:mm"
+    assert table.for_style(ws['A3'].style_id).is_time # table grows
+
+    wb._number_formats = wb._number_formats.__class__(["0.0%"])
+    assert table.for_format(164).is_percent # table is reset
@@ -4,6 +4,7 @@ from __future__ import absolute_import
 import pytest
 
 from openpyxl.utils.indexed_list import IndexedList
+from ..style import StyleId
 from ..import Style, Font, Border, PatternFill, Alignment, Protection
 
 
@@ -32,6 +33,7 @@ class DummyWorkbook:
     _protections = IndexedList()
     _alignments = IndexedList()
     _number_formats = IndexedList()
+    _cell_styles = IndexedList([StyleId()])
 
 
 class DummyWorksheet:
@@ -69,3 +71,85 @@ def test_assign_style(StyleableObject):
     style = Style(font=Font(underline="single"))
     so.style = style
     assert style.font == Font(underline="single")
+
+
+def test_interned_style(StyleableObject):
+    ws = DummyWorksheet()
+    so1 = StyleableObject(sheet=ws)
+    so2 = StyleableObject(sheet=ws)
+    assert so1._style_id is None
+    so1.font = Font(italic=True)
+    so2.font = Font(italic=True)
+    assert so1.style_id == so2.style_id
+    so2.number_format = "0.0"
+    assert so1.style_id != so2.style_id
+    assert so1.font == so2.font
+    assert so1.number_format == "General"
+
+
+def test_keep_style_id(StyleableObject):
+    ws = DummyWorksheet()
+    idx = ws.parent._cell_styles.add(StyleId(fontId=3, xfId=2))
+    so = StyleableObject(sheet=ws, style_id=idx)
+    assert so._font_id == 3
+    assert so.style_id == idx
+    so._font_id = 3
+    assert so.style_id == idx
+    so._fill_id = 1
+    assert ws.parent._cell_styles[so.style_id] == StyleId(fontId=3, fillId=1, xfId=2)
+
+
+def test_pending_style(StyleableObject):
+    from openpyxl.styles import PatternFill, Border, Side, Alignment
+    ws = DummyWorksheet()
+    styles = ws.parent._cell_styles
+    count = len(styles)
+    so = StyleableObject(sheet=ws)
+    so.font = Font(bold=True)
+    so.fill = PatternFill(fill_type="solid", fgColor="FF0000")
+    so.border = Border(left=Side(style="thin"))
+    so.alignment = Alignment(horizontal="center")
+    so.number_format = "0.00"
+    assert so.font == Font(bold=True)
+    assert so.number_format == "0.00"
+    assert len(styles) == count
+    assert so.has_style
+    assert len(styles) == count + 1
+    assert so.style_id == len(styles) - 1
+
+
+def test_save_pending_styles():
+    from io import BytesIO
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.styles import PatternFill, Alignment
+
+    wb = Workbook()
+    ws = wb.active
+    for row in range(1, 8):
+        for col in range(1, 8):
+            cell = ws.cell(row=row, column=col, value=row * col)
+            cell.font = Font(bold=True)
+            cell.fill = PatternFill(fill_type="solid", fgColor="FF0000")
+            cell.alignment = Alignment(horizontal="center")
+            cell.number_format = "0.00"
+    ws['A1'].font = Font(italic=True)
+    out = BytesIO()
+    wb.save(out)
+    # the default, one for A1 and one for every other cell
+    assert len(wb._cell_styles) == 3
+    ws = load_workbook(out).active
+    assert ws['A1'].font.i
+    assert ws['B2'].font.b
+    assert ws['G7'].number_format == "0.00"
+
+
+def test_write_only_not_queued():
+    from openpyxl import Workbook
+    from openpyxl.writer.write_only import WriteOnlyCell
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    cell = WriteOnlyCell(ws, value=1)
+    cell.font = Font(bold=True)
+    assert wb._pending_styles is None
+    assert cell.has_style
@@ -0,0 +1,96 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+import sys
+
+import pytest
+
+if sys.version_info < (3, 5):
+    pytest.skip("requires Python 3.5", allow_module_level=True)
+
+import asyncio
+
+from openpyxl import Workbook
+from openpyxl.compat import range
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def workbook(tmpdir):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "data"
+    for i in range(1, 26):
+        ws.append([i, "row {0}".format(i), i * 0.5])
+    filename = str(tmpdir.join("rows.xlsx"))
+    wb.save(filename)
+    return filename
+
+
+def collect(loop, it):
+    rows = []
+    while True:
+        try:
+            rows.append(loop.run_until_complete(it.__anext__()))
+        except StopAsyncIteration:
+            return rows
+
+
+def test_aload_workbook(loop, workbook):
+    from openpyxl.aio import aload_workbook
+    wb = loop.run_until_complete(aload_workbook(workbook, read_only=True, loop=loop))
+    assert wb.sheetnames == ["data"]
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 25, 1000])
+def test_aiter_rows(loop, workbook, batch_size):
+    from openpyxl.aio import aload_workbook
+    wb = loop.run_until_complete(aload_workbook(workbook, read_only=True, loop=loop))
+    ws = wb["data"]
+    it = ws.aiter_rows(values_only=True, batch_size=batch_size, loop=loop)
+    assert it.__aiter__() is it
+    assert collect(loop, it) == list(ws.iter_rows(values_only=True))
+
+
+def test_aiter_rows_args(loop, workbook):
+    from openpyxl.reader.excel import load_workbook
+    ws = load_workbook(workbook, read_only=True)["data"]
+    it = ws.aiter_rows("A3:B4", columns=["B"], values_only=True, loop=loop)
+    assert collect(loop, it) == [("row 3",), ("row 4",)]
+
+
+def test_read_ahead(loop):
+    from openpyxl.aio import AsyncRowIterator
+    read = []
+
+    def rows():
+        for i in range(10):
+            read.append(i)
+            yield i
+
+    it = AsyncRowIterator(rows, batch_size=3, loop=loop)
+    assert loop.run_until_complete(it.__anext__()) == 0
+    loop.run_until_complete(it._pending)
+    # the current batch and the next one only
+    assert read == list(range(6))
+    assert collect(loop, it) == list(range(1, 10))
+
+
+def test_error(loop):
+    from openpyxl.aio import AsyncRowIterator
+
+    def rows():
+        yield 1
+        raise ValueError("bad row")
+
+    it = AsyncRowIterator(rows, batch_size=5, loop=loop)
+    with pytest.raises(ValueError):
+        loop.run_until_complete(it.__anext__())
+    with pytest.raises(StopAsyncIteration):
+        loop.run_until_complete(it.__anext__())
@@ -7,6 +7,7 @@ from io import BytesIO
 import pytest
 
 from openpyxl.xml.functions import fromstring
+from openpyxl.xml.constants import SHEET_MAIN_NS
 from openpyxl.worksheet.iter_worksheet import read_dimension
 from openpyxl.reader.excel import load_workbook
 from openpyxl.compat import range, zip
@@ -333,3 +334,231 @@ def test_read_empty_rows(datadir, DummyWorkbook):
     ws = IterableWorksheet(DummyWorkbook, "Sheet", "", "empty_rows.xml", [], [])
     rows = tuple(ws.rows)
     assert len(rows) == 7
+
+
+def test_row_index(datadir, tmpdir):
+    datadir.join("genuine").chdir()
+    wb = load_workbook(filename="empty.xlsx", read_only=True)
+    ws = wb['Sheet2 - Numbers']
+    expected = [[c.value for c in row] for row in ws.iter_rows("D1:K30")]
+
+    sidecar = str(tmpdir.join("sheet2.idx"))
+    ws.use_row_index(sidecar, distance=1)
+    assert [[c.value for c in row] for row in ws.iter_rows("D1:K30")] == expected
+    assert ws._row_index.complete is True
+    assert ws._row_index.lookup(20)[0] == 20
+
+    assert ws['K25'].value == 0.25
+    rows = [[c.value for c in row] for row in ws.iter_rows("D17:K19")]
+    assert rows == expected[16:19]
+
+    wb = load_workbook(filename="empty.xlsx", read_only=True)
+    ws = wb['Sheet2 - Numbers']
+    ws.use_row_index(sidecar)
+    assert ws._row_index.complete is True
+    assert ws['D30'].value == 30
+
+
+def test_row_index_closes_file(datadir, tmpdir, monkeypatch):
+    datadir.join("genuine").chdir()
+    wb = load_workbook(filename="empty.xlsx", read_only=True)
+    ws = wb['Sheet2 - Numbers']
+    path = str(tmpdir.join("sheet2.xml"))
+    with open(path, "wb") as f:
+        f.write(wb._archive.read(ws.worksheet_path))
+    ws.xml_source = path
+
+    from openpyxl.worksheet import read_only
+    opened = []
+
+    def _open(*args):
+        f = open(*args)
+        opened.append(f)
+        return f
+
+    monkeypatch.setattr(read_only, "open", _open, raising=False)
+    ws.use_row_index()
+    rows = ws.iter_rows("D1:K30", values_only=True)
+    next(rows)
+    rows.close()
+    ws.to_columns("D", "K")
+    assert len(opened) == 2
+    assert all(f.closed for f in opened)
+
+
+def test_values_only(sample_workbook):
+    wb = sample_workbook
+    ws = wb['Sheet1 - Text']
+    rows = list(ws.iter_rows("A1:G5", values_only=True))
+    assert rows == [tuple(r) for r in expected]
+
+
+@pytest.mark.parametrize("sheetname",
+                         ["Sheet1 - Text", "Sheet2 - Numbers",
+                          "Sheet3 - Formulas", "Sheet4 - Dates"]
+                         )
+@pytest.mark.parametrize("data_only", [True, False])
+def test_values(datadir, sheetname, data_only):
+    datadir.join("genuine").chdir()
+    wb = load_workbook("empty.xlsx", read_only=True, data_only=data_only)
+    ws = wb[sheetname]
+    cells = [tuple(c.value for c in row) for row in ws.rows]
+    assert list(ws.values) == cells
+
+
+def test_values_dates(datadir):
+    datadir.join("genuine").chdir()
+    wb = load_workbook("empty.xlsx", read_only=True)
+    ws = wb['Sheet4 - Dates']
+    row = next(ws.values)
+    assert row[0] == datetime.datetime(1973, 5, 20)
+    assert row[2] == datetime.datetime(1973, 5, 20, 9, 15, 2)
+
+
+@pytest.mark.numpy_required
+def test_to_columns(datadir):
+    import numpy
+    datadir.join("genuine").chdir()
+    wb = load_workbook("empty.xlsx", read_only=True)
+
+    ws = wb['Sheet2 - Numbers']
+    cols = ws.to_columns('D', 'K')
+    assert list(cols) == ['D', 'E', 'F', 'G', 'H', 'I', 'J', 'K']
+    assert cols['D'].dtype == numpy.int64
+    assert list(cols['D']) == list(range(1, 31))
+    assert cols['K'].dtype == numpy.float64
+    assert cols['K'][29] == 0.3
+    assert numpy.isnan(cols['E']).all()
+    assert cols['G'].dtype == object
+    assert cols['G'][4] == 'This is cell G5'
+    assert cols['G'][0] is None
+
+    ws = wb['Sheet4 - Dates']
+    cols = ws.to_columns(1, 3)
+    assert cols['A'][0] == numpy.datetime64(datetime.datetime(1973, 5, 20))
+    assert cols['C'][0] == numpy.datetime64(datetime.datetime(1973, 5, 20, 9, 15, 2))
+
+
+@pytest.mark.numpy_required
+def test_to_columns_dtypes(datadir):
+    import numpy
+    datadir.join("genuine").chdir()
+    wb = load_workbook("empty.xlsx", read_only=True)
+    ws = wb['Sheet2 - Numbers']
+    cols = ws.to_columns('D', 'E', dtypes={'D':'float64', 5:'int64'},
+                         min_row=2, max_row=4)
+    assert cols['D'].dtype == numpy.float64
+    assert list(cols['D']) == [2, 3, 4]
+    assert cols['E'].mask.all()
+
+
+
+@pytest.mark.numpy_required
+def test_to_columns_exact_dtypes(datadir):
+    import numpy
+    datadir.join("genuine").chdir()
+    wb = load_workbook("empty.xlsx", read_only=True)
+    ws = wb['Sheet2 - Numbers']
+    cols = ws.to_columns('D', 'F', dtypes={'D': 'int32', 'F': 'float32'})
+    assert cols['D'].dtype == numpy.int32
+    assert list(cols['D']) == list(range(1, 31))
+    assert cols['F'].dtype == numpy.float32
+
+
+@pytest.mark.numpy_required
+def test_to_columns_unconvertible(datadir):
+    import numpy
+    datadir.join("genuine").chdir()
+    wb = load_workbook("empty.xlsx", read_only=True)
+    ws = wb['Sheet2 - Numbers']
+    cols = ws.to_columns('G', 'G', dtypes={'G': 'int64'})
+    assert cols['G'].dtype == numpy.int64
+    # text cannot be an int
+    assert cols['G'].mask[4]
+
+
+def test_cells_without_reference(DummyWorkbook):
+    from openpyxl.worksheet.read_only import ReadOnlyWorksheet
+    from openpyxl.cell.read_only import EMPTY_CELL
+
+    xml = b"""<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+    <sheetData>
+      <row r="2"><c><v>1</v></c><c r="C2"><v>3</v></c><c><v>4</v></c></row>
+    </sheetData>
+    </worksheet>"""
+    DummyWorkbook.data_only = False
+    ws = ReadOnlyWorksheet(DummyWorkbook, "Sheet", "", BytesIO(xml), [])
+    element = fromstring(xml).find(".//{%s}row" % SHEET_MAIN_NS)
+    cells = list(ws._get_row(element, 1, 4))
+    assert [(c.row, c.column, c.value) for c in cells if c is not EMPTY_CELL] == [
+        (2, 1, 1), (2, 3, 3), (2, 4, 4)]
+    assert list(ws._get_row_values(element, 1, 4)) == [1, None, 3, 4]
+
+
+def test_projection(datadir):
+    datadir.join("genuine").chdir()
+    wb = load_workbook("empty.xlsx", read_only=True)
+    ws = wb['Sheet2 - Numbers']
+    rows = list(ws.iter_rows('A4:K5', values_only=True, columns=['K', 'D', 7]))
+    assert rows == [(0.04, 4, None), (0.05, 5, 'This is cell G5')]
+
+    row = next(ws.iter_rows(columns=['G', 'A'], row_offset=4))
+    assert row[0].coordinate == "G5"
+    assert row[0].value == 'This is cell G5'
+    assert row[1].value is None
+
+
+def test_where(datadir):
+    datadir.join("genuine").chdir()
+    wb = load_workbook("empty.xlsx", read_only=True)
+    ws = wb['Sheet2 - Numbers']
+    rows = ws.iter_rows('A1:K30', values_only=True, columns=['D', 'G'],
+                        where={'G': lambda v: v is not None})
+    assert list(rows) == [(5, 'This is cell G5'), (9, True), (10, False)]
+
+    rows = ws.iter_rows('D1:K30', where={4: lambda v: v % 10 == 0,
+                                         'K': lambda v: v > 0.1})
+    assert [row[0].value for row in rows] == [20, 30]
+
+
+def test_calculate_dimension_force(datadir):
+    datadir.join("genuine").chdir()
+    wb = load_workbook("empty_no_dimensions.xlsx", read_only=True)
+    ws = wb['Sheet2 - Numbers']
+    assert ws.max_row is None
+    assert ws.calculate_dimension(force=True) == "D1:K30"
+    assert ws._dimension_calculated is True
+
+
+def test_calculate_dimension_without_references(DummyWorkbook, tmpdir):
+    from openpyxl.worksheet.read_only import ReadOnlyWorksheet
+
+    xml = b"""<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+    <sheetData>
+      <row r="2"><c><v>1</v></c><c r="C2"><v>3</v></c><c><v>4</v></c></row>
+      <row r="5"><c r="B5"><v>1</v></c></row>
+    </sheetData>
+    </worksheet>"""
+    tmpdir.chdir()
+    with open("sheet.xml", "wb") as f:
+        f.write(xml)
+    ws = ReadOnlyWorksheet(DummyWorkbook, "Sheet", "", "sheet.xml", [])
+    assert ws.calculate_dimension(force=True) == "A2:D5"
+
+
+@pytest.mark.parametrize("strings", ['shared', 'inline', 'hybrid'])
+def test_read_inline_strings(tmpdir, strings):
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True, strings=strings)
+    ws = wb.create_sheet()
+    rows = [(u"a", u" b ", 1), (u"a", u"c", 2)]
+    for row in rows:
+        ws.append(row)
+    filename = str(tmpdir.join("inline.xlsx"))
+    wb.save(filename)
+
+    ws = load_workbook(filename, read_only=True).active
+    assert list(ws.values) == rows
+    assert [tuple(c.value for c in row) for row in ws.rows] == rows
+    ws = load_workbook(filename).active
+    assert [tuple(c.value for c in row) for row in ws.rows] == rows
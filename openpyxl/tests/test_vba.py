@@ -99,3 +99,21 @@ def test_save_same_file(tmpdir, datadir):
     tmpdir.chdir()
     wb = load_workbook(fname, keep_vba=True)
     wb.save(fname)
+
+
+def test_shared_archive(datadir):
+    datadir.join('reader').chdir()
+    wb = load_workbook('vba-test.xlsm', read_only=True, keep_vba=True)
+    assert wb.vba_archive is wb._archive
+
+
+def test_save_closed_stream(datadir):
+    datadir.join('reader').chdir()
+    with open('vba-test.xlsm', 'rb') as src:
+        f = BytesIO(src.read())
+    wb = load_workbook(f, keep_vba=True)
+    f.close()
+    out = BytesIO()
+    wb.save(out)
+    archive = zipfile.ZipFile(out)
+    assert 'xl/vbaProject.bin' in archive.namelist()
@@ -83,6 +83,7 @@ def _get_column_letter(col_idx):
     return ''.join(reversed(letters))
 
 
+_DIGITS = "0123456789"
 _COL_STRING_CACHE = {}
 _STRING_COL_CACHE = {}
 for i in range(1, 18279):
@@ -159,6 +160,15 @@ def coordinate_to_tuple(coordinate):
     """
     Convert an Excel style coordinate to (row, colum) tuple
     """
+    # coordinates in files are always like "AB12", so avoid the regex
+    letters = coordinate.rstrip(_DIGITS)
+    try:
+        row = int(coordinate[len(letters):])
+        column = _COL_STRING_CACHE[letters]
+    except (ValueError, KeyError):
+        row = 0
+    if row:
+        return row, column
     col, row = coordinate_from_string(coordinate)
     return row, _COL_STRING_CACHE[col]
 
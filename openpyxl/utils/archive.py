@@ -0,0 +1,138 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+"""
+Read workbook archives through a memory map
+
+The file is mapped once and the same handle is used to validate and repair
+the archive, to keep VBA content and to read worksheets on demand. Only the
+members which are read are copied out of the mapping.
+"""
+
+import mmap
+from io import BytesIO
+from zipfile import ZipFile
+
+from openpyxl.compat import basestring
+
+
+class MappedFile(object):
+    """
+    Read-only file object over a memory map. It can end before the mapping
+    does, so that trailing data can be cut off without copying anything.
+    """
+
+    def __init__(self, mapping, size=None, name=None):
+        self._mapping = mapping
+        if size is None:
+            size = len(mapping)
+        self.size = size
+        self.name = name
+        self._pos = 0
+
+
+    def read(self, n=-1):
+        start = self._pos
+        end = self.size
+        if n is not None and n >= 0:
+            end = min(start + n, end)
+        if start >= end:
+            return b""
+        self._pos = end
+        return self._mapping[start:end]
+
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._pos
+        elif whence == 2:
+            offset += self.size
+        if offset < 0:
+            raise ValueError("negative seek position {0}".format(offset))
+        self._pos = offset
+        return offset
+
+
+    def tell(self):
+        return self._pos
+
+
+    def seekable(self):
+        return True
+
+
+    def find(self, sub, start=0):
+        return self._mapping.find(sub, start, self.size)
+
+
+    def truncated(self, size):
+        """Return a view of the first `size` bytes of the same mapping"""
+        return MappedFile(self._mapping, min(size, self.size), self.name)
+
+
+    def getvalue(self):
+        return self._mapping[:self.size]
+
+
+    @property
+    def closed(self):
+        return self._mapping.closed
+
+
+    def close(self):
+        self._mapping.close()
+
+
+def map_file(filename):
+    """
+    Map a path, or a file object with a file descriptor, into memory.
+    Return None if it cannot be mapped.
+    """
+    try:
+        if hasattr(filename, 'read'):
+            name = getattr(filename, 'name', None)
+            if not isinstance(name, basestring):
+                name = None
+            mapping = mmap.mmap(filename.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            name = filename
+            with open(filename, 'rb') as f:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, ValueError, EnvironmentError):
+        # empty files, pipes and in-memory files
+        return
+    return MappedFile(mapping, name=name)
+
+
+def close_with_archive(archive, resource):
+    """Close `resource` when the archive is closed by :func:`close_archive`"""
+    if not hasattr(archive, '_resources'):
+        archive._resources = []
+    archive._resources.append(resource)
+
+
+def close_archive(archive):
+    """
+    Close an archive, the mapping it was read from and anything else which
+    is closed with it
+    """
+    fp = archive.fp
+    archive.close()
+    if isinstance(fp, MappedFile):
+        fp.close()
+    for resource in getattr(archive, '_resources', ()):
+        resource.close()
+    archive._resources = []
+
+
+def detach_archive(archive):
+    """
+    Return a copy of a mapped archive which does not depend on the file,
+    and close the original. Needed before the file is overwritten.
+    """
+    fp = archive.fp
+    if not isinstance(fp, MappedFile):
+        return archive
+    copy = ZipFile(BytesIO(fp.getvalue()), 'r')
+    close_archive(archive)
+    return copy
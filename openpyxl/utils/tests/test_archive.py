@@ -0,0 +1,69 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+from io import BytesIO
+from zipfile import ZipFile
+
+import pytest
+
+from ..archive import map_file, MappedFile, close_archive, detach_archive
+
+
+@pytest.fixture
+def mapped(tmpdir):
+    path = tmpdir.join("data.bin")
+    path.write_binary(b"0123456789")
+    f = map_file(str(path))
+    yield f
+    f.close()
+
+
+def test_map_file(mapped, tmpdir):
+    assert mapped.name == str(tmpdir.join("data.bin"))
+    assert mapped.read(4) == b"0123"
+    assert mapped.read() == b"456789"
+    assert mapped.read() == b""
+
+
+def test_seek(mapped):
+    assert mapped.seek(-3, 2) == 7
+    assert mapped.read() == b"789"
+    mapped.seek(2)
+    mapped.seek(2, 1)
+    assert mapped.tell() == 4
+    with pytest.raises(ValueError):
+        mapped.seek(-1)
+
+
+def test_truncated(mapped):
+    view = mapped.truncated(6)
+    assert view.find(b"7") == -1
+    view.seek(0, 2)
+    assert view.tell() == 6
+    view.seek(4)
+    assert view.read(10) == b"45"
+    assert view.getvalue() == b"012345"
+
+
+@pytest.mark.parametrize("source", [BytesIO(b"data"), u"missing.xlsx"])
+def test_cannot_map(tmpdir, source):
+    tmpdir.chdir()
+    assert map_file(source) is None
+
+
+def test_empty_file(tmpdir):
+    path = tmpdir.join("empty.xlsx")
+    path.write_binary(b"")
+    assert map_file(str(path)) is None
+
+
+def test_detach_archive(tmpdir):
+    path = str(tmpdir.join("archive.zip"))
+    with ZipFile(path, "w") as z:
+        z.writestr("a.txt", b"content")
+    archive = ZipFile(map_file(path))
+    fp = archive.fp
+    copy = detach_archive(archive)
+    assert fp.closed
+    assert copy.read("a.txt") == b"content"
+    close_archive(copy)
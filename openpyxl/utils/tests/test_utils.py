@@ -86,3 +86,24 @@ def test_column_letter_boundries(value):
                          )
 def test_column_letter(value, expected):
     assert get_column_letter(value) == expected
+
+
+@pytest.mark.parametrize("coord, expected",
+                         [
+                             ("A1", (1, 1)),
+                             ("XFD1048576", (1048576, 16384)),
+                             ("ab12", (12, 28)),
+                             ("$C$3", (3, 3)),
+                         ]
+                         )
+def test_coordinate_tuple(coord, expected):
+    from .. import coordinate_to_tuple
+    assert coordinate_to_tuple(coord) == expected
+
+
+@pytest.mark.parametrize("coord", ["A0", "12", "A1B", "A 1", "A+1"])
+def test_invalid_coordinate_tuple(coord):
+    from .. import coordinate_to_tuple
+    from ..exceptions import CellCoordinatesException
+    with pytest.raises(CellCoordinatesException):
+        coordinate_to_tuple(coord)
@@ -209,3 +209,10 @@ def test_add_invalid_worksheet_class_instance():
     ws = AlternativeWorksheet(parent_workbook=wb)
     with pytest.raises(TypeError):
         wb._add_sheet(worksheet=ws)
+
+
+@pytest.mark.parametrize("write_only, strings",
+                         [(False, 'inline'), (True, 'unknown')])
+def test_invalid_string_mode(write_only, strings):
+    with pytest.raises(ValueError):
+        Workbook(write_only=write_only, strings=strings)
@@ -11,9 +11,10 @@ import threading
 
 # package imports
 from openpyxl.utils.indexed_list import IndexedList
+from openpyxl.utils.archive import close_archive
 from openpyxl.utils.datetime  import CALENDAR_WINDOWS_1900
 from openpyxl.worksheet import Worksheet
-from openpyxl.writer.write_only import WriteOnlyWorksheet, save_dump
+from openpyxl.writer.write_only import WriteOnlyWorksheet, save_dump, STRING_TABLES
 from . names.named_range import NamedRange
 from openpyxl.styles import Style
 from openpyxl.styles.style import StyleId
@@ -37,7 +38,12 @@ class Workbook(object):
                  guess_types=False,
                  data_only=False,
                  read_only=False,
-                 write_only=False):
+                 write_only=False,
+                 strings='shared'):
+        """
+        :param strings: how write-only workbooks store strings: 'shared' in the shared string table, 'inline' in the worksheet or 'hybrid', which only shares strings that repeat
+        :type strings: string
+        """
         self.worksheets = []
         self._active_sheet_index = 0
         self._named_ranges = []
@@ -47,12 +53,20 @@ class Workbook(object):
         self.__write_only = write_only or optimized_write
         self.__read_only = read_only
         self.shared_strings = IndexedList()
+        if strings != 'shared':
+            if not self.write_only or strings not in STRING_TABLES:
+                raise ValueError("Invalid string mode {0}".format(strings))
+            self.shared_strings = STRING_TABLES[strings]()
 
         self._setup_styles()
+        # objects whose style has changed, write-only cells are written
+        # straight away
+        self._pending_styles = None if self.write_only else []
 
         self.loaded_theme = None
         self.vba_archive = None
         self.is_template = False
+        self._without_styles = False
         self._differential_styles = []
         self._guess_types = guess_types
         self.data_only = data_only
@@ -237,10 +251,16 @@ class Workbook(object):
         """Remove a named_range from this workbook."""
         self._named_ranges.remove(named_range)
 
-    def save(self, filename):
+    def save(self, filename, workers=None, compression=None):
         """Save the current workbook under the given `filename`.
         Use this function instead of using an `ExcelWriter`.
 
+        :param workers: number of processes used to write and compress worksheets, and of threads used to compress large parts
+        :type workers: int
+
+        :param compression: 'store', 'fast' or 'max', or None for the default
+        :type compression: string
+
         .. warning::
             When creating your workbook using `write_only` set to True,
             you will only be able to call this function once. Subsequents attempts to
@@ -248,7 +268,30 @@ class Workbook(object):
         """
         if self.read_only:
             raise TypeError("""Workbook is read-only""")
+        if self._without_styles:
+            raise TypeError("Workbook was loaded without styles")
         if self.write_only:
-            save_dump(self, filename)
+            save_dump(self, filename, workers=workers, compression=compression)
         else:
-            save_workbook(self, filename)
+            save_workbook(self, filename, workers=workers,
+                          compression=compression)
+
+
+    def _resolve_styles(self):
+        """Intern the styles of objects whose style has changed"""
+        pending = self._pending_styles
+        if pending:
+            self._pending_styles = []
+            for obj in pending:
+                obj._resolve_style()
+
+
+    def close(self):
+        """
+        Close the archive which read-only and lazily loaded workbooks are
+        read from, and the shared strings kept on disk for them
+        """
+        archive = getattr(self, '_archive', None)
+        if archive is not None:
+            close_archive(archive)
+            self._archive = None
@@ -0,0 +1,143 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+"""
+Find the bounds of the cells in worksheet XML without parsing it
+
+Only the references of each ``<row>`` and of its first and last ``<c>``
+are read from the raw bytes; values, formulae and the cells in between are
+never looked at.
+"""
+
+import re
+
+from openpyxl.utils import column_index_from_string
+from .row_index import SHEET_DATA_RE, ROW_NUMBER_RE, CHUNK_SIZE
+
+
+CELL_REF_RE = re.compile(br"""\sr\s*=\s*["']([A-Z]+)(\d+)["']""")
+TAG_END = b" \t\r\n/>"
+
+
+class MissingReference(ValueError):
+    """A row or cell has no reference so its position must be inferred"""
+
+
+def scan_bounds(source, chunk_size=CHUNK_SIZE * 16):
+    """
+    Return (min_col, min_row, max_col, max_row) of the cells in a worksheet
+    or None if it has none. Raises MissingReference if a row or one of the
+    cells looked at has no reference.
+    """
+    scanner = BoundsScanner()
+    while not scanner.done:
+        data = source.read(chunk_size)
+        if not data:
+            break
+        scanner.feed(data)
+    return scanner.bounds
+
+
+def _is_tag(data, pos, size):
+    """
+    Whether the marker at `pos` is a whole tag name. A marker at the end of
+    the data is undecided, it may be the start of a longer name such as
+    ``<rowBreaks``, and so is not a tag yet.
+    """
+    following = data[pos+size:pos+size+1]
+    return following != b"" and following in TAG_END
+
+
+def _find_tag(data, marker, start, end, reverse=False):
+    """Position of the first, or last, start tag `marker` in data[start:end]"""
+    size = len(marker)
+    if reverse:
+        pos = data.rfind(marker, start, end)
+        while pos != -1 and not _is_tag(data, pos, size):
+            pos = data.rfind(marker, start, pos)
+    else:
+        pos = data.find(marker, start, end)
+        while pos != -1 and not _is_tag(data, pos, size):
+            pos = data.find(marker, pos + 1, end)
+    return pos
+
+
+class BoundsScanner(object):
+    """
+    Reads chunks of worksheet XML and keeps track of the bounds of the
+    rows seen so far. A row is only looked at once its end, the start of
+    the next row, is in the buffer.
+    """
+
+    def __init__(self):
+        self.pending = b""
+        self.row_marker = None
+        self.done = False
+        self.min_col = self.min_row = self.max_col = self.max_row = None
+
+
+    @property
+    def bounds(self):
+        if self.min_row is None:
+            return
+        return self.min_col, self.min_row, self.max_col, self.max_row
+
+
+    def feed(self, data):
+        buf = self.pending + data
+        pos = 0
+
+        if self.row_marker is None:
+            m = SHEET_DATA_RE.search(buf)
+            if m is None:
+                self.pending = buf
+                return
+            prefix = m.group(1) or b""
+            self.row_marker = b"<" + prefix + b"row"
+            self.cell_marker = b"<" + prefix + b"c"
+            self.data_end = b"</" + prefix + b"sheetData"
+            pos = m.end()
+
+        start = _find_tag(buf, self.row_marker, pos, len(buf))
+        while start != -1:
+            end = _find_tag(buf, self.row_marker, start + 1, len(buf))
+            if end == -1:
+                end = buf.find(self.data_end, start)
+                if end == -1:
+                    break # row continues in the next chunk
+                self.done = True
+            self.add_row(buf, start, end)
+            if self.done:
+                return
+            start = end
+
+        if start == -1:
+            start = max(pos, len(buf) - len(self.row_marker))
+        self.pending = buf[start:]
+
+
+    def add_row(self, buf, start, end):
+        tag_end = buf.find(b">", start, end)
+        m = ROW_NUMBER_RE.search(buf, start, tag_end)
+        if m is None:
+            raise MissingReference("Row without a reference")
+        row = int(m.group(1))
+
+        first = _find_tag(buf, self.cell_marker, tag_end, end)
+        if first == -1:
+            return # no cells
+        last = _find_tag(buf, self.cell_marker, first, end, reverse=True)
+
+        columns = []
+        for pos in (first, last):
+            m = CELL_REF_RE.search(buf, pos, buf.find(b">", pos, end))
+            if m is None:
+                raise MissingReference("Cell without a reference")
+            columns.append(column_index_from_string(m.group(1).decode("ascii")))
+        first, last = columns
+
+        if self.min_row is None:
+            self.min_row, self.min_col, self.max_col = row, first, last
+        self.min_col = min(self.min_col, first)
+        self.max_col = max(self.max_col, last)
+        self.max_row = row
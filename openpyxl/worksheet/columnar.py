@@ -0,0 +1,255 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+"""
+Typed column buffers for exporting read-only worksheets to NumPy
+
+Values are appended to compact `array` buffers while the worksheet is
+streamed and are only turned into NumPy arrays at the end. The type of a
+column is taken from the first value found and widened if necessary:
+int -> float -> object. Numbers with a date format are kept as serials and
+converted in one go. Columns with a dtype are returned with exactly that
+dtype and values which cannot be converted to it are missing.
+"""
+
+from array import array
+import datetime
+
+from openpyxl.compat import NUMERIC_TYPES, INT64_TYPECODE, unicode
+from openpyxl.utils.datetime import from_excel, CALENDAR_MAC_1904
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+NAN = float("nan")
+WINDOWS_EPOCH = datetime.datetime(1899, 12, 30)
+MAC_EPOCH = datetime.datetime(1904, 1, 1)
+USECS_PER_DAY = 86400 * 10**6
+
+INT = 'int'
+FLOAT = 'float'
+DATE = 'date'
+OBJECT = 'object'
+
+# storage for each kind of column and the value used for missing cells
+STORAGE = {
+    INT: (INT64_TYPECODE, 0),
+    FLOAT: ('d', NAN),
+    DATE: ('d', NAN),
+}
+
+
+def column_kind(dtype):
+    """Map a NumPy dtype to the kind of buffer that can hold it"""
+    kind = numpy.dtype(dtype).kind
+    if kind in 'iu':
+        return INT
+    if kind == 'f':
+        return FLOAT
+    if kind == 'M':
+        return DATE
+    if kind in 'OUS':
+        return OBJECT
+    raise ValueError("Unsupported column type {0}".format(dtype))
+
+
+class ColumnBuffer(object):
+    """
+    Growable storage for the values of a single column with a mask of the
+    rows which actually have a value. The column is fixed to a `kind` of
+    buffer, or to the one for a NumPy `dtype`, or inferred from its values.
+    """
+
+    def __init__(self, kind=None, base_date=None, dtype=None):
+        self.dtype = None
+        self.limits = None
+        if dtype is not None:
+            self.dtype = numpy.dtype(dtype)
+            if kind is None:
+                kind = column_kind(dtype)
+            if self.dtype.kind in 'iu':
+                info = numpy.iinfo(self.dtype)
+                self.limits = int(info.min), int(info.max)
+        self.kind = kind
+        self.fixed = kind is not None
+        self.base_date = base_date
+        self.present = bytearray()
+        self.data = None
+        if kind is not None:
+            self.data = self._storage(kind)
+
+
+    def __len__(self):
+        return len(self.present)
+
+
+    def _storage(self, kind):
+        if kind == OBJECT:
+            return []
+        return array(STORAGE[kind][0])
+
+
+    def _missing(self):
+        if self.kind == OBJECT:
+            return None
+        return STORAGE[self.kind][1]
+
+
+    def _kind_of(self, value, is_date):
+        if is_date:
+            return DATE
+        if isinstance(value, bool):
+            return OBJECT
+        if isinstance(value, float):
+            return FLOAT
+        if isinstance(value, NUMERIC_TYPES):
+            return INT
+        return OBJECT
+
+
+    def pad(self, size):
+        """Add missing values up to `size`"""
+        missing = size - len(self.present)
+        if missing <= 0:
+            return
+        self.present.extend(b"\x00" * missing)
+        if self.data is not None:
+            self.data.extend([self._missing()] * missing)
+
+
+    def add(self, idx, value, is_date=False):
+        """Store `value` at row `idx` (zero-based)"""
+        self.pad(idx)
+        if self.fixed:
+            try:
+                value = self._coerce(value, is_date)
+            except (TypeError, ValueError, OverflowError):
+                # such as the text of a header
+                self.pad(idx + 1)
+                return
+        else:
+            kind = self._kind_of(value, is_date)
+            if kind != self.kind:
+                self._promote(kind)
+            if self.kind == OBJECT and is_date:
+                value = from_excel(value, self.base_date)
+            elif self.kind == FLOAT:
+                value = float(value)
+        self.data.append(value)
+        self.present.append(1)
+
+
+    def _coerce(self, value, is_date):
+        """Convert `value` for the column or raise an error if it cannot be"""
+        kind = self.kind
+        if kind == OBJECT:
+            if is_date:
+                value = from_excel(value, self.base_date)
+            dtype = self.dtype
+            if dtype is not None and dtype.kind == 'U':
+                value = unicode(value)
+            elif dtype is not None and dtype.kind == 'S':
+                value = unicode(value).encode("ascii")
+            return value
+        if kind == INT:
+            converted = int(value)
+            if isinstance(value, float) and converted != value:
+                raise ValueError("{0} is not an integer".format(value))
+            if self.limits is not None:
+                low, high = self.limits
+                if not low <= converted <= high:
+                    raise OverflowError("{0} out of range".format(value))
+            return converted
+        return float(value)
+
+
+    def _promote(self, kind):
+        """Widen the column so that it can hold values of `kind`"""
+        current = self.kind
+        if current is None:
+            new = kind
+        elif (current, kind) in ((INT, FLOAT), (FLOAT, INT)):
+            new = FLOAT
+        else:
+            new = OBJECT
+        if new == current:
+            return
+
+        data = self._storage(new)
+        if current is not None:
+            if new == FLOAT:
+                data.extend(float(v) if p else NAN
+                            for v, p in zip(self.data, self.present))
+            else:
+                for v, p in zip(self.data, self.present):
+                    if not p:
+                        v = None
+                    elif current == DATE:
+                        v = from_excel(v, self.base_date)
+                    data.append(v)
+        else:
+            data.extend([STORAGE.get(new, (None, None))[1]] * len(self.present))
+        self.kind = new
+        self.data = data
+
+
+    def to_array(self, size):
+        """
+        Return the column as a NumPy array, of the column's dtype if it has
+        one. Missing values are NaN for floats, NaT for dates and None for
+        objects. Integer and string columns with missing values are masked
+        arrays.
+        """
+        values = self._to_array(size)
+        dtype = self.dtype
+        if dtype is None or values.dtype == dtype:
+            return values
+        if dtype.kind in 'US':
+            mask = numpy.frombuffer(self.present, dtype="uint8") == 0
+            values[mask] = dtype.type()
+            values = values.astype(dtype)
+            if mask.any():
+                values = numpy.ma.masked_array(values, mask=mask)
+            return values
+        return values.astype(dtype)
+
+
+    def _to_array(self, size):
+        self.pad(size)
+        kind = self.kind
+        if kind is None:
+            return numpy.full(size, NAN)
+
+        if kind == OBJECT:
+            result = numpy.empty(size, dtype=object)
+            result[:] = self.data
+            return result
+
+        values = numpy.frombuffer(self.data, dtype=self.data.typecode).copy()
+        if kind == INT:
+            values = values.astype("int64")
+            if 0 in self.present:
+                mask = numpy.frombuffer(self.present, dtype="uint8") == 0
+                values = numpy.ma.masked_array(values, mask=mask)
+            return values
+        if kind == DATE:
+            return self._to_datetime(values)
+        return values
+
+
+    def _to_datetime(self, serials):
+        epoch = WINDOWS_EPOCH
+        if self.base_date == CALENDAR_MAC_1904:
+            epoch = MAC_EPOCH
+        else:
+            # Excel thinks 1900 was a leap year
+            serials = numpy.where((serials > 1) & (serials < 60),
+                                  serials + 1, serials)
+        missing = numpy.isnan(serials)
+        usecs = numpy.round(numpy.where(missing, 0, serials) * USECS_PER_DAY)
+        result = numpy.datetime64(epoch, "us") + usecs.astype("timedelta64[us]")
+        result[missing] = numpy.datetime64("NaT")
+        return result
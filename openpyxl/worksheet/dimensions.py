@@ -39,14 +39,7 @@ class Dimension(Strict, StyleableObject):
         self.outlineLevel = outlineLevel
         self.collapsed = collapsed
         if style is not None:
-            style_id = int(style)
-            style = self.parent.parent._cell_styles[style_id]
-            self._font_id = style.fontId
-            self._fill_id = style.fillId
-            self._border_id = style.borderId
-            self._alignment_id = style.alignmentId
-            self._protection_id = style.protectionId
-            self._number_format_id = style.numFmtId
+            self._style_id = int(style)
 
 
     def __iter__(self):
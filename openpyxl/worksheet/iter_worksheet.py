@@ -90,11 +90,19 @@ class IterableWorksheet(Worksheet):
         self._xml = value
 
 
-    def get_squared_range(self, min_col, min_row, max_col, max_row):
+    def get_squared_range(self, min_col, min_row, max_col, max_row,
+                          values_only=False):
         """
         The source worksheet file may have columns or rows missing.
         Missing cells will be created.
         """
+        rows = self._get_squared_range(min_col, min_row, max_col, max_row)
+        if not values_only:
+            return rows
+        return (tuple(c.value for c in row) for row in rows)
+
+
+    def _get_squared_range(self, min_col, min_row, max_col, max_row):
         if max_col is not None:
             empty_row = tuple(EMPTY_CELL for column in range(min_col, max_col + 1))
         else:
@@ -5,11 +5,14 @@ from __future__ import absolute_import
 *Still very raw*
 """
 
+from contextlib import contextmanager
+from functools import partial
+
 # compatibility
-from openpyxl.compat import range
+from openpyxl.compat import range, unicode, basestring, OrderedDict
 
 # package
-from openpyxl.xml.functions import iterparse
+from openpyxl.xml.backends import iterparse
 from openpyxl.xml.functions import safe_iterator
 from openpyxl.xml.constants import SHEET_MAIN_NS
 
@@ -19,8 +22,14 @@ from openpyxl.utils import (
     column_index_from_string,
     get_column_letter,
     coordinate_to_tuple,
+    range_boundaries,
 )
+from openpyxl.utils.datetime import from_excel
+from openpyxl.styles.numbers import format_table
 from openpyxl.cell.read_only import ReadOnlyCell, EMPTY_CELL
+from .bounds import scan_bounds, MissingReference
+from .row_index import RowIndex, IndexedReader, skip, CHECKPOINT_DISTANCE
+from . import columnar
 
 
 def read_dimension(source):
@@ -29,7 +38,7 @@ def read_dimension(source):
     min_row = min_col =  max_row = max_col = None
     DIMENSION_TAG = '{%s}dimension' % SHEET_MAIN_NS
     DATA_TAG = '{%s}sheetData' % SHEET_MAIN_NS
-    it = iterparse(source, tag=[DIMENSION_TAG, DATA_TAG])
+    it = iterparse(source, tag=[DIMENSION_TAG, DATA_TAG], events=('start',))
     for _event, element in it:
         if element.tag == DIMENSION_TAG:
             dim = element.get("ref")
@@ -53,7 +62,12 @@ def read_dimension(source):
         elif element.tag == DATA_TAG:
             # Dimensions missing
             break
-        element.clear()
+
+
+def _column_index(column):
+    if isinstance(column, basestring):
+        return column_index_from_string(column)
+    return column
 
 
 ROW_TAG = '{%s}row' % SHEET_MAIN_NS
@@ -61,11 +75,23 @@ CELL_TAG = '{%s}c' % SHEET_MAIN_NS
 VALUE_TAG = '{%s}v' % SHEET_MAIN_NS
 FORMULA_TAG = '{%s}f' % SHEET_MAIN_NS
 DIMENSION_TAG = '{%s}dimension' % SHEET_MAIN_NS
+INLINE_TEXT = '{%s}is/{%s}t' % (SHEET_MAIN_NS, SHEET_MAIN_NS)
+INLINE_RICHTEXT = '{%s}is/{%s}r/{%s}t' % (SHEET_MAIN_NS, SHEET_MAIN_NS, SHEET_MAIN_NS)
+
+
+def _inline_string(cell):
+    """Text of an inline string, which has no value element"""
+    texts = cell.findall(INLINE_TEXT) or cell.findall(INLINE_RICHTEXT)
+    if texts:
+        return u"".join(t.text or u"" for t in texts)
 
 
 class ReadOnlyWorksheet(Worksheet):
 
     _xml = None
+    _row_index = None
+    _date_styles = None
+    _dimension_calculated = False
     _min_column = 1
     _min_row = 1
     _max_column = _max_row = None
@@ -94,20 +120,175 @@ class ReadOnlyWorksheet(Worksheet):
         self._xml = value
 
 
-    def get_squared_range(self, min_col, min_row, max_col, max_row):
+    def use_row_index(self, filename=None, distance=CHECKPOINT_DISTANCE):
+        """
+        Remember where rows start in the worksheet XML so that subsequent
+        reads of ranges and single cells can skip the rows before them.
+
+        The index is filled in as rows are read. If `filename` is given an
+        existing index is loaded from it, provided it was built for the same
+        worksheet, and a complete index will be written to it.
+        """
+        key = None
+        if self._xml is None:
+            info = self.parent._archive.getinfo(self.worksheet_path)
+            key = [self.worksheet_path, info.CRC, info.file_size]
+        index = None
+        if filename is not None:
+            index = RowIndex.load(filename, key)
+        if index is None:
+            index = RowIndex(key, distance)
+        index.filename = filename
+        self._row_index = index
+
+
+    @contextmanager
+    def _rows_source(self, min_row):
+        """
+        The XML source for reading rows, starting from the closest known row
+        before `min_row` if there is an index. Files opened for it are
+        closed on exit.
+        """
+        source = self.xml_source
+        index = self._row_index
+        if index is not None and not hasattr(source, "read"):
+            source = open(source, "rb")
+        try:
+            if index is None:
+                yield source
+                return
+
+            scanner = None
+            checkpoint = index.lookup(min_row)
+            if checkpoint is None:
+                if not index.complete:
+                    scanner = index.scanner()
+                yield IndexedReader(source, scanner)
+                return
+
+            row, offset = checkpoint
+            skip(source, offset)
+            if not index.complete:
+                scanner = index.scanner(offset)
+            yield IndexedReader(source, scanner, index.header)
+        finally:
+            if source is not self._xml:
+                source.close()
+
+
+    def iter_rows(self, range_string=None, row_offset=0, column_offset=0,
+                  values_only=False, columns=None, where=None):
+        """
+        Returns a squared range based on the `range_string` parameter,
+        using generators.
+        If no range is passed, will iterate over all cells in the worksheet
+
+        :param range_string: range of cells (e.g. 'A1:C4')
+        :type range_string: string
+
+        :param row_offset: additional rows (e.g. 4)
+        :type row: int
+
+        :param column_offset: additonal columns (e.g. 3)
+        :type column: int
+
+        :param values_only: return cell values rather than cells
+        :type values_only: bool
+
+        :param columns: only return these columns, in this order, instead of those in the range. Other cells are skipped without being read
+        :type columns: list of column letters or indices
+
+        :param where: only return rows for which all the functions return True when called with the value of their column. Other rows are skipped before the rest of the row is read
+        :type where: dict of column letter or index to function
+
+        :rtype: generator
+        """
+        if range_string is not None:
+            min_col, min_row, max_col, max_row = range_boundaries(range_string.upper())
+        else:
+            min_col, min_row, max_col, max_row = (1, 1, self.max_column, self.max_row)
+        if max_col is not None:
+            max_col += column_offset
+        if max_row is not None:
+            max_row += row_offset
+        min_col += column_offset
+        min_row += row_offset
+
+        if where is not None:
+            where = dict((_column_index(key), test) for key, test in where.items())
+
+        if columns is None:
+            return self.get_squared_range(min_col, min_row, max_col, max_row,
+                                          values_only, where)
+
+        columns = [_column_index(col) + column_offset for col in columns]
+        return self._get_projected_range(columns, min_row, max_row,
+                                         values_only, where)
+
+
+    def aiter_rows(self, *args, **kw):
+        """
+        Asynchronous version of :meth:`iter_rows`, which takes the same
+        arguments. Rows are read in an executor in batches of `batch_size`.
+
+        :param batch_size: rows read at a time (default 1000)
+        :type batch_size: int
+
+        :param loop: event loop, the current one by default
+
+        :param executor: executor to read rows in, the loop's default by default
+
+        :rtype: asynchronous iterator
+        """
+        from openpyxl.aio import AsyncRowIterator, BATCH_SIZE
+        batch_size = kw.pop("batch_size", BATCH_SIZE)
+        loop = kw.pop("loop", None)
+        executor = kw.pop("executor", None)
+        rows = partial(self.iter_rows, *args, **kw)
+        return AsyncRowIterator(rows, batch_size, loop, executor)
+
+
+    def get_squared_range(self, min_col, min_row, max_col, max_row,
+                          values_only=False, where=None):
         """
         The source worksheet file may have columns or rows missing.
         Missing cells will be created.
+        With `values_only` the values are decoded directly from the XML and
+        no cells are created at all.
+        `where` maps column indices to functions which all have to accept
+        the value of their column for a row to be returned.
         """
+        filler = EMPTY_CELL
+        get_row = self._get_row
+        if values_only:
+            filler = None
+            get_row = self._get_row_values
         if max_col is not None:
-            empty_row = tuple(EMPTY_CELL for column in range(min_col, max_col + 1))
+            empty_row = tuple(filler for column in range(min_col, max_col + 1))
         else:
-            empty_row = []
-        row_counter = min_row
+            empty_row = ()
 
-        p = iterparse(self.xml_source, tag=[ROW_TAG], remove_blank_text=True)
-        for _event, element in p:
-            if element.tag == ROW_TAG:
+        if where:
+            self._load_date_styles()
+
+        for row_id, element in self._row_elements(min_row, max_row):
+            if where and not self._row_matches(element, where):
+                continue
+            if element is None:
+                yield empty_row
+            else:
+                yield tuple(get_row(element, min_col, max_col))
+
+
+    def _row_elements(self, min_row, max_row):
+        """
+        Yield the number and element of every row from `min_row` up to
+        `max_row`. Rows missing from the source are yielded with None in
+        place of an element.
+        """
+        row_counter = min_row
+        with self._rows_source(min_row) as source:
+            for _event, element in iterparse(source, tag=[ROW_TAG]):
                 row_id = int(element.get("r"))
 
                 # got all the rows we need
@@ -115,28 +296,107 @@ class ReadOnlyWorksheet(Worksheet):
                     break
 
                 # some rows are missing
-                for row_counter in range(row_counter, row_id):
-                    row_counter += 1
-                    yield empty_row
+                for missing in range(row_counter, row_id):
+                    yield missing, None
 
-                # return cells from a row
                 if min_row <= row_id:
-                    yield tuple(self._get_row(element, min_col, max_col))
-                    row_counter += 1
+                    yield row_id, element
+                    row_counter = row_id + 1
+                element.clear()
+
 
-            if element.tag in (CELL_TAG, VALUE_TAG, FORMULA_TAG):
-                # sub-elements of rows should be skipped as handled within a cell
+    def _get_projected_range(self, columns, min_row, max_row,
+                             values_only=False, where=None):
+        """
+        Rows of cells, or values, from a set of columns
+        """
+        filler = EMPTY_CELL
+        if values_only:
+            filler = None
+        if values_only or where:
+            self._load_date_styles()
+        empty_row = tuple(filler for column in columns)
+
+        for row_id, element in self._row_elements(min_row, max_row):
+            if where and not self._row_matches(element, where):
                 continue
-            element.clear()
+            if element is None:
+                yield empty_row
+            else:
+                yield self._get_row_projection(element, columns, values_only)
+
+
+    def _get_row_projection(self, element, columns, values_only=False):
+        """
+        Return the cells, or values, of `columns` from a particular row.
+        Cells in other columns are not decoded and the row is only read as
+        far as the last of the columns.
+        """
+        wanted = set(columns)
+        last = max(columns)
+        found = {}
+        row = int(element.get('r'))
+        column = 0
+
+        for cell in safe_iterator(element, CELL_TAG):
+            coordinate = cell.get('r')
+            if coordinate is None:
+                column += 1
+            else:
+                row, column = coordinate_to_tuple(coordinate)
+
+            if column > last:
+                break
+            if column in wanted:
+                if values_only:
+                    found[column] = self._cell_value(cell)
+                else:
+                    found[column] = self._read_only_cell(cell, row, column)
+
+        filler = None if values_only else EMPTY_CELL
+        return tuple(found.get(column, filler) for column in columns)
+
+
+    def _row_matches(self, element, where):
+        """
+        Check the values of a row against functions of their columns,
+        giving up on the first that fails. Missing cells are None.
+        """
+        pending = dict(where)
+        if element is not None:
+            last = max(pending)
+            column = 0
+            for cell in safe_iterator(element, CELL_TAG):
+                coordinate = cell.get('r')
+                if coordinate is None:
+                    column += 1
+                else:
+                    row, column = coordinate_to_tuple(coordinate)
+
+                if column > last:
+                    break
+                test = pending.pop(column, None)
+                if test is not None and not test(self._cell_value(cell)):
+                    return False
+
+        for test in pending.values():
+            if not test(None):
+                return False
+        return True
 
 
     def _get_row(self, element, min_col=1, max_col=None):
         """Return cells from a particular row"""
         col_counter = min_col
+        row = int(element.get('r'))
+        column = 0
 
         for cell in safe_iterator(element, CELL_TAG):
             coordinate = cell.get('r')
-            row, column = coordinate_to_tuple(coordinate)
+            if coordinate is None:
+                column += 1 # cells without a reference follow on
+            else:
+                row, column = coordinate_to_tuple(coordinate)
 
             if max_col is not None and column > max_col:
                 break
@@ -147,25 +407,211 @@ class ReadOnlyWorksheet(Worksheet):
                         # pad row with missing cells
                         yield EMPTY_CELL
 
-                data_type = cell.get('t', 'n')
-                style_id = int(cell.get('s', 0))
-                formula = cell.findtext(FORMULA_TAG)
-                value = cell.find(VALUE_TAG)
-                if value is not None:
-                    value = value.text
-                if formula is not None:
-                    if not self.parent.data_only:
-                        data_type = 'f'
-                        value = "=%s" % formula
-
-                yield ReadOnlyCell(self, row, column,
-                                   value, data_type, style_id)
+                yield self._read_only_cell(cell, row, column)
             col_counter = column + 1
         if max_col is not None:
             for _ in range(col_counter, max_col+1):
                 yield EMPTY_CELL
 
 
+    def _read_only_cell(self, cell, row, column):
+        """Create a cell from a cell element"""
+        data_type = cell.get('t', 'n')
+        style_id = int(cell.get('s', 0))
+        formula = cell.findtext(FORMULA_TAG)
+        value = cell.find(VALUE_TAG)
+        if value is not None:
+            value = value.text
+        elif data_type == 'inlineStr':
+            value = _inline_string(cell)
+        if formula is not None:
+            if not self.parent.data_only:
+                data_type = 'f'
+                value = "=%s" % formula
+
+        return ReadOnlyCell(self, row, column, value, data_type, style_id)
+
+
+    def _load_date_styles(self):
+        if self._date_styles is None:
+            self._date_styles = self._get_date_styles()
+
+
+    def _get_date_styles(self):
+        """
+        Ids of the cell styles with a date format, so that values can be
+        converted without looking up the number format of every cell.
+        """
+        wb = self.parent
+        table = format_table(wb)
+        return set(idx for idx in range(1, len(wb._cell_styles))
+                   if table.for_style(idx).is_date)
+
+
+    def _get_row_values(self, element, min_col=1, max_col=None):
+        """Return the values of cells from a particular row"""
+        self._load_date_styles()
+        cell_value = self._cell_value
+        col_counter = min_col
+        column = 0
+
+        for cell in safe_iterator(element, CELL_TAG):
+            coordinate = cell.get('r')
+            if coordinate is None:
+                column += 1
+            else:
+                row, column = coordinate_to_tuple(coordinate)
+
+            if max_col is not None and column > max_col:
+                break
+
+            if min_col <= column:
+                for col_counter in range(max(col_counter, min_col), column):
+                    yield None
+                yield cell_value(cell)
+            col_counter = column + 1
+        if max_col is not None:
+            for _ in range(col_counter, max_col+1):
+                yield None
+
+
+    def _cell_value(self, cell):
+        """
+        Decode the value of a cell element. The date styles must have been
+        looked up.
+        """
+        data_type = cell.get('t', 'n')
+        formula = cell.findtext(FORMULA_TAG)
+        value = cell.find(VALUE_TAG)
+        if value is not None:
+            value = value.text
+        elif data_type == 'inlineStr':
+            value = _inline_string(cell)
+
+        if formula is not None and not self.parent.data_only:
+            value = "=%s" % formula
+        elif value is None:
+            pass
+        elif data_type == 'n':
+            try:
+                value = int(value)
+            except ValueError:
+                value = float(value)
+            date_styles = self._date_styles
+            if date_styles and int(cell.get('s', 0)) in date_styles:
+                value = from_excel(value, self.base_date)
+        elif data_type == 's':
+            value = self.shared_strings[int(value)]
+        elif data_type == 'b':
+            value = value == '1'
+        elif data_type in ('inlineStr', 'str'):
+            value = unicode(value)
+        return value
+
+
+    def to_columns(self, min_col=None, max_col=None, dtypes=None,
+                   min_row=None, max_row=None):
+        """
+        Read a block of the worksheet into NumPy arrays, one per column.
+
+        Column types are inferred from the values unless they are given in
+        `dtypes`, a dictionary of column letter or index to NumPy dtype.
+        Numbers become int64 or float64 arrays, numbers with a date format
+        datetime64 and anything else object arrays. Missing cells are NaN,
+        NaT or None; integer columns with missing cells are masked arrays.
+        Columns given a dtype have exactly that dtype. Values which cannot
+        be converted to it, such as the text of a header, are missing.
+
+        :rtype: OrderedDict of column letter to array
+        """
+        if columnar.numpy is None:
+            raise ImportError('You must install numpy to export columns')
+
+        if min_col is None:
+            min_col = self.min_column or 1
+        if max_col is None:
+            max_col = self.max_column
+            if max_col is None:
+                self.calculate_dimension(force=True)
+                max_col = self.max_column
+        if isinstance(min_col, basestring):
+            min_col = column_index_from_string(min_col)
+        if isinstance(max_col, basestring):
+            max_col = column_index_from_string(max_col)
+        if min_row is None:
+            min_row = self.min_row or 1
+
+        self._load_date_styles()
+        date_styles = self._date_styles
+        shared_strings = self.shared_strings
+        data_only = self.parent.data_only
+
+        fixed = {}
+        for key, dtype in (dtypes or {}).items():
+            if isinstance(key, basestring):
+                key = column_index_from_string(key)
+            fixed[key] = dtype
+        buffers = [columnar.ColumnBuffer(base_date=self.base_date,
+                                         dtype=fixed.get(idx))
+                   for idx in range(min_col, max_col + 1)]
+
+        last_row = min_row - 1
+        with self._rows_source(min_row) as source:
+            p = iterparse(source, tag=[ROW_TAG])
+            for _event, element in p:
+                row_id = int(element.get("r"))
+                if max_row is not None and row_id > max_row:
+                    break
+                if row_id >= min_row:
+                    last_row = row_id
+                    idx = row_id - min_row
+                    column = 0
+                    for cell in safe_iterator(element, CELL_TAG):
+                        coordinate = cell.get('r')
+                        if coordinate is None:
+                            column += 1
+                        else:
+                            row, column = coordinate_to_tuple(coordinate)
+                        if column > max_col:
+                            break
+                        if column < min_col:
+                            continue
+
+                        value = cell.find(VALUE_TAG)
+                        formula = cell.findtext(FORMULA_TAG)
+                        data_type = cell.get('t', 'n')
+                        if value is not None:
+                            value = value.text
+                        elif data_type == 'inlineStr':
+                            value = _inline_string(cell)
+                        is_date = False
+
+                        if formula is not None and not data_only:
+                            value = "=%s" % formula
+                        elif value is None:
+                            continue
+                        elif data_type == 'n':
+                            try:
+                                value = int(value)
+                            except ValueError:
+                                value = float(value)
+                            is_date = int(cell.get('s', 0)) in date_styles
+                        elif data_type == 's':
+                            value = shared_strings[int(value)]
+                        elif data_type == 'b':
+                            value = value == '1'
+                        buffers[column - min_col].add(idx, value, is_date)
+                element.clear()
+
+        size = max(last_row - min_row + 1, 0)
+        if max_row is not None:
+            size = max_row - min_row + 1
+        result = OrderedDict()
+        for idx, buf in enumerate(buffers, min_col):
+            result[get_column_letter(idx)] = buf.to_array(size)
+        return result
+
+
     def _get_cell(self, row, column):
         """Cells are returned by a generator which can be empty"""
         cell = tuple(self.get_squared_range(column, row, column, row))[0]
@@ -186,11 +632,16 @@ class ReadOnlyWorksheet(Worksheet):
 
 
     def calculate_dimension(self, force=False):
-        if not all([self.max_column, self.max_row]):
-            if force:
-                self._calculate_dimension()
-            else:
-                raise ValueError("Worksheet is unsized, use calculate_dimension(force=True)")
+        """
+        Return the range of cells in the worksheet as given by the source.
+        With `force` the range is calculated from the rows and cells, which
+        is necessary if the source doesn't give it or gets it wrong. This
+        is only done once.
+        """
+        if force and not self._dimension_calculated:
+            self._calculate_dimension()
+        elif not all([self.max_column, self.max_row]):
+            raise ValueError("Worksheet is unsized, use calculate_dimension(force=True)")
         return '%s%d:%s%d' % (
            get_column_letter(self.min_column), self.min_row,
            get_column_letter(self.max_column), self.max_row
@@ -199,16 +650,67 @@ class ReadOnlyWorksheet(Worksheet):
 
     def _calculate_dimension(self):
         """
-        Loop through all the cells to get the size of a worksheet.
+        Get the size of a worksheet from the references of its rows and of
+        the first and last cell of each row. No values are read.
         Do this only if it is explicitly requested.
         """
-        max_col = 0
-        for r in self.rows:
-            cell = r[-1]
-            max_col = max(max_col, cell.column)
-
-        self.max_row = cell.row
-        self.max_column = max_col
+        source = self.xml_source
+        if not hasattr(source, "read"):
+            source = open(source, "rb")
+        try:
+            bounds = scan_bounds(source)
+        except MissingReference:
+            bounds = self._parse_bounds()
+        finally:
+            if source is not self._xml:
+                source.close()
+
+        if bounds is None:
+            bounds = (1, 1, 1, 1)
+        self.min_column, self.min_row, self.max_column, self.max_row = bounds
+        self._dimension_calculated = True
+
+
+    def _parse_bounds(self):
+        """
+        Get the size of a worksheet by parsing it, for sources in which
+        cells and rows may not have references.
+        """
+        min_row = min_col = max_row = max_col = None
+        for row_id, element in self._row_elements(1, None):
+            if element is None:
+                continue
+            cells = element.findall(CELL_TAG)
+            if not cells:
+                continue
+            first, last = cells[0].get('r'), cells[-1].get('r')
+            if first is not None and last is not None:
+                first = coordinate_to_tuple(first)[1]
+                last = coordinate_to_tuple(last)[1]
+            else:
+                first, last = self._cell_span(cells)
+            if min_row is None:
+                min_row, min_col, max_col = row_id, first, last
+            min_col = min(min_col, first)
+            max_col = max(max_col, last)
+            max_row = row_id
+
+        if min_row is not None:
+            return min_col, min_row, max_col, max_row
+
+
+    def _cell_span(self, cells):
+        """First and last column of cells some of which have no reference"""
+        columns = []
+        column = 0
+        for cell in cells:
+            coordinate = cell.get('r')
+            if coordinate is None:
+                column += 1
+            else:
+                row, column = coordinate_to_tuple(coordinate)
+            columns.append(column)
+        return min(columns), max(columns)
 
 
     @property
@@ -0,0 +1,228 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+"""
+Row-offset index for read-only worksheets
+
+Worksheet XML is read as a stream so getting to row 50000 normally means
+parsing the 49999 rows before it. The index records the position of
+``<row>`` tags in the decompressed stream while rows are being read. Later
+reads rebuild a valid document from the worksheet header and the tail of
+the stream starting at the nearest checkpoint, so only the inflation of
+the skipped bytes is paid for, not their parsing.
+"""
+
+from array import array
+from bisect import bisect_right
+import json
+import re
+
+
+# minimum distance in bytes between two checkpoints
+CHECKPOINT_DISTANCE = 2**15
+CHUNK_SIZE = 2**16
+
+SHEET_DATA_RE = re.compile(br"<([A-Za-z_][\w.-]*:)?sheetData[\s/>]")
+ROW_NUMBER_RE = re.compile(br"""\sr\s*=\s*["'](\d+)["']""")
+
+
+class RowIndex(object):
+    """
+    Sorted checkpoints of row number -> offset of the row's start tag
+
+    `header` holds the raw bytes of the document up to the first row so
+    that a stream resumed from any checkpoint is still well formed.
+    `key` identifies the worksheet part the index belongs to and is used
+    to reject stale sidecar files.
+    """
+
+    filename = None
+
+    def __init__(self, key=None, distance=CHECKPOINT_DISTANCE):
+        self.key = key
+        self.distance = distance
+        self.header = None
+        self.marker = None
+        self.rows = array('l')
+        self.offsets = array('l')
+        self.complete = False
+
+
+    def __len__(self):
+        return len(self.rows)
+
+
+    def add(self, row, offset):
+        """Record a checkpoint if it is far enough from the last one"""
+        if self.rows:
+            if row <= self.rows[-1]:
+                return
+            if offset - self.offsets[-1] < self.distance:
+                return
+        self.rows.append(row)
+        self.offsets.append(offset)
+
+
+    def lookup(self, row):
+        """
+        Return the closest checkpoint at or before `row` as (row, offset)
+        or None if the stream has to be read from the start.
+        """
+        idx = bisect_right(self.rows, row) - 1
+        if idx < 0:
+            return
+        return self.rows[idx], self.offsets[idx]
+
+
+    def scanner(self, offset=0):
+        return RowScanner(self, offset)
+
+
+    def finish(self):
+        """The end of the stream has been reached"""
+        if self.complete:
+            return
+        self.complete = True
+        if self.filename is not None:
+            self.save(self.filename)
+
+
+    def save(self, filename):
+        meta = {'key':self.key, 'complete':self.complete,
+                'distance':self.distance, 'count':len(self.rows),
+                'header':len(self.header or b""),
+                'marker':(self.marker or b"").decode("ascii")}
+        with open(filename, "wb") as f:
+            f.write(json.dumps(meta).encode("ascii"))
+            f.write(b"\n")
+            f.write(self.header or b"")
+            self.rows.tofile(f)
+            self.offsets.tofile(f)
+
+
+    @classmethod
+    def load(cls, filename, key=None):
+        """
+        Read an index from a sidecar file. Returns None if the file is
+        missing, unreadable or was built for a different worksheet part.
+        """
+        try:
+            with open(filename, "rb") as f:
+                meta = json.loads(f.readline().decode("ascii"))
+                if meta['key'] != key:
+                    return
+                index = cls(key, meta['distance'])
+                index.header = f.read(meta['header']) or None
+                index.marker = meta['marker'].encode("ascii") or None
+                index.rows.fromfile(f, meta['count'])
+                index.offsets.fromfile(f, meta['count'])
+                index.complete = meta['complete']
+        except (IOError, OSError, ValueError, KeyError, EOFError):
+            return
+        return index
+
+
+class RowScanner(object):
+    """
+    Looks for row start tags in chunks of the stream as they are read and
+    adds them to the index. Partial tags at the end of a chunk are kept
+    until the next one arrives.
+    """
+
+    def __init__(self, index, offset=0):
+        self.index = index
+        self.pending = b""
+        self.base = offset # position of pending[0] in the stream
+
+
+    def feed(self, data):
+        index = self.index
+        buf = self.pending + data
+        pos = 0
+
+        if index.marker is None:
+            m = SHEET_DATA_RE.search(buf)
+            if m is None:
+                self.pending = buf
+                return
+            prefix = m.group(1) or b""
+            index.marker = b"<" + prefix + b"row"
+            pos = m.end()
+
+        marker = index.marker
+        size = len(marker)
+        while True:
+            start = buf.find(marker, pos)
+            if start == -1:
+                pos = max(pos, len(buf) - size)
+                break
+            end = buf.find(b">", start)
+            if end == -1:
+                pos = start
+                break
+            pos = end
+            if buf[start+size:start+size+1] not in b" \t\r\n/>":
+                continue # <rowBreaks> and friends
+            m = ROW_NUMBER_RE.search(buf, start, end)
+            if m is None:
+                continue
+            offset = self.base + start
+            if index.header is None:
+                index.header = buf[:start]
+            index.add(int(m.group(1)), offset)
+
+        if index.header is None and index.marker is not None:
+            # keep the header until the first row has been seen
+            self.pending = buf
+        else:
+            self.pending = buf[pos:]
+            self.base += pos
+
+
+    def close(self):
+        self.index.finish()
+
+
+class IndexedReader(object):
+    """
+    File-like wrapper which feeds everything it reads to a scanner, if
+    there is one. Reads can optionally be prefixed with a saved header.
+    """
+
+    def __init__(self, source, scanner, header=b""):
+        self.source = source
+        self.scanner = scanner
+        self.header = header
+
+
+    def read(self, size=-1):
+        if self.header:
+            if size is None or size < 0:
+                data, self.header = self.header, b""
+            else:
+                data, self.header = self.header[:size], self.header[size:]
+            return data
+        data = self.source.read(size)
+        if self.scanner is not None:
+            if data:
+                self.scanner.feed(data)
+            else:
+                self.scanner.close()
+        return data
+
+
+def skip(source, offset):
+    """
+    Move a stream to `offset`. Compressed archive members cannot always
+    seek so the bytes are inflated and thrown away instead.
+    """
+    try:
+        source.seek(offset)
+        return
+    except Exception:
+        pass
+    while offset > 0:
+        data = source.read(min(offset, CHUNK_SIZE))
+        if not data:
+            break
+        offset -= len(data)
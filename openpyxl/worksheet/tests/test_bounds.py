@@ -0,0 +1,58 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+from io import BytesIO
+
+import pytest
+
+
+@pytest.fixture
+def scan_bounds():
+    from .. bounds import scan_bounds
+    return scan_bounds
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 10000])
+def test_scan(scan_bounds, chunk_size):
+    xml = b"""<x:worksheet xmlns:x="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+    <x:cols><x:col min="1" max="2"/></x:cols>
+    <x:sheetData>
+      <x:row r="3" spans="2:4"><x:c r="B3"><x:v>1</x:v></x:c><x:c r="D3" t="s"><x:v>1</x:v></x:c></x:row>
+      <x:row r="4"/>
+      <x:row r="7"><x:c r="A7"/></x:row>
+    </x:sheetData>
+    <x:rowBreaks count="1"><x:brk id="5"/></x:rowBreaks>
+    </x:worksheet>"""
+    assert scan_bounds(BytesIO(xml), chunk_size) == (1, 3, 4, 7)
+
+
+def test_empty(scan_bounds):
+    xml = b"""<worksheet><sheetData/></worksheet>"""
+    assert scan_bounds(BytesIO(xml)) is None
+
+
+def test_missing_reference(scan_bounds):
+    from .. bounds import MissingReference
+    xml = b"""<worksheet><sheetData><row r="1"><c><v>1</v></c></row></sheetData></worksheet>"""
+    with pytest.raises(MissingReference):
+        scan_bounds(BytesIO(xml))
+
+
+@pytest.mark.parametrize("data, marker",
+                         [(b"</sheetData><row", b"<row"),
+                          (b"<worksheet><c", b"<c")])
+def test_marker_at_end(data, marker):
+    from .. bounds import _find_tag
+    assert _find_tag(data, marker, 0, len(data)) == -1
+    assert _find_tag(data, marker, 0, len(data), reverse=True) == -1
+    data += b"Breaks>"
+    assert _find_tag(data, marker, 0, len(data)) == -1
+
+
+def test_row_breaks_across_chunks():
+    from .. bounds import BoundsScanner
+    scanner = BoundsScanner()
+    scanner.feed(b'<worksheet><sheetData><row r="2"><c r="B2"/></row>'
+                 b'</sheetData><row')
+    assert scanner.done
+    assert scanner.bounds == (2, 2, 2, 2)
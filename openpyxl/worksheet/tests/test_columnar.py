@@ -0,0 +1,142 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+import datetime
+
+import pytest
+
+pytestmark = pytest.mark.numpy_required
+
+
+@pytest.fixture
+def ColumnBuffer():
+    from .. columnar import ColumnBuffer
+    return ColumnBuffer
+
+
+def test_int(ColumnBuffer):
+    buf = ColumnBuffer()
+    buf.add(0, 1)
+    buf.add(1, 2)
+    arr = buf.to_array(2)
+    assert arr.dtype == "int64"
+    assert list(arr) == [1, 2]
+
+
+def test_int_missing(ColumnBuffer):
+    buf = ColumnBuffer()
+    buf.add(1, 2)
+    arr = buf.to_array(3)
+    assert list(arr.mask) == [True, False, True]
+    assert arr[1] == 2
+
+
+def test_promote_float(ColumnBuffer):
+    import numpy
+    buf = ColumnBuffer()
+    buf.add(0, 1)
+    buf.add(2, 2.5)
+    arr = buf.to_array(3)
+    assert arr.dtype == "float64"
+    assert arr[0] == 1
+    assert numpy.isnan(arr[1])
+    assert arr[2] == 2.5
+
+
+def test_promote_object(ColumnBuffer):
+    buf = ColumnBuffer()
+    buf.add(0, 1.5)
+    buf.add(2, "text")
+    arr = buf.to_array(3)
+    assert arr.dtype == object
+    assert list(arr) == [1.5, None, "text"]
+
+
+def test_dates(ColumnBuffer):
+    import numpy
+    from openpyxl.utils.datetime import CALENDAR_WINDOWS_1900
+    buf = ColumnBuffer(base_date=CALENDAR_WINDOWS_1900)
+    buf.add(0, 27169.25, True)
+    buf.add(1, 59, True)
+    arr = buf.to_array(3)
+    assert arr[0] == numpy.datetime64(datetime.datetime(1974, 5, 20, 6))
+    assert arr[1] == numpy.datetime64(datetime.datetime(1900, 2, 28))
+    assert numpy.isnat(arr[2])
+
+
+def test_dates_promote(ColumnBuffer):
+    from openpyxl.utils.datetime import CALENDAR_WINDOWS_1900
+    buf = ColumnBuffer(base_date=CALENDAR_WINDOWS_1900)
+    buf.add(0, 27169, True)
+    buf.add(1, "text")
+    arr = buf.to_array(2)
+    assert list(arr) == [datetime.datetime(1974, 5, 20), "text"]
+
+
+def test_fixed(ColumnBuffer):
+    buf = ColumnBuffer('float')
+    buf.add(0, 1)
+    buf.add(1, 2)
+    arr = buf.to_array(2)
+    assert arr.dtype == "float64"
+
+
+@pytest.mark.parametrize("dtype, kind",
+                         [
+                             ("int64", "int"),
+                             ("float32", "float"),
+                             ("datetime64[us]", "date"),
+                             (object, "object"),
+                         ]
+                         )
+def test_column_kind(dtype, kind):
+    from .. columnar import column_kind
+    assert column_kind(dtype) == kind
+
+
+@pytest.mark.parametrize("dtype", ["int8", "int32", "uint16"])
+def test_exact_int_dtype(ColumnBuffer, dtype):
+    buf = ColumnBuffer(dtype=dtype)
+    buf.add(0, u"header")
+    buf.add(1, 1)
+    buf.add(2, 2.5)
+    buf.add(3, 100000)
+    buf.add(4, 3.0)
+    arr = buf.to_array(5)
+    assert arr.dtype == dtype
+    assert list(arr.mask) == [True, False, True, dtype != "int32", False]
+    assert arr[1] == 1
+    assert arr[4] == 3
+
+
+def test_exact_float_dtype(ColumnBuffer):
+    import numpy
+    buf = ColumnBuffer(dtype="float32")
+    buf.add(0, u"header")
+    buf.add(1, 1.5)
+    arr = buf.to_array(2)
+    assert arr.dtype == numpy.float32
+    assert numpy.isnan(arr[0])
+    assert arr[1] == 1.5
+
+
+def test_exact_date_dtype(ColumnBuffer):
+    import numpy
+    from openpyxl.utils.datetime import CALENDAR_WINDOWS_1900
+    buf = ColumnBuffer(base_date=CALENDAR_WINDOWS_1900, dtype="datetime64[D]")
+    buf.add(0, u"Date")
+    buf.add(1, 27169.25, True)
+    arr = buf.to_array(2)
+    assert arr.dtype == numpy.dtype("datetime64[D]")
+    assert numpy.isnat(arr[0])
+    assert arr[1] == numpy.datetime64("1974-05-20")
+
+
+def test_exact_string_dtype(ColumnBuffer):
+    buf = ColumnBuffer(dtype="U")
+    buf.add(0, u"name")
+    buf.add(2, 5)
+    arr = buf.to_array(3)
+    assert arr.dtype.kind == "U"
+    assert list(arr.mask) == [False, True, False]
+    assert list(arr.data[::2]) == [u"name", u"5"]
@@ -0,0 +1,116 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+from io import BytesIO
+
+import pytest
+
+
+@pytest.fixture
+def RowIndex():
+    from .. row_index import RowIndex
+    return RowIndex
+
+
+@pytest.fixture
+def sheet_xml():
+    rows = "".join('<row r="{0}"><c r="A{0}"><v>{0}</v></c></row>'.format(i)
+                   for i in range(1, 101))
+    src = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+    <worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+    <sheetData>{0}</sheetData>
+    <rowBreaks count="1"><brk id="5"/></rowBreaks>
+    </worksheet>""".format(rows)
+    return src.encode("utf-8")
+
+
+def scan(index, xml, chunk=7):
+    from .. row_index import IndexedReader
+    reader = IndexedReader(BytesIO(xml), index.scanner())
+    while reader.read(chunk):
+        pass
+
+
+def test_add(RowIndex):
+    index = RowIndex(distance=10)
+    index.add(1, 100)
+    index.add(2, 105) # too close
+    index.add(3, 120)
+    index.add(3, 200) # same row
+    assert list(index.rows) == [1, 3]
+    assert list(index.offsets) == [100, 120]
+
+
+@pytest.mark.parametrize("row, expected",
+                         [
+                             (0, None),
+                             (1, (1, 100)),
+                             (20, (10, 400)),
+                             (5000, (100, 900)),
+                         ]
+                         )
+def test_lookup(RowIndex, row, expected):
+    index = RowIndex(distance=1)
+    for r, offset in [(1, 100), (10, 400), (100, 900)]:
+        index.add(r, offset)
+    assert index.lookup(row) == expected
+
+
+def test_scan(RowIndex, sheet_xml):
+    index = RowIndex(distance=1)
+    scan(index, sheet_xml)
+    assert index.complete is True
+    assert list(index.rows) == list(range(1, 101))
+    for row, offset in zip(index.rows, index.offsets):
+        tag = '<row r="{0}">'.format(row).encode("ascii")
+        assert sheet_xml[offset:offset+len(tag)] == tag
+    assert index.header.endswith(b"<sheetData>")
+
+
+def test_scan_prefixed(RowIndex):
+    xml = b"""<x:worksheet xmlns:x="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+    <x:sheetData><x:row r="1"/><x:row r="3"/></x:sheetData></x:worksheet>"""
+    index = RowIndex(distance=1)
+    scan(index, xml, chunk=3)
+    assert list(index.rows) == [1, 3]
+    assert index.marker == b"<x:row"
+
+
+def test_resume(RowIndex, sheet_xml):
+    from openpyxl.xml.functions import fromstring
+    from openpyxl.xml.constants import SHEET_MAIN_NS
+    from .. row_index import IndexedReader, skip
+
+    index = RowIndex(distance=1)
+    scan(index, sheet_xml)
+    row, offset = index.lookup(50)
+
+    src = BytesIO(sheet_xml)
+    skip(src, offset)
+    reader = IndexedReader(src, None, index.header)
+    tree = fromstring(reader.read(-1) + reader.read(-1))
+    rows = [int(el.get("r")) for el in tree.iter("{%s}row" % SHEET_MAIN_NS)]
+    assert rows == list(range(50, 101))
+
+
+def test_sidecar(RowIndex, sheet_xml, tmpdir):
+    tmpdir.chdir()
+    index = RowIndex(key=["sheet1.xml", 1, 2], distance=1)
+    index.filename = "sheet1.idx"
+    scan(index, sheet_xml)
+
+    loaded = RowIndex.load("sheet1.idx", key=["sheet1.xml", 1, 2])
+    assert loaded.complete is True
+    assert loaded.header == index.header
+    assert loaded.marker == b"<row"
+    assert loaded.rows == index.rows
+    assert loaded.offsets == index.offsets
+
+
+def test_sidecar_stale(RowIndex, sheet_xml, tmpdir):
+    tmpdir.chdir()
+    index = RowIndex(key=["sheet1.xml", 1, 2], distance=1)
+    scan(index, sheet_xml)
+    index.save("sheet1.idx")
+    assert RowIndex.load("sheet1.idx", key=["sheet1.xml", 1, 3]) is None
+    assert RowIndex.load("missing.idx") is None
@@ -116,6 +116,8 @@ class Worksheet(object):
     ORIENTATION_PORTRAIT = 'portrait'
     ORIENTATION_LANDSCAPE = 'landscape'
 
+    _loader = None
+
     def __init__(self, parent_workbook, title=None):
         self._parent = parent_workbook
         self._title = ''
@@ -152,6 +154,18 @@ class Worksheet(object):
         self.sheet_properties = WorksheetProperties()
 
 
+    def __getattr__(self, name):
+        """
+        Worksheets loaded lazily are parsed when something that parsing
+        provides is first looked up
+        """
+        loader = self.__dict__.get('_loader')
+        if loader is None:
+            raise AttributeError("'%s' object has no attribute '%s'"
+                                 % (self.__class__.__name__, name))
+        loader.load()
+        return getattr(self, name)
+
     @property
     def selected_cell(self):
         return self.sheet_view.selection.sqref
@@ -472,7 +486,8 @@ class Worksheet(object):
         return self.calculate_dimension()
 
 
-    def iter_rows(self, range_string=None, row_offset=0, column_offset=0):
+    def iter_rows(self, range_string=None, row_offset=0, column_offset=0,
+                  values_only=False):
         """
         Returns a squared range based on the `range_string` parameter,
         using generators.
@@ -487,6 +502,9 @@ class Worksheet(object):
         :param column_offset: additonal columns (e.g. 3)
         :type column: int
 
+        :param values_only: return cell values rather than cells
+        :type values_only: bool
+
         :rtype: generator
         """
         if range_string is not None:
@@ -500,10 +518,18 @@ class Worksheet(object):
         return self.get_squared_range(min_col + column_offset,
                                       min_row + row_offset,
                                       max_col,
-                                      max_row)
+                                      max_row,
+                                      values_only)
 
 
-    def get_squared_range(self, min_col, min_row, max_col, max_row):
+    @property
+    def values(self):
+        """Produces all cell values in the worksheet, by row"""
+        return self.iter_rows(values_only=True)
+
+
+    def get_squared_range(self, min_col, min_row, max_col, max_row,
+                          values_only=False):
         """Returns a 2D array of cells
 
         :param min_col: smallest column index (1-based index)
@@ -518,12 +544,19 @@ class Worksheet(object):
         :param max_row: smallest row index (1-based index)
         :type max_row: int
 
+        :param values_only: return cell values rather than cells
+        :type values_only: bool
+
         :rtype: generator
         """
         # Column name cache is very important in large files.
         for row in range(min_row, max_row + 1):
-            yield tuple(self.cell(row=row, column=column)
-                        for column in range(min_col, max_col + 1))
+            cells = tuple(self.cell(row=row, column=column)
+                          for column in range(min_col, max_col + 1))
+            if values_only:
+                yield tuple(c.value for c in cells)
+            else:
+                yield cells
 
 
     def get_named_range(self, range_string):
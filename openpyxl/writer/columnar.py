@@ -0,0 +1,403 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+"""
+Serialise blocks of typed columns for write-only worksheets
+
+The kind of each column is resolved once: from the type given for it, from
+its NumPy dtype or from its `array` typecode. Rows are then converted a
+column at a time, in batches, and every row in which all values could be
+converted is written with a single format string. Rows with missing or
+unexpected values are written a cell at a time, and anything that append()
+would treat specially, such as formulae, is left to the worksheet.
+"""
+
+import datetime
+
+from openpyxl.compat import NUMERIC_TYPES, basestring, unicode, range
+from openpyxl.cell import Cell
+from openpyxl.cell.cell import ERROR_CODES, ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import numbers
+from openpyxl.utils import get_column_letter, column_index_from_string
+from openpyxl.utils.datetime import to_excel, time_to_days, timedelta_to_days
+from openpyxl.utils.exceptions import IllegalCharacterError
+from openpyxl.xml.functions import tostring
+from .strings import string_element
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+BATCH_SIZE = 4096
+
+EMPTY = 'empty'
+NUMBER = 'number'
+BOOL = 'bool'
+STRING = 'string'
+DATETIME = 'datetime'
+DATE = 'date'
+TIME = 'time'
+TIMEDELTA = 'timedelta'
+OBJECT = 'object'
+
+# order matters: bool is an int and datetime is a date
+PYTHON_KINDS = (
+    (bool, BOOL),
+    (datetime.datetime, DATETIME),
+    (datetime.date, DATE),
+    (datetime.time, TIME),
+    (datetime.timedelta, TIMEDELTA),
+    (NUMERIC_TYPES, NUMBER),
+    ((basestring, unicode, bytes), STRING),
+)
+
+NUMPY_KINDS = {
+    'b': BOOL,
+    'i': NUMBER,
+    'u': NUMBER,
+    'f': NUMBER,
+    'M': DATETIME,
+    'm': TIMEDELTA,
+    'U': STRING,
+    'S': STRING,
+    'O': OBJECT,
+}
+
+TYPECODE_KINDS = dict.fromkeys('bBhHiIlLqQfd', NUMBER)
+TYPECODE_KINDS['u'] = STRING
+
+# number format and conversion to a serial of each kind of date
+TIME_KINDS = {
+    DATETIME: (numbers.FORMAT_DATE_DATETIME, to_excel),
+    DATE: (numbers.FORMAT_DATE_YYYYMMDD2, to_excel),
+    TIME: (numbers.FORMAT_DATE_TIME6, lambda value, base_date: time_to_days(value)),
+    TIMEDELTA: (numbers.FORMAT_DATE_TIMEDELTA,
+                lambda value, base_date: timedelta_to_days(value)),
+}
+
+
+class _Cell(object):
+    """A value which the worksheet has to write itself"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _Inline(object):
+    """A string which is not in the shared table"""
+
+    __slots__ = ('xml',)
+
+    def __init__(self, value):
+        self.xml = tostring(string_element(value, 'is')).decode("utf-8")
+
+
+def column_kind(column, dtype=None):
+    """
+    Return the kind of values in `column` from `dtype`, which can be a
+    Python type or anything NumPy understands as a dtype, or from the
+    column itself
+    """
+    if column is None:
+        return EMPTY
+    if dtype is None:
+        dtype = getattr(column, 'dtype', None)
+        if dtype is None:
+            typecode = getattr(column, 'typecode', None)
+            return TYPECODE_KINDS.get(typecode, OBJECT)
+
+    if isinstance(dtype, type) and (numpy is None
+                                    or not issubclass(dtype, numpy.generic)):
+        for types, kind in PYTHON_KINDS:
+            if issubclass(dtype, types):
+                return kind
+        return OBJECT
+
+    if numpy is None:
+        raise ImportError("You must install numpy to use dtype {0}".format(dtype))
+    kind = NUMPY_KINDS.get(numpy.dtype(dtype).kind)
+    if kind is None:
+        raise ValueError("Unsupported column type {0}".format(dtype))
+    return kind
+
+
+def _time_kind(value):
+    for types, kind in PYTHON_KINDS[1:5]:
+        if isinstance(value, types):
+            return kind
+
+
+def _to_list(values):
+    """Python values of a slice of a column, NaT and masked values are None"""
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        if values.dtype.kind == 'M':
+            values = values.astype('M8[us]')
+        elif values.dtype.kind == 'm':
+            values = values.astype('m8[us]')
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return list(values)
+
+
+def _convert_numbers(values, slow):
+    if (numpy is not None and isinstance(values, numpy.ndarray)
+        and not isinstance(values, numpy.ma.MaskedArray)):
+        converted = values.tolist()
+        if values.dtype.kind == 'f':
+            for idx in numpy.flatnonzero(numpy.isnan(values)).tolist():
+                converted[idx] = None
+                slow.add(idx)
+        return converted
+
+    converted = _to_list(values)
+    for idx, value in enumerate(converted):
+        if value is None or value != value: # NaN
+            converted[idx] = None
+        elif (value is True or value is False
+              or not isinstance(value, NUMERIC_TYPES)):
+            converted[idx] = _Cell(value)
+        else:
+            continue
+        slow.add(idx)
+    return converted
+
+
+def _convert_bools(values, slow):
+    converted = _to_list(values)
+    for idx, value in enumerate(converted):
+        if value is True or value is False:
+            continue
+        if value is not None:
+            converted[idx] = _Cell(value)
+        slow.add(idx)
+    return converted
+
+
+def _converter(kind, base_date):
+    to_serial = TIME_KINDS[kind][1]
+
+    def convert(values, slow):
+        converted = _to_list(values)
+        for idx, value in enumerate(converted):
+            if value is None:
+                slow.add(idx)
+            elif _time_kind(value) != kind:
+                converted[idx] = _Cell(value)
+                slow.add(idx)
+            else:
+                converted[idx] = to_serial(value, base_date)
+        return converted
+    return convert
+
+
+def _convert_objects(values, slow):
+    converted = _to_list(values)
+    for idx, value in enumerate(converted):
+        if value is None or value != value: # NaN
+            converted[idx] = None
+        else:
+            converted[idx] = _Cell(value)
+        slow.add(idx)
+    return converted
+
+
+class ColumnWriter(object):
+    """
+    Serialise `columns`, a list of equally long sequences or None for empty
+    columns, as rows of a write-only worksheet. `dtypes` are passed to
+    :func:`column_dtypes`.
+    """
+
+    def __init__(self, worksheet, columns, dtypes=None):
+        self.worksheet = worksheet
+        self.columns = columns
+        sizes = set(len(column) for column in columns if column is not None)
+        if len(sizes) > 1:
+            raise ValueError("Columns must all have the same length")
+        self.size = sizes.pop() if sizes else 0
+
+        dtypes = column_dtypes(dtypes, len(columns))
+        self.kinds = [column_kind(column, dtype)
+                      for column, dtype in zip(columns, dtypes)]
+        self.base_date = worksheet.parent.excel_base_date
+        self.converters = []
+        fragments = []
+        for col_idx, kind in enumerate(self.kinds, 1):
+            self.converters.append(self._converter(kind))
+            fragments.append(self._fragment(kind, col_idx))
+        self.cell_fragments = [fragment.replace(u"{%d" % idx, u"{1")
+                               for idx, fragment in enumerate(fragments, 1)]
+        self.row_template = (u'<row r="{0}" spans="1:%d">' % len(columns)
+                             + u"".join(fragments) + u"</row>")
+        self.empty_row = u'<row r="%%d" spans="1:%d"/>' % len(columns)
+
+
+    def _converter(self, kind):
+        if kind in TIME_KINDS:
+            return _converter(kind, self.base_date)
+        return {
+            NUMBER: _convert_numbers,
+            BOOL: _convert_bools,
+            OBJECT: _convert_objects,
+        }.get(kind)
+
+
+    def _fragment(self, kind, col_idx):
+        """Format string for a cell in the row template"""
+        letter = get_column_letter(col_idx)
+        if kind == EMPTY:
+            return u""
+        if kind == NUMBER:
+            value = u'<c r="%s{0}" t="n"><v>{%d:.16g}</v></c>'
+        elif kind == BOOL:
+            value = u'<c r="%s{0}" t="b"><v>{%d:d}</v></c>'
+        elif kind == STRING:
+            value = u'<c r="%s{0}" t="s"><v>{%d:d}</v></c>'
+        elif kind in TIME_KINDS:
+            cell = Cell(self.worksheet, column='A', row=1)
+            cell.number_format = TIME_KINDS[kind][0]
+            value = (u'<c r="%%s{0}" s="%d" t="n"><v>{%%d:.16g}</v></c>'
+                     % cell.style_id)
+        else:
+            # written cell by cell
+            return u""
+        return value % (letter, col_idx)
+
+
+    def _convert_strings(self, batch, slow):
+        """
+        Resolve strings, in the order append() would add them to the
+        shared table
+        """
+        columns = [idx for idx, kind in enumerate(self.kinds) if kind == STRING]
+        if not columns:
+            return
+        strings = self.worksheet.parent.shared_strings
+        encoding = self.worksheet.encoding
+        guess_types = getattr(self.worksheet.parent, '_guess_types', False)
+        for idx in columns:
+            batch[idx] = _to_list(batch[idx])
+        for row_idx in range(len(batch[columns[0]])):
+            for idx in columns:
+                value = batch[idx][row_idx]
+                if value is None:
+                    slow.add(row_idx)
+                    continue
+                if isinstance(value, bytes) and not isinstance(value, unicode):
+                    value = unicode(value, encoding)
+                if not isinstance(value, unicode):
+                    value = _Cell(value)
+                else:
+                    value = value[:32767]
+                    if ILLEGAL_CHARACTERS_RE.search(value):
+                        raise IllegalCharacterError
+                    if (guess_types or not value or value in ERROR_CODES
+                        or (len(value) > 1 and value.startswith("="))):
+                        value = _Cell(value)
+                    else:
+                        shared = strings.add(value)
+                        if shared is not None:
+                            batch[idx][row_idx] = shared
+                            continue
+                        value = _Inline(value)
+                batch[idx][row_idx] = value
+                slow.add(row_idx)
+
+
+    def _write_row(self, row_idx, row):
+        """Write a row with missing or unexpected values cell by cell"""
+        cells = []
+        for col_idx, value in enumerate(row, 1):
+            if value is None:
+                continue
+            if isinstance(value, _Cell):
+                cells.append(self.worksheet._cell_xml(value.value, row_idx, col_idx))
+            elif isinstance(value, _Inline):
+                cells.append(u'<c r="{0}{1}" t="inlineStr">{2}</c>'.format(
+                    get_column_letter(col_idx), row_idx, value.xml))
+            else:
+                cells.append(self.cell_fragments[col_idx - 1].format(row_idx, value))
+        if not cells:
+            return self.empty_row % row_idx
+        return (u'<row r="%d" spans="1:%d">' % (row_idx, len(row))
+                + u"".join(cells) + u"</row>")
+
+
+    def batches(self, first_row, batch_size=BATCH_SIZE):
+        """
+        Yield the xml of consecutive batches of rows, numbered from
+        `first_row`
+        """
+        template = self.row_template.format
+        empty = [None] * batch_size
+        for start in range(0, self.size, batch_size):
+            stop = min(start + batch_size, self.size)
+            slow = set()
+            batch = []
+            for column, convert in zip(self.columns, self.converters):
+                if column is None:
+                    batch.append(empty[:stop - start])
+                    continue
+                values = column[start:stop]
+                if convert is not None:
+                    values = convert(values, slow)
+                batch.append(values)
+            self._convert_strings(batch, slow)
+
+            parts = []
+            row_idx = first_row + start
+            for idx, row in enumerate(zip(*batch)):
+                if idx in slow:
+                    parts.append(self._write_row(row_idx + idx, row))
+                else:
+                    parts.append(template(row_idx + idx, *row))
+            yield u"".join(parts).encode("utf-8")
+
+
+def columns_from_rows(rows):
+    """Split a two-dimensional array or a sequence of rows into columns"""
+    if numpy is not None and isinstance(rows, numpy.ndarray):
+        if rows.ndim != 2:
+            raise ValueError("Rows must be a two-dimensional array")
+        return [rows[:, idx] for idx in range(rows.shape[1])]
+    rows = list(rows)
+    if len(set(len(row) for row in rows)) > 1:
+        raise ValueError("Rows must all have the same length")
+    return [list(column) for column in zip(*rows)]
+
+
+def _by_index(mapping):
+    ordered = {}
+    for key, value in mapping.items():
+        if isinstance(key, basestring):
+            key = column_index_from_string(key)
+        ordered[key] = value
+    return ordered
+
+
+def columns_from_mapping(columns):
+    """
+    Order columns given by letter or index, with None for the columns in
+    between
+    """
+    ordered = _by_index(columns)
+    if not ordered:
+        return []
+    return [ordered.get(idx) for idx in range(1, max(ordered) + 1)]
+
+
+def column_dtypes(dtypes, size):
+    """Types for `size` columns, given as a sequence or by letter or index"""
+    if dtypes is None:
+        return [None] * size
+    if isinstance(dtypes, dict):
+        ordered = _by_index(dtypes)
+        return [ordered.get(idx) for idx in range(1, size + 1)]
+    dtypes = list(dtypes)
+    if len(dtypes) != size:
+        raise ValueError("There must be a type for each column")
+    return dtypes
@@ -0,0 +1,271 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+"""
+Compress archive members outside of ZipFile
+
+Members can be compressed somewhere else, such as another process, and then
+added to an archive in order. They are written exactly as
+``ZipFile.writestr`` would write them.
+
+Large members can also be split into chunks which are compressed in parallel,
+as pigz does. Each chunk is compressed with the end of the one before as its
+dictionary and ends on a byte boundary, so that together they still form a
+single standard deflate stream.
+
+Members are added through ZipFile's internals. Archives which do not have
+them are left to ZipFile.
+"""
+
+import os
+import time
+import zlib
+from zipfile import ZipFile, ZipInfo, ZIP_STORED, ZIP_DEFLATED, ZIP64_LIMIT
+
+from openpyxl.compat import unicode, basestring
+
+COMPRESSION = {
+    None: (ZIP_DEFLATED, zlib.Z_DEFAULT_COMPRESSION),
+    'store': (ZIP_STORED, None),
+    'fast': (ZIP_DEFLATED, 1),
+    'max': (ZIP_DEFLATED, 9),
+}
+
+CHUNK_SIZE = 2**17
+DICT_SIZE = 2**15 # deflate window
+BATCH = 16 # chunks read from a file at a time
+FINAL_BLOCK = b'\x03\x00' # empty last block
+
+
+def _compressor(level, zdict=None):
+    if zdict:
+        try:
+            return zlib.compressobj(level, zlib.DEFLATED, -15,
+                                    zlib.DEF_MEM_LEVEL,
+                                    zlib.Z_DEFAULT_STRATEGY, zdict)
+        except TypeError:
+            pass # preset dictionaries need Python 3.3
+    return zlib.compressobj(level, zlib.DEFLATED, -15)
+
+
+def _deflate_chunk(task):
+    zdict, chunk, level = task
+    compressor = _compressor(level, zdict)
+    return compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def _chunk_tasks(chunks, level, zdict=b""):
+    tasks = []
+    for chunk in chunks:
+        tasks.append((zdict, chunk, level))
+        zdict = (zdict + chunk)[-DICT_SIZE:]
+    return tasks, zdict
+
+
+def deflate(data, level=zlib.Z_DEFAULT_COMPRESSION, pool=None):
+    """
+    Compress `data` as ZipFile does. Return the compressed data, its CRC
+    and its size before compression. Data of more than a couple of chunks
+    is compressed in chunks across the threads of `pool`, if there is one.
+    """
+    if isinstance(data, unicode):
+        data = data.encode("utf-8")
+    if pool is None or len(data) < 2 * CHUNK_SIZE:
+        compressor = _compressor(level)
+        compressed = compressor.compress(data) + compressor.flush()
+    else:
+        chunks = [data[start:start + CHUNK_SIZE]
+                  for start in range(0, len(data), CHUNK_SIZE)]
+        tasks, _ = _chunk_tasks(chunks, level)
+        compressed = b"".join(pool.map(_deflate_chunk, tasks)) + FINAL_BLOCK
+    return compressed, zlib.crc32(data) & 0xffffffff, len(data)
+
+
+ZIPFILE_INTERNALS = ('fp', 'filelist', 'NameToInfo', '_writecheck',
+                     '_allowZip64')
+
+
+def can_write_compressed(archive):
+    """
+    Whether members can be added outside of ZipFile. This relies on
+    internals which may change between versions of Python. Members added to
+    archives which cannot seek are also followed by a data descriptor, and
+    another member may be being written.
+    """
+    return (hasattr(ZipInfo, 'FileHeader')
+            and all(hasattr(archive, name) for name in ZIPFILE_INTERNALS)
+            and archive.fp is not None
+            and getattr(archive, '_seekable', True)
+            and not getattr(archive, '_writing', False))
+
+
+def _start_member(archive, zinfo, zip64):
+    fp = archive.fp
+    if hasattr(archive, 'start_dir'):
+        fp.seek(archive.start_dir)
+    zinfo.header_offset = fp.tell()
+    archive._writecheck(zinfo)
+    archive._didModify = True
+    fp.write(zinfo.FileHeader(zip64))
+
+
+def _end_member(archive, zinfo):
+    if hasattr(archive, 'start_dir'):
+        archive.start_dir = archive.fp.tell()
+    archive.filelist.append(zinfo)
+    archive.NameToInfo[zinfo.filename] = zinfo
+
+
+def write_compressed(archive, arcname, compressed, crc, size):
+    """Add a member compressed by :func:`deflate` to the archive"""
+    zinfo = ZipInfo(filename=arcname,
+                    date_time=time.localtime(time.time())[:6])
+    zinfo.compress_type = ZIP_DEFLATED
+    zinfo.external_attr = 0o600 << 16
+    zinfo.file_size = size
+    zinfo.compress_size = len(compressed)
+    zinfo.CRC = crc
+    zip64 = archive._allowZip64 and size * 1.05 > ZIP64_LIMIT
+
+    _start_member(archive, zinfo, zip64)
+    archive.fp.write(compressed)
+    _end_member(archive, zinfo)
+
+
+def _deflate_file(f, level, pool):
+    """
+    Yield consecutive chunks of file `f` with their compressed data, followed
+    by the end of the stream.
+    """
+    if pool is None:
+        compressor = _compressor(level)
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            yield chunk, compressor.compress(chunk)
+        yield b"", compressor.flush()
+        return
+
+    zdict = b""
+    while True:
+        chunks = []
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            chunks.append(chunk)
+            if len(chunks) == BATCH:
+                break
+        if not chunks:
+            break
+        tasks, zdict = _chunk_tasks(chunks, level, zdict)
+        for chunk, compressed in zip(chunks, pool.map(_deflate_chunk, tasks)):
+            yield chunk, compressed
+    yield b"", FINAL_BLOCK
+
+
+def write_deflated_file(archive, filename, arcname,
+                        level=zlib.Z_DEFAULT_COMPRESSION, pool=None):
+    """
+    Add the file `filename` to the archive as ZipFile.write does, reading and
+    compressing it a chunk at a time.
+    """
+    st = os.stat(filename)
+    zinfo = ZipInfo(filename=arcname,
+                    date_time=time.localtime(st.st_mtime)[:6])
+    zinfo.compress_type = ZIP_DEFLATED
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.file_size = st.st_size
+    zinfo.compress_size = 0
+    zinfo.CRC = 0
+    zip64 = archive._allowZip64 and zinfo.file_size * 1.05 > ZIP64_LIMIT
+
+    _start_member(archive, zinfo, zip64)
+    fp = archive.fp
+    crc = size = compress_size = 0
+    with open(filename, "rb") as src:
+        for chunk, compressed in _deflate_file(src, level, pool):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            compress_size += len(compressed)
+            fp.write(compressed)
+    zinfo.CRC = crc & 0xffffffff
+    zinfo.file_size = size
+    zinfo.compress_size = compress_size
+
+    # fill in the header now that the sizes are known
+    end = fp.tell()
+    fp.seek(zinfo.header_offset)
+    fp.write(zinfo.FileHeader(zip64))
+    fp.seek(end)
+    _end_member(archive, zinfo)
+
+
+class CompressedZipFile(ZipFile):
+    """
+    Archive for writing workbooks, compressed as set by `compression`:
+
+    * ``'store'`` leaves members uncompressed
+    * ``'fast'`` compresses them at the fastest level
+    * ``'max'`` compresses them as much as zlib can
+    * ``None`` uses zlib's default level
+
+    With more than one worker, large members are compressed in parallel
+    chunks.
+    """
+
+    def __init__(self, file, compression=None, workers=None):
+        self.workers = workers
+        self._pool = None
+        if compression not in COMPRESSION:
+            names = sorted(key for key in COMPRESSION if key is not None)
+            raise ValueError("Unknown compression '{0}', use one of {1}".format(
+                compression, ", ".join(names)))
+        compress_type, self.level = COMPRESSION[compression]
+        ZipFile.__init__(self, file, 'w', compress_type, allowZip64=True)
+
+
+    @property
+    def pool(self):
+        """Threads compressing chunks, started when first needed"""
+        if self._pool is None and self.workers and self.workers > 1:
+            from multiprocessing.pool import ThreadPool
+            self._pool = ThreadPool(self.workers)
+        return self._pool
+
+
+    def stop_pool(self):
+        """
+        Stop the threads compressing chunks, before forking for instance.
+        They are started again if they are needed.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+    def _deflating(self, arcname, args, kw):
+        return (self.compression == ZIP_DEFLATED
+                and isinstance(arcname, basestring)
+                and not (args or kw)
+                and can_write_compressed(self))
+
+
+    def writestr(self, zinfo_or_arcname, data, *args, **kw):
+        if not self._deflating(zinfo_or_arcname, args, kw):
+            return ZipFile.writestr(self, zinfo_or_arcname, data, *args, **kw)
+        pool = None
+        if len(data) >= 2 * CHUNK_SIZE:
+            pool = self.pool
+        write_compressed(self, zinfo_or_arcname,
+                         *deflate(data, self.level, pool))
+
+
+    def write(self, filename, arcname=None, *args, **kw):
+        if arcname is None or not self._deflating(arcname, args, kw):
+            return ZipFile.write(self, filename, arcname, *args, **kw)
+        pool = None
+        if os.path.getsize(filename) >= 2 * CHUNK_SIZE:
+            pool = self.pool
+        write_deflated_file(self, filename, arcname, self.level, pool)
+
+
+    def close(self):
+        self.stop_pool()
+        ZipFile.close(self)
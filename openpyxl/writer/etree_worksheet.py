@@ -5,6 +5,7 @@ from operator import itemgetter
 
 from openpyxl.compat import safe_string
 from openpyxl.xml.functions import xmlfile, Element, SubElement
+from .strings import string_element
 
 
 def get_rows_to_write(worksheet):
@@ -40,7 +41,7 @@ def write_rows(xf, worksheet):
 
             with xf.element("row", attrs):
                 for col, cell in sorted(row, key=itemgetter(0)):
-                    if cell.value is None and not cell.has_style:
+                    if cell._value is None and not cell.has_style:
                         continue
                     el = write_cell(worksheet, cell, cell.has_style)
                     xf.write(el)
@@ -68,11 +69,17 @@ def write_cell(worksheet, cell, styled=None):
             value = None
         formula = SubElement(el, 'f', shared_formula)
         if value is not None:
-            formula.text = value[1:]
+            formula.text = cell.value[1:]
             value = None
 
     if cell.data_type == 's':
-        value = worksheet.parent.shared_strings.add(value)
+        idx = worksheet.parent.shared_strings.add(value)
+        if idx is None:
+            # the table does not share this string
+            el.set('t', 'inlineStr')
+            el.append(string_element(value, 'is'))
+            return el
+        value = idx
     cell_content = SubElement(el, 'v')
     if value is not None:
         cell_content.text = safe_string(value)
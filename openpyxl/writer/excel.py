@@ -5,10 +5,14 @@ from __future__ import absolute_import
 
 # Python stdlib imports
 from io import BytesIO
+import multiprocessing
+import os.path
 from re import match
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZIP_DEFLATED
+from zlib import Z_DEFAULT_COMPRESSION
 
 # package imports
+from openpyxl.compat import basestring
 from openpyxl.xml.constants import (
     ARC_SHARED_STRINGS,
     ARC_CONTENT_TYPES,
@@ -38,17 +42,32 @@ from openpyxl.workbook.properties import write_properties
 from openpyxl.writer.theme import write_theme
 from openpyxl.writer.styles import StyleWriter
 from .relations import write_rels
-from openpyxl.writer.worksheet import write_worksheet
+from openpyxl.writer.worksheet import (
+    write_worksheet,
+    register_strings,
+    has_differential_styles,
+    write_relations,
+)
+from .compression import (
+    deflate,
+    write_compressed,
+    can_write_compressed,
+    CompressedZipFile,
+)
 from openpyxl.workbook.names.external import (
     write_external_link,
     write_external_book_rel
 )
 
 from openpyxl.writer.comments import CommentWriter
+from openpyxl.utils.archive import close_archive, detach_archive
 
 ARC_VBA = ('xl/vba', r'xl/drawings/.*\.vml', 'xl/ctrlProps', 'customUI',
            'xl/activeX', r'xl/media/.*\.emf')
 
+# the workbook being saved, for worker processes forked while saving
+_SAVING = None
+
 class ExcelWriter(object):
     """Write a workbook object to an Excel file."""
 
@@ -59,9 +78,12 @@ class ExcelWriter(object):
         self.workbook._drawings = []
         self.style_writer = StyleWriter(workbook)
 
-    def write_data(self, archive, as_template=False):
+    def write_data(self, archive, as_template=False, workers=None):
         """Write the various xml files into the zip archive."""
         # cleanup all worksheets
+        self._load_worksheets()
+        # before worksheets are written, perhaps in other processes
+        self.workbook._resolve_styles()
 
         archive.writestr(ARC_CONTENT_TYPES, write_content_types(self.workbook,
                                                                 as_template=as_template))
@@ -85,14 +107,28 @@ class ExcelWriter(object):
 
         self._write_charts(archive)
         self._write_images(archive)
-        self._write_worksheets(archive)
+        self._write_worksheets(archive, workers)
         self._write_string_table(archive)
         self._write_external_links(archive)
         archive.writestr(ARC_STYLE, self.style_writer.write_table())
 
+    def _load_worksheets(self, copy=True):
+        """
+        Parse lazily loaded worksheets which cannot be copied from the
+        source archive
+        """
+        for sheet in self.workbook.worksheets:
+            loader = getattr(sheet, '_loader', None)
+            if loader is not None and not (copy and loader.can_copy()):
+                loader.load()
+
+
     def _write_string_table(self, archive):
-        archive.writestr(ARC_SHARED_STRINGS,
-                write_string_table(self.workbook.shared_strings))
+        strings = self.workbook.shared_strings
+        if hasattr(strings, '_write_archive'):
+            strings._write_archive(archive, ARC_SHARED_STRINGS)
+            return
+        archive.writestr(ARC_SHARED_STRINGS, write_string_table(strings))
 
 
     def _write_images(self, archive):
@@ -115,13 +151,73 @@ class ExcelWriter(object):
             archive.writestr(chart._path, tostring(chart._write()))
 
 
-    def _write_worksheets(self, archive):
+    def _serialize_worksheets(self, workers, level=Z_DEFAULT_COMPRESSION):
+        """
+        Write and compress worksheets in forked processes, which share the
+        workbook. Strings are added to the shared table beforehand, in the
+        order a serial save would add them, so that the archive is the same
+        either way. Worksheets with differential styles are left to be
+        written in order.
+        """
+        global _SAVING
+        indices = []
+        for idx, sheet in enumerate(self.workbook.worksheets):
+            if (getattr(sheet, '_loader', None) is not None
+                or hasattr(sheet, '_write_archive')):
+                continue
+            register_strings(sheet)
+            if not has_differential_styles(sheet):
+                indices.append(idx)
+        if not indices:
+            return {}
+
+        _SAVING = self.workbook, level
+        try:
+            pool = _fork_pool(min(workers, len(indices)))
+            try:
+                serialized = dict(pool.map(_serialize_task, indices, chunksize=1))
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            _SAVING = None
+
+        for idx in indices:
+            write_relations(self.workbook.worksheets[idx])
+        return serialized
+
+
+    def _write_worksheets(self, archive, workers=None):
         comments_id = 0
         vba_controls_id = 0
 
+        serialized = {}
+        if (workers and workers > 1 and hasattr(os, 'fork')
+            and archive.compression == ZIP_DEFLATED
+            and can_write_compressed(archive)):
+            level = getattr(archive, 'level', Z_DEFAULT_COMPRESSION)
+            if hasattr(archive, 'stop_pool'):
+                # threads cannot be forked
+                archive.stop_pool()
+            serialized = self._serialize_worksheets(workers, level)
+
         for i, sheet in enumerate(self.workbook.worksheets, 1):
-            xml = sheet._write(self.workbook.shared_strings)
-            archive.writestr(PACKAGE_WORKSHEETS + '/sheet%d.xml' % i , xml)
+            loader = getattr(sheet, '_loader', None)
+            if loader is not None:
+                # never used so nothing has changed
+                archive.writestr(PACKAGE_WORKSHEETS + '/sheet%d.xml' % i,
+                                 loader.read())
+                continue
+
+            arcname = PACKAGE_WORKSHEETS + '/sheet%d.xml' % i
+            if hasattr(sheet, '_write_archive'):
+                # write-only worksheets are already on disk
+                sheet._write_archive(archive, arcname)
+            elif i - 1 in serialized:
+                write_compressed(archive, arcname, *serialized.pop(i - 1))
+            else:
+                xml = sheet._write(self.workbook.shared_strings)
+                archive.writestr(arcname, xml)
 
             if sheet._charts or sheet._images:
                 drawing = SpreadsheetDrawing()
@@ -172,14 +268,50 @@ class ExcelWriter(object):
             )
 
 
-    def save(self, filename, as_template=False):
+    def save(self, filename, as_template=False, workers=None, compression=None):
         """Write data into the archive."""
-        archive = ZipFile(filename, 'w', ZIP_DEFLATED, allowZip64=True)
-        self.write_data(archive, as_template=as_template)
+        source = getattr(self.workbook, '_archive', None)
+        vba = self.workbook.vba_archive
+        if vba is not None and _same_file(vba.filename, filename):
+            # keep VBA content once the mapped file is gone
+            if vba is source:
+                self._load_worksheets(copy=False)
+            self.workbook.vba_archive = detach_archive(vba)
+        if source is not None and _same_file(source.filename, filename):
+            # the source is about to be overwritten
+            self._load_worksheets(copy=False)
+            close_archive(source)
+        archive = CompressedZipFile(filename, compression, workers)
+        self.write_data(archive, as_template=as_template, workers=workers)
         archive.close()
 
 
-def save_workbook(workbook, filename, as_template=False):
+def _fork_pool(processes):
+    try:
+        context = multiprocessing.get_context('fork')
+    except AttributeError:
+        # Python 2 always forks
+        return multiprocessing.Pool(processes)
+    return context.Pool(processes)
+
+
+def _serialize_task(idx):
+    workbook, level = _SAVING
+    sheet = workbook.worksheets[idx]
+    return idx, deflate(sheet._write(workbook.shared_strings), level)
+
+
+def _same_file(source, filename):
+    if not (source and isinstance(filename, basestring)):
+        return False
+    try:
+        return os.path.samefile(source, filename)
+    except OSError:
+        return False
+
+
+def save_workbook(workbook, filename, as_template=False, workers=None,
+                  compression=None):
     """Save the given workbook on the filesystem under the name filename.
 
     :param workbook: the workbook to save
@@ -188,21 +320,30 @@ def save_workbook(workbook, filename, as_template=False):
     :param filename: the path to which save the workbook
     :type filename: string
 
+    :param workers: number of processes used to write and compress
+        worksheets, and of threads used to compress large parts
+    :type workers: int
+
+    :param compression: 'store', 'fast' or 'max', or None for the default
+    :type compression: string
+
     :rtype: bool
 
     """
     writer = ExcelWriter(workbook)
-    writer.save(filename, as_template=as_template)
+    writer.save(filename, as_template=as_template, workers=workers,
+                compression=compression)
     return True
 
 
-def save_virtual_workbook(workbook, as_template=False):
+def save_virtual_workbook(workbook, as_template=False, workers=None,
+                          compression=None):
     """Return an in-memory workbook, suitable for a Django response."""
     writer = ExcelWriter(workbook)
     temp_buffer = BytesIO()
+    archive = CompressedZipFile(temp_buffer, compression, workers)
     try:
-        archive = ZipFile(temp_buffer, 'w', ZIP_DEFLATED, allowZip64=True)
-        writer.write_data(archive, as_template=as_template)
+        writer.write_data(archive, as_template=as_template, workers=workers)
     finally:
         archive.close()
     virtual_workbook = temp_buffer.getvalue()
@@ -28,7 +28,7 @@ def write_rows(xf, worksheet):
             with xf.element("row", attrs):
 
                 for col, cell in sorted(row, key=itemgetter(0)):
-                    if cell.value is None and not cell.has_style:
+                    if cell._value is None and not cell.has_style:
                         continue
                     write_cell(xf, worksheet, cell, cell.has_style)
 
@@ -56,7 +56,7 @@ def write_cell(xf, worksheet, cell, styled=False):
                 value = None
             with xf.element('f', shared_formula):
                 if value is not None:
-                    xf.write(value[1:])
+                    xf.write(cell.value[1:])
                     value = None
 
         if cell.data_type == 's':
@@ -10,6 +10,16 @@ from openpyxl.xml.functions import Element, xmlfile, SubElement
 
 PRESERVE_SPACE = '{%s}space' % "http://www.w3.org/XML/1998/namespace"
 
+def string_element(value, tag='si'):
+    """Element for a string in the table or, with the tag 'is', inline"""
+    el = Element(tag)
+    text = SubElement(el, 't')
+    text.text = value
+    if value.strip() != value:
+        text.set(PRESERVE_SPACE, 'preserve')
+    return el
+
+
 def write_string_table(string_table):
     """Write the string table xml."""
     out = BytesIO()
@@ -18,11 +28,6 @@ def write_string_table(string_table):
         with xf.element("sst", xmlns=SHEET_MAIN_NS, uniqueCount="%d" % len(string_table)):
 
             for key in string_table:
-                el = Element('si')
-                text = SubElement(el, 't')
-                text.text = key
-                if key.strip() != key:
-                    text.set(PRESERVE_SPACE, 'preserve')
-                xf.write(el)
+                xf.write(string_element(key))
 
     return  out.getvalue()
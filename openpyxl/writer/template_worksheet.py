@@ -0,0 +1,156 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+"""
+Write worksheet data from string templates
+
+Instead of building an element, or opening an element context, for every
+cell, each cell is formatted from a template for its column, style and data
+type. Templates already hold the column letter and the escaped attributes so
+only the row number and the value are filled in. Rows are written straight
+into the output in batches, bypassing the XML writer, which must be able to
+flush, and are the same, byte for byte, as those written by the lxml writer.
+"""
+
+from operator import itemgetter
+
+from openpyxl.compat import safe_string
+from openpyxl.utils import get_column_letter
+
+from .etree_worksheet import get_rows_to_write
+
+BATCH_SIZE = 1000 # rows
+MAX_INTEGER = 10**16 # larger integers are written with an exponent
+
+
+def escape_text(value):
+    """Escape text as lxml does"""
+    return (value.replace(u"&", u"&amp;")
+            .replace(u"<", u"&lt;")
+            .replace(u">", u"&gt;")
+            .replace(u"\r", u"&#13;"))
+
+
+def escape_attribute(value):
+    """Escape an attribute value as lxml does"""
+    return (escape_text(value)
+            .replace(u'"', u"&quot;")
+            .replace(u"\n", u"&#10;")
+            .replace(u"\t", u"&#9;"))
+
+
+def format_attributes(attributes):
+    return u"".join(u' %s="%s"' % (key, escape_attribute(value))
+                    for key, value in attributes.items())
+
+
+def format_number(value):
+    """safe_string for numbers, with shortcuts for the common types"""
+    kind = type(value)
+    if kind is float:
+        return u"%.16g" % value
+    if kind is int and -MAX_INTEGER < value < MAX_INTEGER:
+        return u"%d" % value
+    return escape_text(safe_string(value))
+
+
+class CellTemplates(dict):
+    """
+    Templates for cells by column, style and data type. Each is a tuple of
+    the templates for the start of a cell, a cell with a value and an empty
+    cell.
+    """
+
+    def __init__(self):
+        self.styles = {}
+
+
+    def has_style(self, cell):
+        """Whether the style of a cell is written, cached by style"""
+        style_id = cell._style_id
+        if style_id is None:
+            return False
+        styled = self.styles.get(style_id)
+        if styled is None:
+            styled = self.styles[style_id] = cell.has_style
+        return styled
+
+
+    def __missing__(self, key):
+        col_idx, style_id, data_type = key
+        attributes = u""
+        if style_id is not None:
+            attributes += u' s="%d"' % style_id
+        if data_type != 'f':
+            attributes += u' t="%s"' % escape_attribute(data_type)
+        start = u'<c r="%s%%s"%s>' % (get_column_letter(col_idx), attributes)
+        templates = self[key] = (start, start + u"<v>%s</v></c>",
+                                 start + u"</c>")
+        return templates
+
+
+def write_formula(worksheet, cell, row):
+    """Formula and empty value of a cell"""
+    coordinate = u"%s%s" % (get_column_letter(cell.col_idx), row)
+    shared_formula = worksheet.formula_attributes.get(coordinate, {})
+    text = u""
+    if not (shared_formula.get('t') == 'shared'
+            and 'ref' not in shared_formula):
+        text = escape_text(cell._value[1:])
+    return u"<f%s>%s</f><v></v>" % (format_attributes(shared_formula), text)
+
+
+def write_rows(xf, worksheet, out):
+    """
+    Write worksheet data into `out`, the file the xmlfile `xf` writes to.
+    """
+
+    all_rows = get_rows_to_write(worksheet)
+
+    dims = worksheet.row_dimensions
+    row_start = u'<row r="%%d" spans="1:%d">' % worksheet.max_column
+    templates = CellTemplates()
+    has_style = templates.has_style
+    strings = worksheet.parent.shared_strings
+
+    with xf.element("sheetData"):
+        xf.flush()
+        parts = []
+        for count, (row_idx, row) in enumerate(all_rows, 1):
+
+            if row_idx in dims:
+                attrs = {'r': '%d' % row_idx,
+                         'spans': '1:%d' % worksheet.max_column}
+                attrs.update(dict(dims[row_idx]))
+                parts.append(u"<row%s>" % format_attributes(attrs))
+            else:
+                parts.append(row_start % row_idx)
+
+            r = u"%d" % row_idx
+            for col, cell in sorted(row, key=itemgetter(0)):
+                value = cell._value
+                styled = has_style(cell)
+                if value is None and not styled:
+                    continue
+                data_type = cell.data_type
+                start, full, empty = templates[
+                    col, cell._style_id if styled else None, data_type]
+
+                if value is None or value == '':
+                    parts.append(empty % r)
+                elif data_type == 'n':
+                    parts.append(full % (r, format_number(value)))
+                elif data_type == 's':
+                    parts.append(full % (r, strings.add(value)))
+                elif data_type == 'f':
+                    parts.append(start % r)
+                    parts.append(write_formula(worksheet, cell, r))
+                    parts.append(u"</c>")
+                else:
+                    parts.append(full % (r, escape_text(safe_string(value))))
+            parts.append(u"</row>")
+
+            if not count % BATCH_SIZE:
+                out.write(u"".join(parts).encode("ascii", "xmlcharrefreplace"))
+                parts = []
+        out.write(u"".join(parts).encode("ascii", "xmlcharrefreplace"))
@@ -0,0 +1,167 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+from array import array
+import datetime
+
+import pytest
+
+from openpyxl import Workbook
+
+
+ROWS = [
+    [1, 2.5, u"a", datetime.datetime(2015, 1, 2, 3, 4, 5), True, None],
+    [None, float("inf"), u"b ", datetime.datetime(1900, 1, 1), False, u"=SUM(A1)"],
+    [3, -0.0, u"a", None, None, 5],
+    [None, None, None, None, None, None],
+    [10**20, 1e-300, u"#N/A", datetime.datetime(2015, 1, 2), True, u"x"],
+]
+
+DTYPES = [int, float, str, datetime.datetime, bool, None]
+
+
+def sheet_xml(fill, strings='shared'):
+    wb = Workbook(write_only=True, strings=strings)
+    ws = wb.create_sheet()
+    fill(ws)
+    ws.close()
+    with open(ws.filename, "rb") as src:
+        xml = src.read()
+    ws._cleanup()
+    return xml, list(wb.shared_strings)
+
+
+@pytest.mark.parametrize("strings", ['shared', 'inline', 'hybrid'])
+def test_same_as_append(strings):
+
+    def append(ws):
+        for row in ROWS:
+            ws.append(row)
+
+    def append_rows(ws):
+        ws.append_rows(ROWS, dtypes=DTYPES)
+
+    assert sheet_xml(append_rows, strings) == sheet_xml(append, strings)
+
+
+def test_append_columns():
+
+    def append(ws):
+        ws.append([1.5, None, u"x"])
+        ws.append([2.5, None, u"y"])
+
+    def append_columns(ws):
+        ws.append_columns({'A': array('d', [1.5, 2.5]), 3: [u"x", u"y"]},
+                          dtypes={'C': str})
+
+    assert sheet_xml(append_columns) == sheet_xml(append)
+
+
+def test_follows_rows():
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append([1])
+    ws.append_rows([[2], [3]])
+    ws.append([4])
+    assert ws._max_row == 4
+    ws.close()
+    with open(ws.filename, "rb") as src:
+        xml = src.read()
+    assert b'<row r="3" spans="1:1"><c r="A3" t="n"><v>3</v></c></row><row r="4"' in xml
+
+
+def test_unequal_columns():
+    ws = Workbook(write_only=True).create_sheet()
+    with pytest.raises(ValueError):
+        ws.append_columns([[1, 2], [1]])
+    with pytest.raises(ValueError):
+        ws.append_rows([[1, 2], [1]])
+
+
+def test_already_saved():
+    from openpyxl.utils.exceptions import WorkbookAlreadySaved
+    ws = Workbook(write_only=True).create_sheet()
+    ws.close()
+    with pytest.raises(WorkbookAlreadySaved):
+        ws.append_rows([[1]])
+
+
+@pytest.mark.parametrize("dtype, kind",
+                         [
+                             (int, 'number'),
+                             (bool, 'bool'),
+                             (str, 'string'),
+                             (datetime.datetime, 'datetime'),
+                             (datetime.date, 'date'),
+                             (object, 'object'),
+                         ])
+def test_column_kind(dtype, kind):
+    from ..columnar import column_kind
+    assert column_kind([], dtype) == kind
+
+
+@pytest.mark.numpy_required
+@pytest.mark.parametrize("dtype, kind",
+                         [
+                             ("float32", 'number'),
+                             ("uint8", 'number'),
+                             ("bool", 'bool'),
+                             ("M8[ns]", 'datetime'),
+                             ("U10", 'string'),
+                             ("O", 'object'),
+                         ])
+def test_numpy_kind(dtype, kind):
+    import numpy
+    from ..columnar import column_kind
+    assert column_kind(numpy.zeros(1, dtype=dtype)) == kind
+
+
+@pytest.mark.numpy_required
+def test_numpy():
+    import numpy
+    values = numpy.arange(6, dtype="float64").reshape(3, 2) / 2
+    values[1, 0] = numpy.nan
+    dates = numpy.array(["2015-01-02T03:04:05", "NaT", "2016-02-03"],
+                        dtype="M8[ns]")
+
+    def append(ws):
+        for row in [[0.0, 0.5, datetime.datetime(2015, 1, 2, 3, 4, 5)],
+                    [None, 1.5, None],
+                    [2.0, 2.5, datetime.datetime(2016, 2, 3)]]:
+            ws.append(row)
+
+    def append_columns(ws):
+        ws.append_columns([values[:, 0], values[:, 1], dates])
+
+    assert sheet_xml(append_columns) == sheet_xml(append)
+
+
+def test_nan_in_rows():
+
+    def append(ws):
+        ws.append([1.5, u"a"])
+        ws.append([None, None])
+
+    def append_rows(ws):
+        ws.append_rows([[1.5, u"a"], [float("nan"), float("nan")]])
+
+    xml = sheet_xml(append_rows)
+    assert b"nan" not in xml[0]
+    assert xml == sheet_xml(append)
+
+
+@pytest.mark.numpy_required
+def test_nan_in_objects():
+    import numpy
+    values = numpy.array([[1.5, u"a"], [numpy.nan, None]], dtype=object)
+
+    def append(ws):
+        ws.append([1.5, u"a"])
+        ws.append([None, None])
+
+    def append_rows(ws):
+        ws.append_rows(values)
+
+    xml = sheet_xml(append_rows)
+    assert b"nan" not in xml[0]
+    assert xml == sheet_xml(append)
@@ -0,0 +1,235 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+import os
+import time
+from io import BytesIO
+from zipfile import ZipFile, ZIP_DEFLATED
+
+import pytest
+
+
+@pytest.fixture
+def fixed_time(monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+
+
+def test_write_compressed(fixed_time):
+    from ..compression import deflate, write_compressed
+
+    data = b"<sheetData>" + b"<row/>" * 1000 + b"</sheetData>"
+    expected = BytesIO()
+    with ZipFile(expected, "w", ZIP_DEFLATED) as archive:
+        archive.writestr("a.xml", b"first")
+        archive.writestr("b.xml", data)
+
+    out = BytesIO()
+    with ZipFile(out, "w", ZIP_DEFLATED) as archive:
+        archive.writestr("a.xml", b"first")
+        write_compressed(archive, "b.xml", *deflate(data))
+
+    assert out.getvalue() == expected.getvalue()
+    assert ZipFile(out).read("b.xml") == data
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_parallel_save(fixed_time):
+    from openpyxl import Workbook
+    from openpyxl.formatting.rule import CellIsRule
+    from openpyxl.styles import Font
+    from openpyxl.utils.indexed_list import IndexedList
+
+    wb = Workbook()
+    for idx in range(4):
+        ws = wb.create_sheet() if idx else wb.active
+        for row in range(1, 51):
+            ws.append([row, u"sheet {0}".format(idx), u"row {0}".format(row % 7)])
+    wb.worksheets[1]['A1'].hyperlink = "http://openpyxl.readthedocs.org"
+    wb.worksheets[2].conditional_formatting.add(
+        "A1:A10", CellIsRule(operator="greaterThan", formula=["5"], font=Font(b=True)))
+
+    saved = []
+    for workers in (None, 3):
+        wb.shared_strings = IndexedList()
+        wb._differential_styles = []
+        out = BytesIO()
+        wb.save(out, workers=workers)
+        saved.append(out.getvalue())
+    assert saved[0] == saved[1]
+
+
+@pytest.fixture
+def sheet_xml():
+    rows = (u'<row r="{0}"><c r="A{0}"><v>{1}</v></c></row>'.format(idx, idx * 7 % 1013)
+            for idx in range(1, 40000))
+    return u"<sheetData>{0}</sheetData>".format(u"".join(rows)).encode("utf-8")
+
+
+def test_deflate_chunks(sheet_xml):
+    import zlib
+    from multiprocessing.pool import ThreadPool
+    from ..compression import deflate, CHUNK_SIZE
+
+    assert len(sheet_xml) > 4 * CHUNK_SIZE
+    pool = ThreadPool(2)
+    try:
+        compressed, crc, size = deflate(sheet_xml, 6, pool)
+    finally:
+        pool.close()
+        pool.join()
+    decompressor = zlib.decompressobj(-15)
+    assert decompressor.decompress(compressed) == sheet_xml
+    assert decompressor.eof
+    assert crc == zlib.crc32(sheet_xml) & 0xffffffff
+    assert size == len(sheet_xml)
+
+
+def test_write_deflated_file(tmpdir, fixed_time):
+    from ..compression import write_deflated_file
+
+    src = tmpdir.join("sheet.xml")
+    src.write_binary(b"<row/>" * 10000)
+    expected = BytesIO()
+    with ZipFile(expected, "w", ZIP_DEFLATED) as archive:
+        archive.write(str(src), "sheet.xml")
+
+    out = BytesIO()
+    with ZipFile(out, "w", ZIP_DEFLATED) as archive:
+        write_deflated_file(archive, str(src), "sheet.xml")
+
+    assert out.getvalue() == expected.getvalue()
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+@pytest.mark.parametrize("compression", ["store", "fast", "max"])
+def test_compressed_zipfile(tmpdir, sheet_xml, compression, workers):
+    from ..compression import CompressedZipFile
+
+    src = tmpdir.join("sheet.xml")
+    src.write_binary(sheet_xml)
+    out = BytesIO()
+    archive = CompressedZipFile(out, compression, workers)
+    archive.writestr("a.xml", sheet_xml)
+    archive.write(str(src), "b.xml")
+    archive.close()
+
+    archive = ZipFile(out)
+    assert archive.testzip() is None
+    assert archive.read("a.xml") == sheet_xml
+    assert archive.read("b.xml") == sheet_xml
+    info = archive.getinfo("a.xml")
+    if compression == "store":
+        assert info.compress_size == info.file_size
+    else:
+        assert info.compress_size < info.file_size / 2
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_without_zipfile_internals(tmpdir, sheet_xml, monkeypatch, workers):
+    from .. import compression
+    from ..compression import CompressedZipFile, can_write_compressed
+
+    def unused(*args):
+        raise AssertionError("members should be left to ZipFile")
+
+    monkeypatch.setattr(compression, "ZIPFILE_INTERNALS",
+                        compression.ZIPFILE_INTERNALS + ('_missing',))
+    monkeypatch.setattr(compression, "write_compressed", unused)
+    monkeypatch.setattr(compression, "write_deflated_file", unused)
+
+    src = tmpdir.join("sheet.xml")
+    src.write_binary(sheet_xml)
+    out = BytesIO()
+    archive = CompressedZipFile(out, "fast", workers)
+    assert not can_write_compressed(archive)
+    archive.writestr("a.xml", sheet_xml)
+    archive.write(str(src), "b.xml")
+    archive.close()
+
+    archive = ZipFile(out)
+    assert archive.testzip() is None
+    assert archive.read("a.xml") == sheet_xml
+    assert archive.read("b.xml") == sheet_xml
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_save_without_zipfile_internals(monkeypatch):
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.writer import compression, excel
+
+    def unused(*args):
+        raise AssertionError("worksheets should be written serially")
+
+    monkeypatch.setattr(compression, "ZIPFILE_INTERNALS",
+                        compression.ZIPFILE_INTERNALS + ('_missing',))
+    monkeypatch.setattr(excel.ExcelWriter, "_serialize_worksheets", unused)
+    wb = Workbook()
+    wb.active.append([1, u"a"])
+    out = BytesIO()
+    wb.save(out, workers=2)
+    assert load_workbook(out).active['B1'].value == u"a"
+
+
+def test_stop_pool():
+    from ..compression import CompressedZipFile
+
+    archive = CompressedZipFile(BytesIO(), "fast", workers=2)
+    pool = archive.pool
+    archive.stop_pool()
+    assert archive._pool is None
+    assert archive.pool is not pool
+    archive.close()
+    assert archive._pool is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_no_threads_when_forking(monkeypatch):
+    from openpyxl import Workbook
+    from openpyxl.writer import compression, excel
+
+    archives = []
+
+    class Archive(compression.CompressedZipFile):
+
+        def __init__(self, *args, **kw):
+            compression.CompressedZipFile.__init__(self, *args, **kw)
+            self.pool # started early
+            archives.append(self)
+
+    fork_pool = excel._fork_pool
+
+    def _fork_pool(processes):
+        assert archives[0]._pool is None
+        return fork_pool(processes)
+
+    monkeypatch.setattr(excel, "CompressedZipFile", Archive)
+    monkeypatch.setattr(excel, "_fork_pool", _fork_pool)
+    wb = Workbook()
+    wb.create_sheet().append([1])
+    wb.active.append([2])
+    wb.save(BytesIO(), workers=2)
+    assert archives
+
+def test_unknown_compression():
+    from ..compression import CompressedZipFile
+
+    with pytest.raises(ValueError):
+        CompressedZipFile(BytesIO(), "bzip2")
+
+
+def test_save_compression():
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.writer.excel import save_virtual_workbook
+
+    wb = Workbook()
+    ws = wb.active
+    for row in range(1, 101):
+        ws.append([row, u"row {0}".format(row)])
+    sizes = {}
+    for compression in ("store", "fast", "max"):
+        data = save_virtual_workbook(wb, compression=compression)
+        sizes[compression] = len(data)
+        ws = load_workbook(BytesIO(data)).active
+        assert ws['B100'].value == u"row 100"
+    assert sizes["max"] <= sizes["fast"] < sizes["store"]
@@ -353,3 +353,15 @@ def test_write_empty_row(DumpWorksheet):
     """
     diff = compare_xml(xml, expected)
     assert diff is None, diff
+
+
+def test_write_archive():
+    import os
+    from ..write_only import WriteOnlyWorksheet
+    ws = WriteOnlyWorksheet(DummyWorkbook(), title="TestWorksheet")
+    ws.append([1, 2])
+    archive = ZipFile(BytesIO(), "w")
+    ws._write_archive(archive, "xl/worksheets/sheet1.xml")
+    assert not os.path.exists(ws.filename)
+    xml = archive.read("xl/worksheets/sheet1.xml")
+    assert b'<row r="1" spans="1:2">' in xml
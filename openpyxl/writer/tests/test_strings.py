@@ -29,3 +29,65 @@ def test_preseve_space():
     """
     diff = compare_xml(content, expected)
     assert diff is None, diff
+
+
+def test_inline_strings():
+    from ..write_only import InlineStrings
+    table = InlineStrings()
+    assert table.add(u"value") is None
+    assert len(table) == 0
+    assert list(table) == []
+
+
+def test_hybrid_strings():
+    from io import BytesIO
+    from zipfile import ZipFile
+    from ..write_only import HybridStrings
+
+    table = HybridStrings(threshold=2, max_shared=2, width=64)
+    assert table.add(u"a") is None
+    assert table.add(u"b") is None
+    assert table.add(u"a") == 0
+    assert table.add(u"a") == 0
+    assert table.add(u"b") == 1
+    assert table.add(u"c") is None
+    assert table.add(u"c") is None # table full
+    assert len(table) == 2
+
+    archive = ZipFile(BytesIO(), "w")
+    table._write_archive(archive, "xl/sharedStrings.xml")
+    expected = """
+    <sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+      <si><t>a</t></si>
+      <si><t>b</t></si>
+    </sst>
+    """
+    diff = compare_xml(archive.read("xl/sharedStrings.xml"), expected)
+    assert diff is None, diff
+
+
+def test_sketch_saturates():
+    from ..write_only import HybridStrings
+    table = HybridStrings(threshold=3, width=16)
+    assert [table._seen(u"x") for i in range(5)] == [1, 2, 3, 3, 3]
+    assert max(table.counts) == 3
+
+
+def test_hybrid_strings_reproducible():
+    import os
+    import subprocess
+    import sys
+    import openpyxl
+
+    script = ("from openpyxl.writer.write_only import HybridStrings\n"
+              "table = HybridStrings(width=8, depth=2)\n"
+              "print([table.add(u'value %d' % (i % 50)) for i in range(60)])\n"
+              "table._file.close()\n"
+              "import os; os.remove(table.filename)\n")
+    outputs = set()
+    for seed in ("1", "2", "3"):
+        env = dict(os.environ, PYTHONHASHSEED=seed,
+                   PYTHONPATH=os.path.dirname(os.path.dirname(openpyxl.__file__)))
+        outputs.add(subprocess.check_output([sys.executable, "-c", script],
+                                            env=env))
+    assert len(outputs) == 1
@@ -0,0 +1,84 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+import datetime
+
+import pytest
+
+from openpyxl import Workbook
+from openpyxl.styles import Font
+
+pytestmark = pytest.mark.lxml_required
+
+
+@pytest.fixture
+def worksheet():
+    wb = Workbook()
+    ws = wb.active
+    ws.append([1, 2.5, 10**20, -0.0, 1/3.0, True, None, u"text"])
+    ws.append([u'a&<>\r"b', u"caf\xe9", u"\U0001F600", u"#N/A", u"=SUM(A1:B1)",
+               datetime.datetime(2015, 1, 2, 3, 4, 5), u"", u" padded "])
+    ws['A4'].font = Font(b=True)
+    ws['B4'] = 4
+    ws['B4'].font = Font(b=True)
+    ws['C4'] = u"=A1<B1"
+    ws['D4'] = u"=A1"
+    ws.formula_attributes['C4'] = {'t': 'shared', 'ref': 'C4:D4', 'si': '0'}
+    ws.formula_attributes['D4'] = {'t': 'shared', 'si': '0'}
+    ws.row_dimensions[6].height = 20
+    ws.row_dimensions[2].hidden = True
+    ws.cell(row=7, column=30, value=7)
+    return ws
+
+
+def written(monkeypatch, ws, row_writer):
+    from openpyxl.utils.indexed_list import IndexedList
+    from .. import worksheet
+    from ..worksheet import write_worksheet
+
+    monkeypatch.setattr(worksheet, "ROW_WRITER", row_writer)
+    ws.parent.shared_strings = IndexedList()
+    xml = write_worksheet(ws, ws.parent.shared_strings)
+    return xml, list(ws.parent.shared_strings)
+
+
+def test_same_as_lxml(monkeypatch, worksheet):
+    expected = written(monkeypatch, worksheet, 'lxml')
+    assert written(monkeypatch, worksheet, 'template') == expected
+
+
+def test_empty(monkeypatch):
+    ws = Workbook().active
+    xml, strings = written(monkeypatch, ws, 'template')
+    assert b"<sheetData></sheetData>" in xml
+
+
+def test_batches(monkeypatch, worksheet):
+    from .. import template_worksheet
+    expected = written(monkeypatch, worksheet, 'template')
+    monkeypatch.setattr(template_worksheet, "BATCH_SIZE", 2)
+    assert written(monkeypatch, worksheet, 'template') == expected
+
+
+@pytest.mark.parametrize("value, expected",
+                         [
+                             (1, u"1"),
+                             (-10**16 + 1, u"-9999999999999999"),
+                             (10**16, u"1e+16"),
+                             (0.1 + 0.2, u"0.3"),
+                             (1e-300, u"1e-300"),
+                         ])
+def test_format_number(value, expected):
+    from ..template_worksheet import format_number
+    assert format_number(value) == expected
+
+
+@pytest.mark.parametrize("env, expected",
+                         [(None, 'lxml'), ('template', 'template'),
+                          ('etree', 'etree'), ('unknown', 'lxml')])
+def test_default_row_writer(monkeypatch, env, expected):
+    from ..worksheet import default_row_writer
+    monkeypatch.delenv("OPENPYXL_WRITER", raising=False)
+    if env is not None:
+        monkeypatch.setenv("OPENPYXL_WRITER", env)
+    assert default_row_writer() == expected
@@ -180,6 +180,24 @@ def test_write_cell(worksheet, value, expected):
     assert diff is None, diff
 
 
+def test_write_inline_string(worksheet):
+    from .. etree_worksheet import write_cell
+    from ..write_only import InlineStrings
+    ws = worksheet
+    ws.parent.shared_strings = InlineStrings()
+    ws['A1'] = u" text "
+
+    el = write_cell(ws, ws['A1'])
+    xml = tostring(el)
+    expected = """
+    <c r="A1" t="inlineStr">
+      <is><t xml:space="preserve"> text </t></is>
+    </c>
+    """
+    diff = compare_xml(xml, expected)
+    assert diff is None, diff
+
+
 def test_write_formula(worksheet, write_rows):
     ws = worksheet
 
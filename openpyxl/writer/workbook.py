@@ -275,6 +275,8 @@ def write_workbook(workbook):
 
     # Defined names -> autoFilter
     for i, sheet in enumerate(workbook.worksheets):
+        if getattr(sheet, '_loader', None) is not None:
+            continue # copied worksheets have no filters
         auto_filter = sheet.auto_filter.ref
         if not auto_filter:
             continue
@@ -5,6 +5,8 @@ from __future__ import absolute_import
 
 # Python stdlib imports
 from io import BytesIO
+from operator import itemgetter
+import os
 
 from openpyxl.compat import safe_string, itervalues, iteritems
 from openpyxl import LXML
@@ -30,7 +32,31 @@ from openpyxl.worksheet.properties import WorksheetProperties
 from openpyxl.worksheet.hyperlink import Hyperlink
 from openpyxl.worksheet.related import Related
 
-from .etree_worksheet import write_cell
+from .etree_worksheet import write_cell, get_rows_to_write
+
+# Writers for worksheet data. Templates write into the output of the XML
+# writer, which only lxml allows.
+ROW_WRITERS = ['etree']
+if LXML:
+    ROW_WRITERS.extend(['lxml', 'template'])
+
+
+def default_row_writer():
+    """
+    lxml if it is installed, otherwise etree. Templates, which write the
+    same XML as lxml in a fraction of the time, are used when the
+    ``OPENPYXL_WRITER`` environment variable is set to ``template``. It can
+    also select one of the other writers.
+    """
+    name = os.environ.get("OPENPYXL_WRITER")
+    if name in ROW_WRITERS:
+        return name
+    if LXML:
+        return 'lxml'
+    return 'etree'
+
+
+ROW_WRITER = default_row_writer()
 
 
 def write_format(worksheet):
@@ -179,13 +205,50 @@ def write_drawing(worksheet):
         return drawing.to_tree("drawing")
 
 
+def register_strings(worksheet):
+    """
+    Add the strings in a worksheet to the shared string table in the same
+    order that writing the worksheet would
+    """
+    strings = worksheet.parent.shared_strings
+    for row_idx, row in get_rows_to_write(worksheet):
+        for col, cell in sorted(row, key=itemgetter(0)):
+            if cell.data_type == 's' and cell._value:
+                strings.add(cell._value)
+
+
+def has_differential_styles(worksheet):
+    """
+    Conditional formats with differential styles are numbered in the
+    order worksheets are written
+    """
+    for rules in itervalues(worksheet.conditional_formatting.cf_rules):
+        for rule in rules:
+            if rule.dxf is not None:
+                return True
+    return False
+
+
+def write_relations(worksheet):
+    """
+    Set up the relations of a worksheet as writing it does, for worksheets
+    written elsewhere
+    """
+    worksheet._rels = []
+    write_hyperlinks(worksheet)
+    write_drawing(worksheet)
+
+
 def write_worksheet(worksheet, shared_strings):
     """Write a worksheet to an xml file."""
     worksheet._rels = []
-    if LXML is True:
-        from .lxml_worksheet import write_cell, write_rows
+    worksheet.parent._resolve_styles()
+    if ROW_WRITER == 'template':
+        from .template_worksheet import write_rows
+    elif ROW_WRITER == 'lxml':
+        from .lxml_worksheet import write_rows
     else:
-        from .etree_worksheet import write_cell, write_rows
+        from .etree_worksheet import write_rows
 
     out = BytesIO()
 
@@ -206,7 +269,10 @@ def write_worksheet(worksheet, shared_strings):
             cols = write_cols(worksheet)
             if cols is not None:
                 xf.write(cols)
-            write_rows(xf, worksheet)
+            if ROW_WRITER == 'template':
+                write_rows(xf, worksheet, out)
+            else:
+                write_rows(xf, worksheet)
 
             if worksheet.protection.sheet:
                 xf.write(worksheet.protection.to_tree())
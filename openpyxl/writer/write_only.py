@@ -4,10 +4,12 @@ from __future__ import absolute_import
 
 """Write worksheets to xml representations in an optimized way"""
 
+from array import array
 import atexit
 from inspect import isgenerator
 import os
 from tempfile import NamedTemporaryFile
+from zlib import crc32, adler32
 
 from openpyxl.cell import Cell
 from openpyxl.worksheet import Worksheet
@@ -17,6 +19,8 @@ from openpyxl.utils.exceptions import WorkbookAlreadySaved
 from openpyxl.writer.excel import ExcelWriter
 from openpyxl.writer.comments import CommentWriter
 from .relations import write_rels
+from .strings import string_element
+from .columnar import ColumnWriter, columns_from_rows, columns_from_mapping
 from .worksheet import (
     write_autofilter,
     write_datavalidation,
@@ -26,7 +30,7 @@ from .worksheet import (
     write_format,
 )
 from openpyxl.xml.constants import SHEET_MAIN_NS
-from openpyxl.xml.functions import xmlfile, Element
+from openpyxl.xml.functions import xmlfile, Element, tostring, fromstring
 
 ALL_TEMP_FILES = []
 
@@ -56,6 +60,99 @@ def create_temporary_file(suffix=''):
     return filename
 
 
+class InlineStrings(object):
+    """
+    String table for write-only workbooks which shares nothing: every
+    string is written inline in the worksheet.
+    """
+
+    def add(self, value):
+        """Return the index of a shared string or None to write it inline"""
+        return None
+
+    def __len__(self):
+        return 0
+
+    def __iter__(self):
+        return iter(())
+
+
+class HybridStrings(InlineStrings):
+    """
+    String table for write-only workbooks which only shares strings that
+    repeat, all others are written inline.
+
+    How often each string has been seen is estimated with a count-min
+    sketch of fixed size. A string is shared once it has been seen
+    `threshold` times, until `max_shared` strings are shared. The table
+    itself is written to a temporary file as strings are added; only the
+    indices of shared strings are kept in memory.
+    """
+
+    def __init__(self, threshold=2, max_shared=2**16, width=2**20, depth=4):
+        self.threshold = threshold
+        self.max_shared = max_shared
+        self.width = width
+        self.depth = depth
+        self.counts = array('B', [0]) * (width * depth)
+        self.shared = {}
+        self.filename = create_temporary_file()
+        self._file = open(self.filename, 'wb')
+        self._file.write(('<sst xmlns="%s">' % SHEET_MAIN_NS).encode("ascii"))
+
+
+    def _seen(self, value):
+        """
+        Count `value` and return an estimate, up to the threshold, of how
+        many times it has been seen
+        """
+        width = self.width
+        counts = self.counts
+        # stable across processes, unlike hash(), so files are reproducible
+        data = value.encode("utf-8")
+        h1 = crc32(data) & 0xffffffff
+        h2 = adler32(data) | 1
+        positions = [row * width + (h1 + row * h2) % width
+                     for row in range(self.depth)]
+        seen = min(self.threshold, min(counts[pos] for pos in positions) + 1)
+        for pos in positions:
+            # only raise the counters that are lowest
+            if counts[pos] < seen:
+                counts[pos] = seen
+        return seen
+
+
+    def add(self, value):
+        idx = self.shared.get(value)
+        if idx is not None:
+            return idx
+        if len(self.shared) >= self.max_shared:
+            return None
+        if self._seen(value) < self.threshold:
+            return None
+        idx = self.shared[value] = len(self.shared)
+        self._file.write(tostring(string_element(value)))
+        return idx
+
+
+    def __len__(self):
+        return len(self.shared)
+
+
+    def _write_archive(self, archive, arcname):
+        """Copy the table from its temporary file into the archive"""
+        self._file.write(b"</sst>")
+        self._file.close()
+        archive.write(self.filename, arcname)
+        os.remove(self.filename)
+
+
+STRING_TABLES = {
+    'inline': InlineStrings,
+    'hybrid': HybridStrings,
+}
+
+
 def WriteOnlyCell(ws=None, value=None):
     return Cell(worksheet=ws, column='A', row=1, value=value)
 
@@ -93,49 +190,53 @@ class WriteOnlyWorksheet(Worksheet):
         Generator that creates the XML file and the sheet header
         """
 
-        with xmlfile(self.filename) as xf:
-            with xf.element("worksheet", xmlns=SHEET_MAIN_NS):
-
-                if self.sheet_properties:
-                    pr = self.sheet_properties.to_tree()
-
-                xf.write(pr)
-                views = Element('sheetViews')
-                views.append(self.sheet_view.to_tree())
-                xf.write(views)
-                xf.write(write_format(self))
-
-                cols = write_cols(self)
-                if cols is not None:
-                    xf.write(cols)
-
-                with xf.element("sheetData"):
-                    try:
-                        while True:
-                            r = (yield)
-                            xf.write(r)
-                    except GeneratorExit:
-                        pass
-
-                if self.protection.sheet:
-                    xf.write(worksheet.protection.to_tree())
-
-                af = write_autofilter(self)
-                if af is not None:
-                    xf.write(af)
-
-                dv = write_datavalidation(self)
-                if dv is not None:
-                    xf.write(dv)
-
-                drawing = write_drawing(self)
-                if drawing is not None:
-                    xf.write(drawing)
-
-                if self._comments:
-                    legacyDrawing = Related(id="commentsvml")
-                    xml = legacyDrawing.to_tree("legacyDrawing")
-                    xf.write(xml)
+        with open(self.filename, 'wb') as out:
+            with xmlfile(out) as xf:
+                with xf.element("worksheet", xmlns=SHEET_MAIN_NS):
+
+                    if self.sheet_properties:
+                        pr = self.sheet_properties.to_tree()
+
+                    xf.write(pr)
+                    views = Element('sheetViews')
+                    views.append(self.sheet_view.to_tree())
+                    xf.write(views)
+                    xf.write(write_format(self))
+
+                    cols = write_cols(self)
+                    if cols is not None:
+                        xf.write(cols)
+
+                    with xf.element("sheetData"):
+                        try:
+                            while True:
+                                r = (yield)
+                                if isinstance(r, bytes):
+                                    _write_raw(xf, out, r)
+                                else:
+                                    xf.write(r)
+                        except GeneratorExit:
+                            pass
+
+                    if self.protection.sheet:
+                        xf.write(worksheet.protection.to_tree())
+
+                    af = write_autofilter(self)
+                    if af is not None:
+                        xf.write(af)
+
+                    dv = write_datavalidation(self)
+                    if dv is not None:
+                        xf.write(dv)
+
+                    drawing = write_drawing(self)
+                    if drawing is not None:
+                        xf.write(drawing)
+
+                    if self._comments:
+                        legacyDrawing = Related(id="commentsvml")
+                        xml = legacyDrawing.to_tree("legacyDrawing")
+                        xf.write(xml)
 
     def close(self):
         if self.__saved:
@@ -202,6 +303,70 @@ class WriteOnlyWorksheet(Worksheet):
             self._already_saved()
 
 
+    def _cell_xml(self, value, row_idx, col_idx):
+        """Serialise a single value as append() would"""
+        if isinstance(value, Cell):
+            cell = value
+            if cell.comment is not None:
+                comment = cell.comment
+                comment._parent = CommentParentCell(cell)
+                self._comments.append(comment)
+        else:
+            cell = WriteOnlyCell(self, value)
+        cell.col_idx = col_idx
+        cell.row = row_idx
+        tree = write_cell(self, cell, cell.has_style)
+        return tostring(tree).decode("utf-8")
+
+
+    def append_rows(self, rows, dtypes=None):
+        """
+        Append a block of rows, such as a two-dimensional NumPy array.
+        The type of each column is resolved once and rows are written in
+        batches, which is much faster than appending them one by one.
+        Missing values, None or NaN, are left empty.
+
+        :param rows: two-dimensional array or sequence of equally long rows
+        :param dtypes: types of the columns, as a sequence or a dict by
+            column letter or index. Python types and NumPy dtypes can be
+            used. Columns without a type use their dtype or `array`
+            typecode, or are written value by value.
+        """
+        self._append_columns(columns_from_rows(rows), dtypes)
+
+
+    def append_columns(self, columns, dtypes=None):
+        """
+        Append rows made from equally long columns, such as NumPy arrays
+        or `array.array`. See :meth:`append_rows`.
+
+        :param columns: sequence of columns, or dict of columns by letter
+            or index
+        :param dtypes: types of the columns, as for :meth:`append_rows`
+        """
+        if isinstance(columns, dict):
+            columns = columns_from_mapping(columns)
+        self._append_columns(list(columns), dtypes)
+
+
+    def _append_columns(self, columns, dtypes):
+        if self.__saved:
+            self._already_saved()
+        writer = ColumnWriter(self, columns, dtypes)
+        if self.writer is None:
+            self.writer = self._write_header()
+            next(self.writer)
+
+        for xml in writer.batches(self._max_row + 1):
+            try:
+                self.writer.send(xml)
+            except StopIteration:
+                self._already_saved()
+        self._max_row += writer.size
+        if writer.size:
+            self._max_col = max(self._max_col, len(columns))
+
+
     def _already_saved(self):
         raise WorkbookAlreadySaved('Workbook has already been saved and cannot be modified or saved anymore.')
 
@@ -219,6 +384,27 @@ class WriteOnlyWorksheet(Worksheet):
         return out
 
 
+    def _write_archive(self, archive, arcname):
+        """
+        Copy the worksheet from its temporary file into the archive in
+        chunks rather than reading it into memory
+        """
+        self.close()
+        archive.write(self.filename, arcname)
+        self._cleanup()
+
+
+def _write_raw(xf, out, xml):
+    """Write serialised rows into the sheet data"""
+    if hasattr(xf, 'flush'):
+        # lxml writes as it goes
+        xf.flush()
+        out.write(xml)
+    else:
+        for el in fromstring(b"<sheetData>" + xml + b"</sheetData>"):
+            xf.write(el)
+
+
 def removed_method(*args, **kw):
     raise NotImplementedError
 
@@ -237,10 +423,10 @@ class DumpCommentWriter(CommentWriter):
                 self.comments.append(comment)
 
 
-def save_dump(workbook, filename):
+def save_dump(workbook, filename, workers=None, compression=None):
     if workbook.worksheets == []:
         workbook.create_sheet()
     writer = ExcelWriter(workbook)
     writer.comment_writer = DumpCommentWriter
-    writer.save(filename)
+    writer.save(filename, workers=workers, compression=compression)
     return True
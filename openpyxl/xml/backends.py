@@ -0,0 +1,193 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+"""
+Parsing backends for streaming worksheet XML
+
+All backends provide ``iterparse(source, tag=None, events=("end",))``
+yielding ``(event, element)`` for each element whose tag is in `tag`, or
+for every element if `tag` is None. Elements support the ElementTree API
+used by the readers. As with ElementTree, only the attributes of an
+element are known at its "start" event.
+
+* lxml: lxml's iterparse, which filters tags before any Python code runs
+* etree: the standard library iterparse, tags are filtered in Python
+* expat: pyexpat callbacks which only build the elements being asked for
+
+The default is always etree, whether or not lxml is installed. The
+``OPENPYXL_PARSER`` environment variable selects another backend and
+``openpyxl/benchmarks/reader.py --parsers`` compares them on the current
+machine.
+"""
+
+import os
+from xml.parsers import expat
+
+from openpyxl.compat import basestring
+from openpyxl.xml import LXML
+
+try:
+    from xml.etree.cElementTree import iterparse as _etree_iterparse, Element
+except ImportError:
+    from xml.etree.ElementTree import iterparse as _etree_iterparse, Element
+
+
+CHUNK_SIZE = 2**16
+
+
+def _tags(tag):
+    if tag is None:
+        return
+    if isinstance(tag, basestring):
+        return set([tag])
+    return set(tag)
+
+
+def lxml_iterparse(source, tag=None, events=('end',)):
+    from lxml.etree import iterparse
+    if tag is not None and not isinstance(tag, basestring):
+        tag = list(tag)
+    it = iterparse(source, events=events, tag=tag,
+                   resolve_entities=False, no_network=True)
+    for event, element in it:
+        yield event, element
+        if event == 'end':
+            # drop elements which have been dealt with
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+
+
+def etree_iterparse(source, tag=None, events=('end',)):
+    tags = _tags(tag)
+    for event, element in _etree_iterparse(source, events):
+        if tags is None or element.tag in tags:
+            yield event, element
+
+
+class ExpatBuilder(object):
+    """
+    Build elements from pyexpat callbacks, but only inside the elements
+    being asked for. Everything else in the document is skipped.
+    """
+
+    def __init__(self, tag=None, events=('end',)):
+        self.tags = _tags(tag)
+        self.start_events = 'start' in events
+        self.end_events = 'end' in events
+        self.stack = []
+        self.done = []
+        self.last = None # element whose tail receives character data
+
+        parser = expat.ParserCreate(namespace_separator="}")
+        parser.buffer_text = True
+        parser.SetParamEntityParsing(expat.XML_PARAM_ENTITY_PARSING_NEVER)
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        parser.CharacterDataHandler = self.data
+        self.parser = parser
+
+
+    @staticmethod
+    def _name(name):
+        if "}" in name:
+            return "{" + name
+        return name
+
+
+    def start(self, name, attrs):
+        stack = self.stack
+        name = self._name(name)
+        if not stack and self.tags is not None and name not in self.tags:
+            return
+        if any("}" in key for key in attrs):
+            attrs = dict((self._name(k), v) for k, v in attrs.items())
+        element = Element(name, attrs)
+        if stack:
+            stack[-1].append(element)
+        stack.append(element)
+        self.last = None
+        if self.start_events and (self.tags is None or name in self.tags):
+            self.done.append(('start', element))
+
+
+    def end(self, name):
+        stack = self.stack
+        if not stack:
+            return
+        element = stack.pop()
+        self.last = element
+        if self.end_events and (self.tags is None or element.tag in self.tags):
+            self.done.append(('end', element))
+
+
+    def data(self, text):
+        stack = self.stack
+        if not stack:
+            return
+        last = self.last
+        if last is not None:
+            last.tail = (last.tail or "") + text
+        else:
+            element = stack[-1]
+            element.text = (element.text or "") + text
+
+
+    def feed(self, data, final=False):
+        self.parser.Parse(data, final)
+        done, self.done = self.done, []
+        return done
+
+
+def expat_iterparse(source, tag=None, events=('end',)):
+    builder = ExpatBuilder(tag, events)
+    if hasattr(source, "read"):
+        f = source
+    else:
+        f = open(source, "rb")
+    try:
+        while True:
+            data = f.read(CHUNK_SIZE)
+            for event in builder.feed(data, not data):
+                yield event
+            if not data:
+                break
+    finally:
+        if f is not source:
+            f.close()
+
+
+BACKENDS = {
+    'etree': etree_iterparse,
+    'expat': expat_iterparse,
+}
+if LXML:
+    BACKENDS['lxml'] = lxml_iterparse
+
+
+def default_backend():
+    """
+    The backend named by ``OPENPYXL_PARSER`` or else etree. This is a fixed
+    default, not measured on the current machine.
+
+    lxml parses and filters tags fastest but its elements are much slower
+    to use from Python than cElementTree's, so reading worksheets with it
+    is slower overall. Callbacks from pyexpat lose to both unless most of
+    the document is skipped.
+    """
+    name = os.environ.get("OPENPYXL_PARSER")
+    if name in BACKENDS:
+        return name
+    return 'etree'
+
+
+BACKEND = default_backend()
+
+
+def iterparse(source, tag=None, events=('end',), backend=None):
+    """
+    Iterate over the elements of `source` whose tag is in `tag` using the
+    default backend or the one named by `backend`.
+    """
+    return BACKENDS[backend or BACKEND](source, tag, events)
@@ -67,7 +67,8 @@ from openpyxl.xml.constants import (
 # allow LXML interface
 _iterparse = iterparse
 def safe_iterparse(source, *args, **kw):
-    return _iterparse(source)
+    events = kw.get('events', ('end',))
+    return _iterparse(source, events)
 
 iterparse = safe_iterparse
 
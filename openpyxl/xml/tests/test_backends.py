@@ -0,0 +1,75 @@
+from __future__ import absolute_import
+# Copyright (c) 2010-2015 openpyxl
+
+from io import BytesIO
+
+import pytest
+
+from openpyxl.xml.constants import SHEET_MAIN_NS
+from .. backends import BACKENDS
+
+
+ROW_TAG = '{%s}row' % SHEET_MAIN_NS
+CELL_TAG = '{%s}c' % SHEET_MAIN_NS
+
+SHEET = """<worksheet xmlns="{0}" xmlns:x="http://example.com">
+<dimension ref="A1:B2"/>
+<sheetData>
+  <row r="1" x:id="a"><c r="A1"><v>1</v></c> <c r="B1" t="inlineStr"><is><t>a &amp; b</t></is></c></row>
+  <row r="2"/>
+</sheetData>
+</worksheet>""".format(SHEET_MAIN_NS).encode("utf-8")
+
+
+@pytest.fixture(params=sorted(BACKENDS))
+def iterparse(request):
+    return BACKENDS[request.param]
+
+
+def test_tag_filter(iterparse):
+    rows = []
+    for event, element in iterparse(BytesIO(SHEET), tag=[ROW_TAG]):
+        assert event == "end"
+        cells = [(c.get("r"), c.findtext("{%s}v" % SHEET_MAIN_NS),
+                  c.findtext(".//{%s}t" % SHEET_MAIN_NS)) for c in element]
+        rows.append((element.get("r"), element.get("{http://example.com}id"), cells))
+        element.clear()
+    assert rows == [
+        ("1", "a", [("A1", "1", None), ("B1", None, "a & b")]),
+        ("2", None, []),
+    ]
+
+
+def test_start_events(iterparse):
+    tags = ['{%s}dimension' % SHEET_MAIN_NS, '{%s}sheetData' % SHEET_MAIN_NS]
+    it = iterparse(BytesIO(SHEET), tag=tags, events=("start",))
+    event, element = next(it)
+    assert event == "start"
+    assert element.get("ref") == "A1:B2"
+    event, element = next(it)
+    assert element.tag == tags[1]
+
+
+def test_all_elements(iterparse):
+    tags = [element.tag for event, element in iterparse(BytesIO(SHEET))]
+    assert tags.count(CELL_TAG) == 2
+    assert tags[-1] == '{%s}worksheet' % SHEET_MAIN_NS
+
+
+def test_expat_closes_file(tmpdir, monkeypatch):
+    from .. import backends
+    opened = []
+
+    def _open(*args):
+        f = open(*args)
+        opened.append(f)
+        return f
+
+    monkeypatch.setattr(backends, "open", _open, raising=False)
+    path = str(tmpdir.join("sheet.xml"))
+    with open(path, "wb") as f:
+        f.write(SHEET)
+    it = backends.expat_iterparse(path, tag=[ROW_TAG])
+    next(it)
+    it.close()
+    assert opened[0].closed